@@ -4,11 +4,13 @@ A comprehensive document management system for KMRL with OCR, classification, an
 """
 import streamlit as st
 import sys
-from config import DATA_DIR, UPLOAD_DIR, SAMPLE_USERS
+from config import DATA_DIR, UPLOAD_DIR, SAMPLE_USERS, ALERT_SERVICE_MODE, SOCKETIO_PORT, ADMIN_ROLES, ANALYTICS_TIME_BUCKETS
 from modules.auth_manager import AuthManager
-from modules import database
-from pages import dashboard, upload
-import plotly.express as px
+from modules.resources import get_database
+from modules.analytics import get_analytics_snapshot
+from modules.metrics import start_metrics_server
+from modules.system_metrics import start_system_metrics_publisher
+from modules.static_assets import get_theme_html, get_realtime_client_html
 
 # Initialize Socket.IO server for real-time alerts (optional)
 try:
@@ -80,283 +82,9 @@ if (anchor) anchor.scrollIntoView({behavior: 'smooth'});
 </script>
 '''
 
-responsive_css = '''
-<style>
-@media (max-width: 600px) {
-    .main-header, .stApp, .block-container, .stSidebar {
-        padding: 0.5em !important;
-        font-size: 1.05rem !important;
-    }
-    .stButton>button, .stTextInput>div>input {
-        font-size: 1.1rem !important;
-    }
-    .stSidebar {
-        width: 100vw !important;
-    }
-}
-</style>
-'''
-
-# Role-based color themes
-ROLE_THEMES = {
-    "Engineer": {
-        "primary": "#4CAF50",  # Green - Engineering/Technical
-        "secondary": "#81C784",
-        "accent": "#2E7D32",
-        "surface_variant": "#1B3A1D"
-    },
-    "Finance": {
-        "primary": "#FF9800",  # Orange - Finance/Money
-        "secondary": "#FFB74D", 
-        "accent": "#F57C00",
-        "surface_variant": "#2D1F0A"
-    },
-    "HR": {
-        "primary": "#E91E63",  # Pink - HR/People
-        "secondary": "#F06292",
-        "accent": "#C2185B", 
-        "surface_variant": "#2A0E18"
-    },
-    "Station Controller": {
-        "primary": "#2196F3",  # Blue - Operations/Control
-        "secondary": "#64B5F6",
-        "accent": "#1976D2",
-        "surface_variant": "#0D1B2A"
-    },
-    "Compliance Officer": {
-        "primary": "#9C27B0",  # Purple - Compliance/Authority  
-        "secondary": "#BA68C8",
-        "accent": "#7B1FA2",
-        "surface_variant": "#1F0A26"
-    }
-}
-
 def get_theme_css(user_role=None):
-    """Generate CSS with role-specific theme colors"""
-    if user_role and user_role in ROLE_THEMES:
-        theme = ROLE_THEMES[user_role]
-        primary = theme["primary"]
-        secondary = theme["secondary"] 
-        accent = theme["accent"]
-        surface_variant = theme["surface_variant"]
-    else:
-        # Default theme (purple)
-        primary = "#BB86FC"
-        secondary = "#03DAC6"
-        accent = "#6200EE"
-        surface_variant = "#292B32"
-    
-    return f"""
-    <style>
-    :root {{
-        --material-primary: {primary};
-        --material-on-primary: #1C1B1F;
-        --material-secondary: {secondary};
-        --material-accent: {accent};
-        --material-background: #181A20;
-        --material-surface: #23242B;
-        --material-surface-variant: {surface_variant};
-        --material-outline: #79747E;
-        --material-error: #CF6679;
-        --material-radius: 20px;
-        --material-elevation: 0 2px 8px 0 rgba(187,134,252,0.10);
-        --material-font: 'Google Sans', 'Roboto', 'Arial', sans-serif;
-    }}
-    html, body, [data-testid="stAppViewContainer"] {{
-        background: var(--material-background) !important;
-        font-family: var(--material-font) !important;
-        color: #FFFFFF !important;
-        font-size: 1.1rem;
-        line-height: 1.7;
-    }}
-    .stApp {{
-        background: var(--material-background) !important;
-        padding: 0.5rem 0.5rem 2.5rem 0.5rem !important;
-        color: #FFFFFF !important;
-    }}
-    /* Improve text visibility */
-    .stMarkdown, .stText, p, span, div {{
-        color: #FFFFFF !important;
-    }}
-    .stDataFrame {{
-        background: var(--material-surface) !important;
-        border-radius: var(--material-radius) !important;
-    }}
-    .stDataFrame table {{
-        background: var(--material-surface) !important;
-        color: #FFFFFF !important;
-    }}
-    .stDataFrame th {{
-        background: var(--material-surface-variant) !important;
-        color: var(--material-primary) !important;
-        font-weight: 600 !important;
-    }}
-    .stDataFrame td {{
-        background: var(--material-surface) !important;
-        color: #FFFFFF !important;
-        border-color: var(--material-outline) !important;
-    }}
-    /* Card, Inputs, Headings, Responsive, etc. */
-    .stCard[style*='color:#B3261E'] {{ background: var(--material-surface) !important; color: #FFFFFF !important; }}
-    .stCard[style*='color:#006B57'] {{ background: var(--material-surface) !important; color: #FFFFFF !important; }}
-    .stCard {{
-        background: var(--material-surface) !important;
-        border-radius: var(--material-radius) !important;
-        padding: 1.5rem !important;
-        box-shadow: var(--material-elevation) !important;
-        border: 1px solid var(--material-outline) !important;
-        color: #FFFFFF !important;
-    }}
-    .stTextInput > label, .stSelectbox > label, .stTextArea > label {{
-        color: var(--material-primary) !important;
-        font-weight: 600 !important;
-    }}
-    .stTextInput > div > input, .stSelectbox > div > div, .stTextArea > div > textarea {{
-        background: var(--material-surface) !important;
-        color: #FFFFFF !important;
-        border: 1px solid var(--material-outline) !important;
-        border-radius: 12px !important;
-    }}
-    .stTextInput > div > input:focus, .stSelectbox > div > div:focus, .stTextArea > div > textarea:focus {{
-        border-color: var(--material-primary) !important;
-        box-shadow: 0 0 0 1px var(--material-primary) !important;
-    }}
-    .stButton > button {{
-        background: var(--material-primary) !important;
-        color: var(--material-on-primary) !important;
-        border: none !important;
-        border-radius: 12px !important;
-        font-weight: 600 !important;
-        padding: 0.6rem 1.5rem !important;
-        text-shadow: none !important;
-    }}
-    .stButton > button:hover {{
-        background: var(--material-accent) !important;
-        transform: translateY(-1px) !important;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15) !important;
-    }}
-    .stButton > button:focus {{
-        background: var(--material-primary) !important;
-    }}
-    .stDownloadButton > button {{
-        background: #A374E8 !important;
-        color: #FFFFFF !important;
-    }}
-    .stSidebar {{
-        background: var(--material-surface) !important;
-        font-family: var(--material-font) !important;
-        border-right: 1px solid var(--material-outline) !important;
-        box-shadow: 2px 0 8px rgba(0,0,0,0.1) !important;
-        position: relative !important;
-        min-height: 100vh !important;
-    }}
-    .stSidebar .stRadio > label {{
-        color: #FFFFFF !important;
-    }}
-    /* Enhanced button styling for navigation */
-    .stSidebar .stButton > button {{
-        background: transparent !important;
-        color: #FFFFFF !important;
-        border: 1px solid transparent !important;
-        border-radius: 12px !important;
-        font-weight: 500 !important;
-        padding: 0.75rem 1rem !important;
-        text-align: left !important;
-        transition: all 0.2s ease !important;
-        margin-bottom: 0.3rem !important;
-    }}
-    .stSidebar .stButton > button:hover {{
-        background: var(--material-surface-variant) !important;
-        border-color: var(--material-outline) !important;
-        transform: translateX(2px) !important;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.15) !important;
-    }}
-    .stSidebar .stButton > button:focus {{
-        background: var(--material-primary) !important;
-        color: var(--material-on-primary) !important;
-        border-color: var(--material-primary) !important;
-    }}
-    .stSelectbox > div {{
-        background: var(--material-surface) !important;
-    }}
-    .stSelectbox option {{
-        background: var(--material-surface) !important;
-        color: #FFFFFF !important;
-    }}
-    .stNumberInput > div > input {{
-        background: var(--material-surface-variant) !important;
-        color: #FFFFFF !important;
-    }}
-    .stDateInput > div > input {{
-        background: var(--material-surface) !important;
-        color: #FFFFFF !important;
-    }}
-    .stFileUploader {{
-        background: var(--material-surface-variant) !important;
-        border-radius: var(--material-radius) !important;
-        color: #FFFFFF !important;
-    }}
-    .stProgress > div > div {{
-        background: var(--material-surface-variant) !important;
-    }}
-    .stProgress > div > div > div {{
-        background: var(--material-primary) !important;
-    }}
-    .stInfo {{
-        background: var(--material-surface-variant) !important;
-        border-left: 4px solid var(--material-secondary) !important;
-        color: #FFFFFF !important;
-    }}
-    .stSuccess {{
-        background: var(--material-surface-variant) !important;
-        border-left: 4px solid #4CAF50 !important;
-        color: #FFFFFF !important;
-    }}
-    .stError {{
-        background: var(--material-surface-variant) !important;
-        border-left: 4px solid var(--material-error) !important;
-        color: #FFFFFF !important;
-    }}
-    @media (max-width: 900px) {{
-        section[data-testid="stSidebar"] {{
-            margin: 0.5rem 0.2rem;
-            padding: 1rem 0.5rem;
-            min-width: 120px;
-            max-width: 100vw;
-        }}
-        .stApp {{
-            padding: 0.2rem 0.2rem 2.5rem 0.2rem !important;
-        }}
-        .stCard {{
-            padding: 0.7rem !important;
-        }}
-        /* Mobile navigation adjustments */
-        .nav-item {{
-            padding: 10px 12px !important;
-            font-size: 0.9rem !important;
-        }}
-        .nav-icon {{
-            margin-right: 8px !important;
-            font-size: 1.1rem !important;
-        }}
-    }}
-    }}
-    @media (max-width: 600px) {{
-        .stApp {{
-            padding: 0.1rem 0.1rem 2.5rem 0.1rem !important;
-        }}
-        h1, h2, h3 {{
-            font-size: 1.2rem !important;
-        }}
-        .stCard {{
-            font-size: 0.98rem !important;
-        }}
-        section[data-testid="stSidebar"] {{
-            padding: 0.5rem 0.2rem;
-        }}
-    }}
-    </style>
-    """
+    """Theme markup for a role (memoised; see modules/static_assets.py)"""
+    return get_theme_html(user_role)
 
 # Inject the theme CSS into the app
 def apply_theme(user_role=None):
@@ -372,179 +100,7 @@ def apply_theme(user_role=None):
         """, unsafe_allow_html=True)
     
     # Add Socket.IO client for real-time alerts
-    socketio_client_js = """
-    <script src="https://cdn.socket.io/4.0.0/socket.io.min.js"></script>
-    <script>
-    // Initialize Socket.IO client for real-time alerts
-    (function() {
-        if (window.metroSocketIO) return; // Prevent multiple initializations
-        
-        try {
-            const socket = io('http://localhost:8502', {
-                transports: ['polling', 'websocket'],
-                autoConnect: true,
-                timeout: 5000,
-                forceNew: false,
-                reconnection: true,
-                reconnectionAttempts: 3,
-                reconnectionDelay: 1000
-            });
-            
-            window.metroSocketIO = socket;
-            
-            // Connection events
-            socket.on('connect', function() {
-                console.log('🔌 Connected to MetroVivaram real-time alerts');
-                
-                // Subscribe to all alert types
-                socket.emit('subscribe_to_alerts', {
-                    alert_types: ['document_upload', 'feedback_received', 'priority_alert', 'system_metrics'],
-                    user_role: window.currentUserRole || 'viewer'
-                });
-            });
-            
-            socket.on('connect_error', function(error) {
-                console.warn('⚠️ Socket.IO connection failed:', error.message);
-                // Don't show user-facing errors for Socket.IO issues
-            });
-            
-            socket.on('disconnect', function() {
-                console.log('🔌 Disconnected from real-time alerts');
-            });
-        
-        // Alert handlers
-        socket.on('real_time_alert', function(data) {
-            console.log('📢 Real-time alert received:', data);
-            showRealTimeAlert(data);
-        });
-        
-        socket.on('connection_established', function(data) {
-            console.log('✅ Real-time alerts active:', data.message);
-        });
-        
-        socket.on('subscription_confirmed', function(data) {
-            console.log('✅ Subscribed to alerts:', data.subscribed_to);
-        });
-        
-        // Function to show real-time alerts
-        function showRealTimeAlert(alertData) {
-            // Create notification container if it doesn't exist
-            let notificationContainer = document.getElementById('realtime-notifications');
-            if (!notificationContainer) {
-                notificationContainer = document.createElement('div');
-                notificationContainer.id = 'realtime-notifications';
-                notificationContainer.style.cssText = `
-                    position: fixed;
-                    top: 20px;
-                    right: 20px;
-                    z-index: 10000;
-                    max-width: 400px;
-                    pointer-events: none;
-                `;
-                document.body.appendChild(notificationContainer);
-            }
-            
-            // Create alert element
-            const alertElement = document.createElement('div');
-            alertElement.style.cssText = `
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 16px;
-                margin-bottom: 12px;
-                border-radius: 12px;
-                box-shadow: 0 8px 24px rgba(0,0,0,0.3);
-                animation: slideInRight 0.3s ease-out;
-                pointer-events: auto;
-                cursor: pointer;
-                border-left: 4px solid #fff;
-                position: relative;
-                overflow: hidden;
-            `;
-            
-            // Alert content
-            const alertType = alertData.type || 'system';
-            const alertIcon = getAlertIcon(alertType);
-            const alertMessage = alertData.data?.message || 'New alert received';
-            
-            alertElement.innerHTML = `
-                <div style="display: flex; align-items: flex-start; gap: 12px;">
-                    <div style="font-size: 24px; flex-shrink: 0;">${alertIcon}</div>
-                    <div style="flex: 1;">
-                        <div style="font-weight: 600; margin-bottom: 4px;">${getAlertTitle(alertType)}</div>
-                        <div style="font-size: 14px; opacity: 0.9; line-height: 1.4;">${alertMessage}</div>
-                        <div style="font-size: 12px; opacity: 0.7; margin-top: 6px;">
-                            ${new Date(alertData.timestamp).toLocaleTimeString()}
-                        </div>
-                    </div>
-                    <div style="cursor: pointer; opacity: 0.7; font-size: 18px;" onclick="this.parentElement.parentElement.remove()">×</div>
-                </div>
-            `;
-            
-            // Auto-remove after 8 seconds
-            setTimeout(() => {
-                if (alertElement.parentNode) {
-                    alertElement.style.animation = 'slideOutRight 0.3s ease-in';
-                    setTimeout(() => alertElement.remove(), 300);
-                }
-            }, 8000);
-            
-            // Click to dismiss
-            alertElement.onclick = function() {
-                this.style.animation = 'slideOutRight 0.3s ease-in';
-                setTimeout(() => this.remove(), 300);
-            };
-            
-            notificationContainer.appendChild(alertElement);
-        }
-        
-        function getAlertIcon(type) {
-            const icons = {
-                'document_upload': '📄',
-                'feedback_received': '💬',
-                'priority_alert': '⚠️',
-                'system_metrics': '📊',
-                'user_activity': '👤',
-                'document_expiry': '⏰'
-            };
-            return icons[type] || '🔔';
-        }
-        
-        function getAlertTitle(type) {
-            const titles = {
-                'document_upload': 'New Document',
-                'feedback_received': 'New Feedback',
-                'priority_alert': 'Priority Alert',
-                'system_metrics': 'System Update',
-                'user_activity': 'User Activity',
-                'document_expiry': 'Document Expiry'
-            };
-            return titles[type] || 'System Alert';
-        }
-        
-        // Add CSS animations
-        const style = document.createElement('style');
-        style.textContent = `
-            @keyframes slideInRight {
-                from { transform: translateX(400px); opacity: 0; }
-                to { transform: translateX(0); opacity: 1; }
-            }
-            @keyframes slideOutRight {
-                from { transform: translateX(0); opacity: 1; }
-                to { transform: translateX(400px); opacity: 0; }
-            }
-        `;
-        document.head.appendChild(style);
-        
-        } catch (error) {
-            console.warn('⚠️ Socket.IO initialization failed:', error);
-            // Continue without real-time alerts if Socket.IO fails
-        }
-        
-    })();
-    </script>
-    """
-    
-    st.markdown(socketio_client_js, unsafe_allow_html=True)
+    st.markdown(get_realtime_client_html(), unsafe_allow_html=True)
 
 # --- Audit Log Page (Material U style) ---
 def show_audit_page(user_info=None):
@@ -554,7 +110,7 @@ def show_audit_page(user_info=None):
         <p style="color: #FFFFFF; margin: 0;">Recent user activity and document access logs</p>
     </div>
     """, unsafe_allow_html=True)
-    db = database.DocumentDatabase()
+    db = get_database()
     audit_log = db.get_audit_log(limit=100)
     if audit_log:
         table = []
@@ -572,14 +128,17 @@ def show_audit_page(user_info=None):
 
 def show_analytics_page(user_info):
     """Enhanced analytics and statistics page"""
+    import plotly.express as px
     st.markdown("""
     <div class="main-header" style="background: var(--material-surface); padding: 1.5rem; border-radius: var(--material-radius); margin-bottom: 1rem; border: 1px solid var(--material-outline);">
         <h2 style="color: var(--material-primary); margin-bottom: 0.5rem;">📊 Analytics Dashboard</h2>
         <p style="color: #FFFFFF; margin: 0;">Comprehensive insights and document statistics</p>
     </div>
     """, unsafe_allow_html=True)
-    db = database.DocumentDatabase()
-    stats = db.get_statistics()
+    db = get_database()
+    # Columnar snapshot shared by all sessions (None without pandas)
+    snapshot = get_analytics_snapshot(db)
+    stats = snapshot.statistics() if snapshot is not None else db.get_statistics()
     # Enhanced metrics display
     st.subheader("📈 System Overview")
     col1, col2, col3, col4 = st.columns(4)
@@ -628,6 +187,52 @@ def show_analytics_page(user_info):
                     paper_bgcolor='rgba(0,0,0,0)',
                 )
                 st.plotly_chart(fig, use_container_width=True)
+        if snapshot is not None:
+            show_trend_charts(snapshot)
+        else:
+            st.caption("Install pandas for upload and feedback trend charts.")
+
+def show_trend_charts(snapshot):
+    """Time-bucketed upload, feedback and engagement charts from the analytics snapshot"""
+    import plotly.express as px
+    layout = dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    st.subheader("📅 Trends")
+    col1, col2 = st.columns(2)
+    with col1:
+        bucket = st.selectbox("Time bucket", list(ANALYTICS_TIME_BUCKETS), index=1, key="analytics_bucket")
+    with col2:
+        split_labels = {"Document type": "document_type", "Priority": "priority", "Uploader role": "uploader_role"}
+        split = st.selectbox("Split uploads by", list(split_labels), key="analytics_split")
+    freq = ANALYTICS_TIME_BUCKETS[bucket]
+
+    uploads = snapshot.uploads_over_time(freq, by=split_labels[split])
+    if not uploads.empty:
+        series = uploads.reset_index().melt(id_vars="upload_date", var_name=split, value_name="Uploads")
+        fig = px.area(series, x="upload_date", y="Uploads", color=split, title=f"Uploads per {bucket.lower()}")
+        fig.update_layout(xaxis_title=None, **layout)
+        st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        feedback = snapshot.feedback_over_time(freq)
+        if not feedback.empty:
+            series = feedback.reset_index().melt(id_vars="timestamp", var_name="Feedback", value_name="Entries")
+            fig = px.bar(series, x="timestamp", y="Entries", color="Feedback", title=f"Feedback per {bucket.lower()}",
+                         color_discrete_map={'like': '#4CAF50', 'dislike': '#FF5722'})
+            fig.update_layout(xaxis_title=None, **layout)
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No feedback yet.")
+    with col2:
+        engagement = snapshot.engagement_by_type()
+        engagement = engagement[engagement["with_feedback"] > 0]
+        if not engagement.empty:
+            fig = px.bar(engagement.reset_index(), x="document_type", y="engagement_rate",
+                         hover_data=["documents", "likes", "dislikes", "comments"],
+                         title="Feedback engagement by type (% of documents)",
+                         color="engagement_rate", color_continuous_scale="Purples")
+            fig.update_layout(xaxis_title=None, yaxis_title="%", showlegend=False, **layout)
+            st.plotly_chart(fig, use_container_width=True)
 
 def show_demo_access_screen():
     """Demo access control screen"""
@@ -689,11 +294,15 @@ def main():
         if not st.session_state.socketio_server_started:
             try:
                 # Only try to start Socket.IO if it's available
-                if SOCKETIO_AVAILABLE:
+                if SOCKETIO_AVAILABLE and ALERT_SERVICE_MODE == "external":
+                    # The alert service runs as its own process (python -m modules.alert_service)
+                    print("ℹ️ Using external alert service for real-time alerts")
+                    st.session_state.socketio_server_started = True
+                elif SOCKETIO_AVAILABLE:
                     import threading
                     def init_socketio():
                         try:
-                            start_socketio_server(port=8502)
+                            start_socketio_server(port=SOCKETIO_PORT)
                             st.session_state.socketio_server_started = True
                             print("✅ Socket.IO server initialized for real-time alerts")
                         except Exception as e:
@@ -711,6 +320,12 @@ def main():
                 print(f"⚠️ Socket.IO server initialization failed (continuing without real-time alerts): {e}")
                 st.session_state.socketio_server_started = True  # Mark as attempted
         
+        # Prometheus endpoint and system metrics publisher (once per process)
+        if 'metrics_server_started' not in st.session_state:
+            start_metrics_server()
+            start_system_metrics_publisher()
+            st.session_state.metrics_server_started = True
+        
         # Demo access control - uncomment to enable
         if 'demo_access_granted' not in st.session_state:
             st.session_state.demo_access_granted = False
@@ -743,9 +358,6 @@ def main():
         # Apply role-specific theme
         apply_theme(user_info['role'])
         
-        # Responsive CSS for mobile-friendliness
-        st.markdown(responsive_css, unsafe_allow_html=True)
-        
         # Modern Material U Navigation Sidebar
         with st.sidebar:
             # User Profile Card
@@ -786,46 +398,7 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             
-            # Navigation Menu with Material U styling
-            st.markdown("""
-                <style>
-                .nav-item {
-                    display: flex;
-                    align-items: center;
-                    padding: 12px 16px;
-                    margin: 4px 0;
-                    border-radius: 12px;
-                    cursor: pointer;
-                    transition: all 0.2s ease;
-                    text-decoration: none;
-                    color: #FFFFFF;
-                    font-weight: 500;
-                    font-size: 0.95rem;
-                    background: transparent;
-                    border: none;
-                    width: 100%;
-                }
-                .nav-item:hover {
-                    background: var(--material-surface-variant);
-                    transform: translateX(4px);
-                }
-                .nav-item.active {
-                    background: var(--material-primary);
-                    color: var(--material-on-primary);
-                    font-weight: 600;
-                }
-                .nav-icon {
-                    margin-right: 12px;
-                    font-size: 1.2rem;
-                    width: 24px;
-                    text-align: center;
-                }
-                .nav-container {
-                    margin-bottom: 1.5rem;
-                }
-                </style>
-            """, unsafe_allow_html=True)
-            
+            # Navigation Menu (styles live in assets/theme.css)
             # Initialize session state for navigation
             if 'current_page' not in st.session_state:
                 st.session_state.current_page = "Dashboard"
@@ -836,6 +409,9 @@ def main():
                 {"name": "Upload", "icon": "📤", "label": "Upload Documents"},
                 {"name": "Audit Log", "icon": "📝", "label": "Audit Log"}
             ]
+            if user_info['role'] in ADMIN_ROLES:
+                nav_items.append({"name": "Pipeline Metrics", "icon": "📈", "label": "Pipeline Metrics"})
+                nav_items.append({"name": "System Performance", "icon": "🖥️", "label": "System Performance"})
             
             st.markdown('<div class="nav-container">', unsafe_allow_html=True)
             
@@ -864,31 +440,6 @@ def main():
             """, unsafe_allow_html=True)
             
             # Enhanced Logout Button
-            st.markdown("""
-                <style>
-                .logout-btn {
-                    background: linear-gradient(135deg, #ff4444, #cc3333) !important;
-                    color: white !important;
-                    border: none !important;
-                    border-radius: 12px !important;
-                    padding: 12px 20px !important;
-                    font-weight: 600 !important;
-                    font-size: 0.95rem !important;
-                    width: 100% !important;
-                    display: flex !important;
-                    align-items: center !important;
-                    justify-content: center !important;
-                    transition: all 0.2s ease !important;
-                    box-shadow: 0 2px 8px rgba(255, 68, 68, 0.3) !important;
-                }
-                .logout-btn:hover {
-                    transform: translateY(-2px) !important;
-                    box-shadow: 0 4px 12px rgba(255, 68, 68, 0.4) !important;
-                    background: linear-gradient(135deg, #ff5555, #dd4444) !important;
-                }
-                </style>
-            """, unsafe_allow_html=True)
-            
             if st.button("🚪 Logout", key="logout_btn", help="Sign out of your account", use_container_width=True):
                 auth_manager.logout()
             
@@ -906,7 +457,9 @@ def main():
         page_icons = {
             "Dashboard": "📊",
             "Upload": "📤", 
-            "Audit Log": "📝"
+            "Audit Log": "📝",
+            "Pipeline Metrics": "📈",
+            "System Performance": "🖥️"
         }
         
         st.markdown(f"""
@@ -947,12 +500,21 @@ def main():
         """, unsafe_allow_html=True)
         
         # Main content area
+        # Pages are imported on first visit so cold starts skip the OCR/ML stack
         if page == "Dashboard":
+            from pages import dashboard
             dashboard.show_dashboard_page(user_info)
         elif page == "Upload":
+            from pages import upload
             upload.show_upload_page(user_info)
         elif page == "Audit Log":
             show_audit_page(user_info)
+        elif page == "Pipeline Metrics":
+            from pages import metrics as metrics_page
+            metrics_page.show_metrics_page(user_info)
+        elif page == "System Performance":
+            from pages import performance
+            performance.show_performance_page(user_info)
             
     except Exception as e:
         st.error(f"Application error: {str(e)}")
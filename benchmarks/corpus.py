@@ -0,0 +1,245 @@
+"""
+Deterministic synthetic corpus for the pipeline benchmarks
+Generates English, Malayalam and hybrid document text seeded by a fixed
+value (with document-type keywords and the emails, phone numbers and amounts
+redaction looks for), and renders it locally to PNG scans, image-only PDFs,
+typed PDFs with a text layer, DOCX and plain text.
+
+    python -m benchmarks.corpus --out data/benchmark_corpus --scales 1000 10000
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import DOCUMENT_TYPES
+
+LANGUAGES = ("english", "malayalam", "hybrid")
+KINDS = ("png", "scanned_pdf", "text_pdf", "docx", "txt")
+
+MIME_TYPES = {
+    "png": "image/png",
+    "scanned_pdf": "application/pdf",
+    "text_pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain",
+}
+EXTENSIONS = {"png": ".png", "scanned_pdf": ".pdf", "text_pdf": ".pdf", "docx": ".docx", "txt": ".txt"}
+
+ENGLISH_FILLER = ["the", "metro", "station", "line", "train", "platform", "staff", "schedule", "will",
+                  "be", "reviewed", "by", "all", "departments", "before", "the", "deadline", "please",
+                  "ensure", "records", "are", "updated", "Kochi", "Aluva", "Vyttila", "monthly"]
+MALAYALAM_WORDS = ["മെട്രോ", "സ്റ്റേഷൻ", "സുരക്ഷ", "അറിയിപ്പ്", "ജീവനക്കാർ", "പരിശീലനം", "കൊച്ചി",
+                   "ട്രെയിൻ", "യാത്രക്കാർ", "നിർദ്ദേശം", "റിപ്പോർട്ട്", "അടിയന്തര", "ബില്ല്", "തുക",
+                   "മാസം", "ദിവസം", "ഉത്തരവ്", "പദ്ധതി", "അറ്റകുറ്റപ്പണി", "സമയം"]
+
+# Rendering: A4 at 150 dpi
+PAGE_SIZE = (1240, 1754)
+PAGE_MARGIN = 90
+FONT_SIZE = 26
+LINE_HEIGHT = 38
+CHARS_PER_LINE = 70
+
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/noto/NotoSansMalayalam-Regular.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansMalayalam-Regular.ttf",
+    "/usr/share/fonts/truetype/lohit-malayalam/Lohit-Malayalam.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+
+def _sensitive_token(rng: random.Random) -> str:
+    choice = rng.randrange(3)
+    if choice == 0:
+        return f"officer{rng.randrange(100)}@kochimetro.org"
+    if choice == 1:
+        return f"9{rng.randrange(10 ** 9):09d}"
+    return f"₹{rng.randrange(1, 999)},{rng.randrange(1000):03d}.00"
+
+
+def generate_text(language: str, size: int, seed: int = 0) -> str:
+    """
+    Deterministic document text of exactly `size` characters
+
+    Args:
+        language: 'english', 'malayalam' or 'hybrid' (alternating sentences)
+        size: Number of characters
+        seed: Random seed; the same arguments always give the same text
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown language: {language}")
+    rng = random.Random(f"{language}:{size}:{seed}")
+    doc_type = rng.choice(sorted(DOCUMENT_TYPES))
+    keywords = DOCUMENT_TYPES[doc_type]
+
+    sentences = [doc_type.upper()]
+    length = len(sentences[0])
+    index = 0
+    while length < size:
+        malayalam = language == "malayalam" or (language == "hybrid" and index % 2 == 1)
+        words = [rng.choice(MALAYALAM_WORDS if malayalam else ENGLISH_FILLER) for _ in range(rng.randint(8, 14))]
+        if not malayalam:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        if index % 5 == 4:
+            words.append(_sensitive_token(rng))
+        sentence = " ".join(words) + "."
+        sentences.append(sentence[0].upper() + sentence[1:])
+        length += len(sentence) + 1
+        index += 1
+    return " ".join(sentences)[:size]
+
+
+def _wrap(text: str, width: int = CHARS_PER_LINE) -> List[str]:
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _paginate(text: str) -> List[List[str]]:
+    lines_per_page = (PAGE_SIZE[1] - 2 * PAGE_MARGIN) // LINE_HEIGHT
+    lines = _wrap(text)
+    return [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+
+def _load_font():
+    from PIL import ImageFont
+    for candidate in FONT_CANDIDATES:
+        if Path(candidate).exists():
+            return ImageFont.truetype(candidate, FONT_SIZE)
+    return ImageFont.load_default()
+
+
+def render_pages(text: str) -> list:
+    """Render text to grayscale page images (Malayalam needs one of FONT_CANDIDATES installed)"""
+    from PIL import Image, ImageDraw
+    font = _load_font()
+    pages = []
+    for lines in _paginate(text):
+        image = Image.new("L", PAGE_SIZE, 255)
+        draw = ImageDraw.Draw(image)
+        for row, line in enumerate(lines):
+            draw.text((PAGE_MARGIN, PAGE_MARGIN + row * LINE_HEIGHT), line, fill=0, font=font)
+        pages.append(image)
+    return pages
+
+
+def _pdf_string(line: str) -> str:
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: Path, text: str):
+    """
+    Write a typed PDF with a real text layer (standard Helvetica font)
+
+    Only Latin-1 text is representable without embedding a font; other
+    characters become '?', so typed PDFs are generated for English text only.
+    """
+    pages = _paginate(text)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    width, height = 595, 842  # A4 in points
+    for lines in pages:
+        commands = ["BT", "/F1 10 Tf", "14 TL", f"50 {height - 60} Td"]
+        commands += [f"({_pdf_string(line)}) '" for line in lines]
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        body = body.encode("latin-1") if isinstance(body, str) else body
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    Path(path).write_bytes(bytes(out))
+
+
+def write_document(kind: str, path: Path, text: str):
+    """Write text as one corpus file of the given kind"""
+    if kind == "txt":
+        path.write_text(text, encoding="utf-8")
+    elif kind == "text_pdf":
+        write_text_pdf(path, text)
+    elif kind == "docx":
+        import docx
+        document = docx.Document()
+        for paragraph in text.split(". "):
+            document.add_paragraph(paragraph)
+        document.save(str(path))
+    elif kind == "png":
+        render_pages(text)[0].save(path, dpi=(150, 150))
+    elif kind == "scanned_pdf":
+        pages = render_pages(text)
+        pages[0].save(path, "PDF", resolution=150, save_all=True, append_images=pages[1:])
+    else:
+        raise ValueError(f"Unknown corpus kind: {kind}")
+
+
+def build_corpus(out_dir: Path, scales: List[int], languages=LANGUAGES, kinds=KINDS,
+                 seed: int = 0) -> List[Dict]:
+    """
+    Generate every (language, kind, scale) combination into out_dir
+
+    PNG holds only the first page of text. Typed PDFs are English-only. Existing
+    files are reused, since generation is deterministic.
+
+    Returns:
+        Manifest entries with 'path', 'kind', 'language', 'chars' and 'mime'
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for scale in scales:
+        for language in languages:
+            text = generate_text(language, scale, seed)
+            for kind in kinds:
+                if kind == "text_pdf" and language != "english":
+                    continue
+                path = out_dir / f"{language}_{scale}_s{seed}_{kind}{EXTENSIONS[kind]}"
+                if not path.exists():
+                    write_document(kind, path, text)
+                manifest.append({"path": str(path), "kind": kind, "language": language,
+                                 "chars": scale, "mime": MIME_TYPES[kind]})
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI entry point: generate the corpus"""
+    parser = argparse.ArgumentParser(description="Generate the synthetic benchmark corpus")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000], help="Text sizes in characters")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--languages", nargs="+", choices=LANGUAGES, default=list(LANGUAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    manifest = build_corpus(args.out, args.scales, args.languages, args.kinds, args.seed)
+    for entry in manifest:
+        print(f"{entry['kind']:12s} {entry['language']:10s} {entry['chars']:>8d} chars  {entry['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
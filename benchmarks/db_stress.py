@@ -0,0 +1,141 @@
+"""
+Concurrency stress test for the JSON document store
+Runs parallel uploaders (processes or threads) against one temporary data
+directory, each adding documents and feedback through DocumentDatabase, then
+checks that no update was lost: every document, feedback entry and audit
+entry is present exactly once, ids are unique, the files parse and the
+generation counter matches the number of writes. With --kill, extra writers
+are SIGKILLed mid-run to show that a crash never leaves a truncated file.
+Exits 1 if any check fails.
+
+    python -m benchmarks.db_stress --workers 8 --docs 25
+    python -m benchmarks.db_stress --mode thread --workers 16 --docs 10 --kill 2
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from modules.database import DocumentDatabase
+
+FEEDBACK_EVERY = 5  # One feedback entry per this many uploads
+
+
+def uploader(data_dir: str, worker: int, docs: int) -> Dict:
+    """Add docs documents (and some feedback) as one user; returns the ids added"""
+    db = DocumentDatabase(data_dir=data_dir)
+    user_info = {"name": f"stress_{worker}", "role": "Engineer"}
+    ids, feedback = [], 0
+    started = time.perf_counter()
+    for i in range(docs):
+        record = db.add_document({"filename": f"w{worker}_{i}.pdf", "file_type": "application/pdf",
+                                  "document_type": "Safety Notice", "summary": f"Stress document {worker}/{i}"},
+                                 user_info)
+        ids.append(record["id"])
+        if i % FEEDBACK_EVERY == 0:
+            result = db.add_feedback(record["id"], "like", user_info=user_info)
+            feedback += bool(result.get("success"))
+    return {"worker": worker, "ids": ids, "feedback": feedback, "seconds": time.perf_counter() - started}
+
+
+def _process_entry(args):
+    return uploader(*args)
+
+
+def _doomed_writer(data_dir: str):
+    """Writes as fast as it can until it is killed"""
+    uploader(data_dir, -1, 10 ** 9)
+
+
+def run(workers: int, docs: int, mode: str, kill: int) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="metro_stress_") as tmp:
+        db = DocumentDatabase(data_dir=tmp)
+        doomed = [multiprocessing.Process(target=_doomed_writer, args=(tmp,), daemon=True) for _ in range(kill)]
+        for process in doomed:
+            process.start()
+
+        started = time.perf_counter()
+        jobs = [(tmp, worker, docs) for worker in range(workers)]
+        if mode == "process":
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_process_entry, jobs)
+        else:
+            results = [None] * workers
+            threads = [threading.Thread(target=lambda w=w: results.__setitem__(w, uploader(*jobs[w])))
+                       for w in range(workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+
+        for process in doomed:
+            process.kill()  # SIGKILL: no cleanup, possibly mid-write
+            process.join()
+
+        # Everything must still parse after the kills
+        documents = json.loads(db.db_file.read_text(encoding="utf-8"))
+        audit_log = json.loads(db.audit_file.read_text(encoding="utf-8"))
+        generation = db.documents_store.generation()
+
+    expected_ids = [doc_id for result in results for doc_id in result["ids"]]
+    stored = {doc["id"]: doc for doc in documents if doc["uploaded_by"] != "stress_-1"}
+    expected_feedback = sum(result["feedback"] for result in results)
+    stored_feedback = sum(len(doc.get("feedback", [])) for doc in stored.values())
+    audit_entries = sum(1 for entry in audit_log if entry["user_name"] != "stress_-1")
+    doomed_docs = sum(1 for doc in documents if doc["uploaded_by"] == "stress_-1")
+    doomed_feedback = sum(len(doc.get("feedback", [])) for doc in documents if doc["uploaded_by"] == "stress_-1")
+
+    checks = {
+        "unique_ids": len(set(expected_ids)) == len(expected_ids),
+        "no_lost_documents": all(doc_id in stored for doc_id in expected_ids),
+        "no_lost_feedback": stored_feedback == expected_feedback,
+        "audit_complete": audit_entries == len(expected_ids) + expected_feedback,
+    }
+    if not kill:
+        # Initial save, one write per document and per feedback entry (a writer killed
+        # between the data and .meta renames legitimately leaves the counter one behind)
+        checks["generation"] = generation == 1 + len(documents) + stored_feedback + doomed_feedback
+    return {
+        "mode": mode,
+        "workers": workers,
+        "docs_per_worker": docs,
+        "killed_writers": kill,
+        "documents": len(expected_ids),
+        "killed_writer_documents": doomed_docs,
+        "feedback": expected_feedback,
+        "seconds": elapsed,
+        "writes_per_second": (len(expected_ids) + expected_feedback) / elapsed if elapsed else 0.0,
+        "checks": checks,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI entry point for the store stress test"""
+    parser = argparse.ArgumentParser(description="Parallel uploaders against one JSON document store")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel uploaders")
+    parser.add_argument("--docs", type=int, default=20, help="Documents per uploader")
+    parser.add_argument("--mode", choices=("process", "thread"), default="process")
+    parser.add_argument("--kill", type=int, default=0, help="Extra writers SIGKILLed when the run ends")
+    parser.add_argument("--json", help="Write the result to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = run(args.workers, args.docs, args.mode, args.kill)
+    print(f"{result['documents']} documents and {result['feedback']} feedback entries from "
+          f"{result['workers']} {result['mode']} uploaders in {result['seconds']:.2f}s "
+          f"({result['writes_per_second']:.1f} writes/s)")
+    for name, passed in result["checks"].items():
+        print(f"  {'ok  ' if passed else 'FAIL'} {name}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+    return 0 if all(result["checks"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
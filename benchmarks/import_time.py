@@ -0,0 +1,118 @@
+"""
+Import-time benchmark for MetroVivaram cold starts
+Runs each target in a fresh interpreter under `python -X importtime`,
+reports cumulative import time and fails (exit code 1) when a target is over
+its budget or pulls in one of the heavy OCR/ML libraries that should only be
+imported on first use.
+
+    python -m benchmarks.import_time --repeat 5 --json import_times.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from config import BASE_DIR
+
+# Cumulative import budget per target, in milliseconds
+IMPORT_TIME_BUDGETS_MS = {
+    "app": 2500,
+    "pages.dashboard": 2500,
+    "pages.upload": 1500,
+    "modules.ocr_processor": 800,
+    "modules.document_classifier": 800,
+    "modules.summarizer": 50,
+}
+
+# Libraries that must stay deferred until OCR, PDF extraction or summarisation runs
+HEAVY_MODULES = ["transformers", "torch", "pytesseract", "pdf2image", "PyPDF2",
+                 "cv2", "fuzzywuzzy", "langdetect", "tesserocr"]
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map each imported module to its cumulative import time in microseconds"""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            timings[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+    return timings
+
+
+def measure(target: str) -> Dict:
+    """Import a target in a fresh interpreter and collect its import timings"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    timings = parse_importtime(result.stderr)
+    return {
+        "ok": result.returncode == 0,
+        "cumulative_ms": timings.get(target, 0) / 1000,
+        "heavy_imports": sorted(name for name in timings if name in HEAVY_MODULES),
+        "error": result.stderr.strip().splitlines()[-1] if result.returncode else None,
+    }
+
+
+def run(targets: List[str], repeat: int, budgets: Dict[str, float]) -> List[Dict]:
+    """Measure every target, keeping the fastest of several runs"""
+    results = []
+    for target in targets:
+        runs = [measure(target) for _ in range(repeat)]
+        best = min(runs, key=lambda r: r["cumulative_ms"])
+        budget = budgets.get(target)
+        results.append({
+            "target": target,
+            "ok": all(r["ok"] for r in runs),
+            "best_ms": best["cumulative_ms"],
+            "median_ms": sorted(r["cumulative_ms"] for r in runs)[len(runs) // 2],
+            "budget_ms": budget,
+            "over_budget": budget is not None and best["cumulative_ms"] > budget,
+            "heavy_imports": best["heavy_imports"],
+            "error": best["error"],
+        })
+    return results
+
+
+def main(argv=None):
+    """CLI entry point for the import-time benchmark"""
+    parser = argparse.ArgumentParser(description="Measure MetroVivaram import times against budgets")
+    parser.add_argument("targets", nargs="*", default=list(IMPORT_TIME_BUDGETS_MS), help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per target")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS",
+                        help="Override a budget, e.g. --budget app=2000")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    budgets = dict(IMPORT_TIME_BUDGETS_MS)
+    for override in args.budget:
+        name, _, value = override.partition("=")
+        budgets[name] = float(value)
+
+    results = run(args.targets, args.repeat, budgets)
+    failed = False
+    for r in results:
+        problems = []
+        if not r["ok"]:
+            problems.append(f"import failed: {r['error']}")
+        if r["over_budget"]:
+            problems.append(f"over budget ({r['budget_ms']:.0f} ms)")
+        if r["heavy_imports"]:
+            problems.append(f"eagerly imports {', '.join(r['heavy_imports'])}")
+        failed = failed or bool(problems)
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"{r['target']:30s} best {r['best_ms']:8.1f} ms  median {r['median_ms']:8.1f} ms  {status}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
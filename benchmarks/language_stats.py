@@ -0,0 +1,100 @@
+"""
+Language-detection benchmark
+Compares the single-pass ScriptHistogram against the previous regex-based
+counting on synthetic English/Malayalam text of several sizes, checks that
+both give identical percentages and reports the speed-up. Exits 1 on any
+mismatch.
+
+    python -m benchmarks.language_stats --sizes 1000 100000 1000000
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from modules.language_stats import ScriptHistogram
+
+ENGLISH_WORDS = ["metro", "safety", "circular", "invoice", "Kochi", "station", "maintenance", "GST"]
+MALAYALAM_WORDS = ["മെട്രോ", "സുരക്ഷ", "അറിയിപ്പ്", "സ്റ്റേഷൻ", "കൊച്ചി"]
+OTHER_TOKENS = ["2024", "12.5%", "-", "(A)", "\n"]
+
+
+def regex_percentages(text: str) -> Dict[str, float]:
+    """The counting previously done inline in detect_content_language"""
+    malayalam_chars = sum(len(match) for match in re.findall(r'[ഀ-ൿ]+', text))
+    english_chars = sum(len(match) for match in re.findall(r'[a-zA-Z]+', text))
+    total_chars = len(text.replace(' ', ''))
+    return {
+        'malayalam_percentage': (malayalam_chars / total_chars * 100) if total_chars > 0 else 0,
+        'english_percentage': (english_chars / total_chars * 100) if total_chars > 0 else 0,
+    }
+
+
+def histogram_percentages(text: str) -> Dict[str, float]:
+    counts = ScriptHistogram.from_text(text)
+    return {'malayalam_percentage': counts.malayalam_percentage, 'english_percentage': counts.english_percentage}
+
+
+def make_text(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    tokens = ENGLISH_WORDS * 3 + MALAYALAM_WORDS * 2 + OTHER_TOKENS
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(tokens)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def best_time(func, text: str, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sizes: List[int], repeat: int) -> List[Dict]:
+    results = []
+    for size in sizes:
+        text = make_text(size)
+        regex_s = best_time(regex_percentages, text, repeat)
+        histogram_s = best_time(histogram_percentages, text, repeat)
+        results.append({
+            "chars": size,
+            "regex_ms": regex_s * 1000,
+            "histogram_ms": histogram_s * 1000,
+            "speedup": regex_s / histogram_s if histogram_s else 0.0,
+            "identical": regex_percentages(text) == histogram_percentages(text),
+        })
+    return results
+
+
+def main(argv=None):
+    """CLI entry point for the language-detection benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark single-pass script counting against regex counting")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000], help="Text sizes in characters")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size (fastest is kept)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    for r in results:
+        status = "ok" if r["identical"] else "MISMATCH"
+        print(f"{r['chars']:>10d} chars  regex {r['regex_ms']:9.2f} ms  histogram {r['histogram_ms']:9.2f} ms  "
+              f"x{r['speedup']:5.1f}  {status}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+PDF text-extraction backend benchmark
+Extracts the text layer of every PDF in uploads/ (or the given files) with
+each installed backend and reports pages per second, so the fastest one can
+be chosen for METRO_PDF_TEXT_BACKEND.
+
+    python -m benchmarks.pdf_backends --repeat 3 --json pdf_backends.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from config import UPLOAD_DIR
+from modules.pdf_text import PDF_TEXT_BACKENDS, available_backends
+
+
+def bench_backend(name: str, documents: List[bytes], repeat: int) -> Dict:
+    """Time one backend over all documents, keeping the fastest of several runs"""
+    backend = PDF_TEXT_BACKENDS[name]
+    best = None
+    pages = chars = failures = 0
+    for _ in range(repeat):
+        pages = chars = failures = 0
+        started = time.perf_counter()
+        for pdf_bytes in documents:
+            try:
+                for text in backend.iter_pages(pdf_bytes):
+                    pages += 1
+                    chars += len(text)
+            except Exception:
+                failures += 1
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "backend": name,
+        "documents": len(documents),
+        "pages": pages,
+        "characters": chars,
+        "failures": failures,
+        "seconds": best,
+        "pages_per_second": pages / best if best else 0.0,
+    }
+
+
+def main(argv=None):
+    """CLI entry point for the PDF backend benchmark"""
+    parser = argparse.ArgumentParser(description="Compare PDF text-extraction backends")
+    parser.add_argument("paths", nargs="*", type=Path, help=f"PDF files (default: all PDFs in {UPLOAD_DIR})")
+    parser.add_argument("--backend", action="append", choices=sorted(PDF_TEXT_BACKENDS),
+                        help="Backend to include (repeatable; default: every installed backend)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(Path(UPLOAD_DIR).glob("*.pdf"))
+    if not paths:
+        print(f"No PDFs found in {UPLOAD_DIR}")
+        return 1
+    documents = [path.read_bytes() for path in paths]
+
+    backends = args.backend or available_backends()
+    missing = [name for name in backends if not PDF_TEXT_BACKENDS[name].is_available()]
+    if missing:
+        print(f"Not installed, skipping: {', '.join(missing)}")
+    backends = [name for name in backends if name not in missing]
+    if not backends:
+        print("No PDF text backend is installed")
+        return 1
+
+    print(f"{len(documents)} PDFs, {sum(len(d) for d in documents) / 1024:.0f} KiB")
+    results = [bench_backend(name, documents, args.repeat) for name in backends]
+    for r in results:
+        failed = f"  {r['failures']} failed" if r["failures"] else ""
+        print(f"{r['backend']:10s} {r['pages']:6d} pages  {r['seconds'] * 1000:9.1f} ms  "
+              f"{r['pages_per_second']:9.1f} pages/s  {r['characters']:9d} chars{failed}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+End-to-end benchmark of the document pipeline
+Times each stage - OCR/extraction (AdvancedOCRProcessor.process_document),
+language detection, classification, redaction, summarisation and
+DocumentDatabase operations - on the deterministic synthetic corpus at several
+scales: characters of text for the text stages, stored documents for the
+database stages. Results are written as JSON that can be compared across
+commits; with --baseline the run fails (exit code 1) when a stage regresses
+beyond its threshold.
+
+    python -m benchmarks.pipeline --json bench.json
+    python -m benchmarks.pipeline --baseline bench.json --threshold 0.2 --stage-threshold ocr=0.5
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config import BASE_DIR, DATA_DIR, DOCUMENT_TYPES
+from benchmarks.corpus import LANGUAGES, KINDS, build_corpus, generate_text
+
+STAGES = ("ocr", "language", "classify", "redact", "summarize", "db")
+DEFAULT_SCALES = [1000, 10000, 100000]
+
+# Stages too slow to run at every scale by default (override with --max-scale stage=N)
+STAGE_MAX_SCALE = {"ocr": 10000, "summarize": 10000}
+
+# Allowed slowdown of the median against the baseline, per stage (fraction)
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+STAGE_REGRESSION_THRESHOLDS = {"ocr": 0.5, "summarize": 0.5}
+
+# Timings below this are dominated by noise and never count as regressions
+MIN_COMPARABLE_MS = 1.0
+
+DB_SEARCH_QUERY = "safety"
+ROLES = ("Engineer", "Finance", "HR", "Station Controller", "Compliance Officer")
+DB_ADDS_PER_RUN = 5
+
+
+class CorpusFile(io.BytesIO):
+    """In-memory stand-in for a Streamlit UploadedFile"""
+
+    def __init__(self, path: Path, mime: str):
+        super().__init__(Path(path).read_bytes())
+        self.name = Path(path).name
+        self.type = mime
+
+
+def measure(func: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict:
+    """Run func `repeat` times (after optional untimed per-run setup) and summarise wall times"""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        runs.append((time.perf_counter() - started) * 1000)
+    return {"best_ms": min(runs), "median_ms": statistics.median(runs), "runs": len(runs)}
+
+
+def _result(stage: str, case: str, scale: int, timing: Dict, **extra) -> Dict:
+    return {"key": f"{stage}/{case}/{scale}", "stage": stage, "case": case, "scale": scale, **timing, **extra}
+
+
+def _skipped(stage: str, reason: str) -> Dict:
+    return {"key": f"{stage}/skipped", "stage": stage, "case": "skipped", "scale": 0, "skipped": reason}
+
+
+def bench_ocr(scales: List[int], repeat: int, corpus_dir: Path, seed: int) -> List[Dict]:
+    from modules.ocr_processor import AdvancedOCRProcessor
+    processor = AdvancedOCRProcessor()
+    results = []
+    for entry in build_corpus(corpus_dir, scales, LANGUAGES, KINDS, seed):
+        outcome = {}
+
+        def run():
+            outcome.update(processor.process_document(CorpusFile(entry["path"], entry["mime"])))
+
+        timing = measure(run, repeat)
+        results.append(_result("ocr", f"{entry['kind']}:{entry['language']}", entry["chars"], timing,
+                               method=outcome.get("extraction_method"), error=outcome.get("error")))
+    return results
+
+
+def bench_text_stage(stage: str, scales: List[int], repeat: int, seed: int) -> List[Dict]:
+    """Stages that take extracted text: language, classify, redact, summarize"""
+    results = []
+    if stage == "language":
+        from modules.language_stats import ScriptHistogram
+        func = lambda text: ScriptHistogram.from_text(text).analysis(text)
+    elif stage == "classify":
+        from modules.document_classifier import DocumentClassifier
+        classifier = DocumentClassifier()
+        func = lambda text: classifier.classify_document(text, "benchmark.txt")
+    elif stage == "redact":
+        from modules.redaction import redact_sensitive
+        func = redact_sensitive
+    else:
+        from modules.summarizer import DocumentSummarizer
+        # Model loading is reported on its own, not folded into every measurement
+        started = time.perf_counter()
+        summarizer = DocumentSummarizer()
+        setup_ms = (time.perf_counter() - started) * 1000
+        results.append(_result(stage, "setup", 0, {"best_ms": setup_ms, "median_ms": setup_ms, "runs": 1}))
+        func = lambda text: summarizer.get_document_insights(text, "Operational Report", "benchmark.txt")
+
+    for scale in scales:
+        for language in LANGUAGES:
+            text = generate_text(language, scale, seed)
+            results.append(_result(stage, language, scale, measure(lambda: func(text), repeat)))
+    return results
+
+
+def make_document_record(index: int, rng: random.Random, base_date: datetime) -> Dict:
+    """Deterministic stored-document record shaped like DocumentDatabase.add_document output"""
+    doc_type = rng.choice(sorted(DOCUMENT_TYPES))
+    uploaded = base_date + timedelta(minutes=index)
+    return {
+        "id": f"DOC_{uploaded.strftime('%Y%m%d_%H%M%S')}_{index}",
+        "filename": f"{doc_type.lower().replace(' ', '_')}_{index}.pdf",
+        "file_type": "application/pdf",
+        "upload_date": uploaded.isoformat(),
+        "uploaded_by": f"user{index % 50}",
+        "uploader_role": rng.choice(ROLES),
+        "document_type": doc_type,
+        "classification_confidence": round(rng.random(), 3),
+        "summary": generate_text("english", 300, index),
+        "action_items": [],
+        "deadlines": [],
+        "risks": [],
+        "priority": rng.choice(["High", "Medium", "Low"]),
+        "language": rng.choice(LANGUAGES),
+        "text_stats": {"words": rng.randrange(50, 5000)},
+        "key_information": {},
+        "file_path": "",
+        "tags": [],
+        "status": "Active",
+        "version": 1,
+    }
+
+
+def bench_db(scales: List[int], repeat: int, seed: int) -> List[Dict]:
+    from modules.database import DocumentDatabase
+    from modules.analytics import AnalyticsSnapshot, PANDAS_AVAILABLE
+    results = []
+    user_info = {"name": "benchmark", "role": "Engineer"}
+    base_date = datetime(2024, 1, 1)
+    for scale in scales:
+        rng = random.Random(f"db:{scale}:{seed}")
+        records = [make_document_record(i, rng, base_date) for i in range(scale)]
+        with tempfile.TemporaryDirectory(prefix="metro_bench_") as tmp:
+            db = DocumentDatabase(data_dir=tmp)
+            middle_id = records[len(records) // 2]["id"] if records else ""
+
+            def add_documents():
+                for i in range(DB_ADDS_PER_RUN):
+                    db.add_document({"filename": f"bench_{i}.pdf", "file_type": "application/pdf",
+                                     "document_type": "Safety Notice", "summary": "Benchmark document"}, user_info)
+
+            operations = {
+                "save_all": lambda: db.save_data(records),
+                "load_all": db.load_data,
+                "iter_documents": lambda: sum(len(chunk) for chunk in db.iter_documents()),
+                "get_by_id": lambda: db.get_document_by_id(middle_id),
+                "search": lambda: db.search_documents(DB_SEARCH_QUERY),
+                "statistics": db.get_statistics,
+            }
+            if PANDAS_AVAILABLE:
+                # Built once per data generation; the queries run on every analytics render
+                snapshot = AnalyticsSnapshot(records)
+                operations["analytics_build"] = lambda: AnalyticsSnapshot(records)
+                operations["analytics_statistics"] = snapshot.statistics
+                operations["analytics_weekly_uploads"] = lambda: snapshot.uploads_over_time("W")
+            for name, func in operations.items():
+                results.append(_result("db", name, scale, measure(func, repeat)))
+            # Each run adds a few documents on top of the seeded ones
+            timing = measure(add_documents, repeat, setup=lambda: db.save_data(records))
+            results.append(_result("db", "add_document", scale, timing, per_call_ms=timing["median_ms"] / DB_ADDS_PER_RUN))
+    return results
+
+
+def run(stages: List[str], scales: List[int], repeat: int, corpus_dir: Path, seed: int,
+        max_scales: Dict[str, int]) -> List[Dict]:
+    """Run the selected stages; stages whose dependencies are missing are reported as skipped"""
+    results = []
+    for stage in stages:
+        stage_scales = [scale for scale in scales if scale <= max_scales.get(stage, scale)]
+        print(f"Running {stage} at {stage_scales} ...", flush=True)
+        try:
+            if stage == "ocr":
+                results += bench_ocr(stage_scales, repeat, corpus_dir, seed)
+            elif stage == "db":
+                results += bench_db(stage_scales, repeat, seed)
+            else:
+                results += bench_text_stage(stage, stage_scales, repeat, seed)
+        except ImportError as e:
+            results.append(_skipped(stage, f"missing dependency: {e.name or e}"))
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, thresholds: Dict[str, float]) -> List[Dict]:
+    """
+    Results whose median is slower than the baseline by more than the stage threshold
+
+    Returns:
+        One dict per regression with the key, both medians and the allowed ratio
+    """
+    previous = {r["key"]: r for r in baseline.get("results", []) if "median_ms" in r}
+    regressions = []
+    for r in results:
+        base = previous.get(r["key"])
+        if base is None or "median_ms" not in r or base["median_ms"] < MIN_COMPARABLE_MS:
+            continue
+        allowed = thresholds.get(r["stage"], thresholds["default"])
+        if r["median_ms"] > base["median_ms"] * (1 + allowed):
+            regressions.append({"key": r["key"], "baseline_ms": base["median_ms"], "median_ms": r["median_ms"],
+                                "ratio": r["median_ms"] / base["median_ms"], "allowed": 1 + allowed})
+    return regressions
+
+
+def _commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _parse_overrides(values: List[str], cast) -> Dict:
+    overrides = {}
+    for value in values:
+        name, _, setting = value.partition("=")
+        overrides[name] = cast(setting)
+    return overrides
+
+
+def main(argv=None):
+    """CLI entry point for the pipeline benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the MetroVivaram document pipeline")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Characters of text (text stages) or stored documents (db)")
+    parser.add_argument("--max-scale", action="append", default=[], metavar="STAGE=N",
+                        help="Largest scale for a stage (defaults: ocr=10000, summarize=10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--corpus-dir", type=Path, default=DATA_DIR / "benchmark_corpus")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Allowed median slowdown as a fraction (default stages)")
+    parser.add_argument("--stage-threshold", action="append", default=[], metavar="STAGE=FRACTION",
+                        help="Allowed slowdown for one stage, e.g. ocr=0.5")
+    args = parser.parse_args(argv)
+
+    max_scales = dict(STAGE_MAX_SCALE, **_parse_overrides(args.max_scale, int))
+    results = run(args.stages, args.scales, args.repeat, args.corpus_dir, args.seed, max_scales)
+
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['stage']:10s} skipped: {r['skipped']}")
+            continue
+        print(f"{r['key']:40s} best {r['best_ms']:10.2f} ms  median {r['median_ms']:10.2f} ms")
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "scales": args.scales,
+        },
+        "results": results,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+    if args.baseline:
+        thresholds = dict(STAGE_REGRESSION_THRESHOLDS, **_parse_overrides(args.stage_threshold, float))
+        thresholds["default"] = args.threshold
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, thresholds)
+        print(f"Compared with {args.baseline} (commit {baseline.get('meta', {}).get('commit')})")
+        for reg in regressions:
+            print(f"REGRESSION {reg['key']}: {reg['baseline_ms']:.2f} -> {reg['median_ms']:.2f} ms "
+                  f"(x{reg['ratio']:.2f}, allowed x{reg['allowed']:.2f})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Memory benchmark for the in-memory document model
+Builds a deterministic catalogue shaped like data/documents.json (legacy
+permissions, feedback, text stats, English and Malayalam summaries of mixed
+length), decodes it the way a dashboard session does, and measures with
+tracemalloc the memory held by plain dicts versus DocumentRecords, plus the
+time to load, filter and read every summary.
+
+    python -m benchmarks.record_memory --documents 100000
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config import USER_ROLES
+from benchmarks.corpus import generate_text
+from benchmarks.pipeline import make_document_record
+from modules.document_record import to_records
+from modules.serialization import dumps, loads
+from modules.storage_format import DEFAULT_PERMISSIONS
+
+FEEDBACK_EVERY = 5
+SUMMARY_SIZES = (200, 800, 2000)  # Characters; the median stored summary is ~200 bytes
+
+
+def build_catalogue(documents: int, seed: int = 0) -> bytes:
+    """Encoded documents.json with realistic nested fields"""
+    rng = random.Random(f"records:{documents}:{seed}")
+    base_date = datetime(2024, 1, 1)
+    catalogue = []
+    for index in range(documents):
+        doc = make_document_record(index, rng, base_date)
+        language = "malayalam" if doc["language"] == "malayalam" else "english"
+        doc["summary"] = generate_text(language, rng.choice(SUMMARY_SIZES), index)
+        doc["text_stats"] = {"characters": rng.randrange(500, 40000), "lines": rng.randrange(10, 800),
+                             "sentences": rng.randrange(5, 500), "words": rng.randrange(50, 6000)}
+        doc["key_information"] = {"dates": [doc["upload_date"][:10]], "amounts": [], "contacts": []}
+        doc["permissions"] = {action: list(roles) for action, roles in DEFAULT_PERMISSIONS.items()}
+        doc["uploader_role"] = rng.choice(list(USER_ROLES))
+        if index % FEEDBACK_EVERY == 0:
+            doc["feedback"] = [{"id": f"feedback_{index}_1", "type": "like", "text": "",
+                                "timestamp": doc["upload_date"], "user": f"user{index % 50}"}]
+        catalogue.append(doc)
+    return dumps(catalogue)
+
+
+def _measure(build: Callable[[], List]) -> Dict:
+    """Retained memory and build time of build()'s result"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    documents = build()
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # What the dashboard does on every rerun: a role filter, a field filter and a summary pass
+    started = time.perf_counter()
+    accessible = [doc for doc in documents if doc["status"] == "Active"]
+    high_priority = [doc for doc in accessible if doc.get("priority") == "High"]
+    sum(len(doc["summary"]) for doc in documents)
+    scan_seconds = time.perf_counter() - started
+    return {"retained_bytes": current, "peak_bytes": peak, "load_seconds": elapsed, "scan_seconds": scan_seconds,
+            "high_priority": len(high_priority)}
+
+
+def run(documents: int, seed: int = 0) -> Dict:
+    raw = build_catalogue(documents, seed)
+    dicts = _measure(lambda: loads(raw))
+    records = _measure(lambda: to_records(loads(raw)))
+    return {
+        "documents": documents,
+        "file_bytes": len(raw),
+        "dicts": dicts,
+        "records": records,
+        "saved": 1 - records["retained_bytes"] / dicts["retained_bytes"] if dicts["retained_bytes"] else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI entry point for the record memory benchmark"""
+    parser = argparse.ArgumentParser(description="Memory held by loaded documents: dicts vs DocumentRecords")
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the result to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = run(args.documents, args.seed)
+    print(f"{result['documents']} documents, {result['file_bytes'] / 2 ** 20:.1f} MB on disk")
+    for name in ("dicts", "records"):
+        m = result[name]
+        print(f"  {name:8s} retained {m['retained_bytes'] / 2 ** 20:8.1f} MB "
+              f"({m['retained_bytes'] / max(result['documents'], 1):6.0f} B/doc)  "
+              f"peak {m['peak_bytes'] / 2 ** 20:8.1f} MB  "
+              f"load {m['load_seconds']:.2f}s  scan {m['scan_seconds']:.2f}s")
+    print(f"  records hold {result['saved']:.0%} less memory")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Load test for the real-time alert server in eventlet and ASGI modes
+Starts each server as a subprocess, connects many socketio.AsyncClient
+instances, publishes alerts through the alert broker and measures connect
+times and end-to-end emit latency. Requires python-socketio's asyncio
+client (aiohttp) and, for the ASGI mode, uvicorn.
+
+    python -m benchmarks.socketio_load --clients 200 --alerts 50 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import socketio
+
+from config import BASE_DIR
+from modules.alert_broker import UnixSocketPublisher
+
+SERVER_MODULES = {
+    "eventlet": "modules.alert_service",
+    "asgi": "modules.socketio_asgi",
+}
+
+ALERT_TYPE = "load_test"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarise(values: List[float]) -> Dict:
+    return {
+        "count": len(values),
+        "mean_ms": statistics.fmean(values) if values else 0.0,
+        "p50_ms": _percentile(values, 50),
+        "p95_ms": _percentile(values, 95),
+        "p99_ms": _percentile(values, 99),
+        "max_ms": max(values) if values else 0.0,
+    }
+
+
+def start_server(mode: str, port: int, broker_path: str) -> subprocess.Popen:
+    """Start the alert server for a mode and wait until it accepts connections"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", SERVER_MODULES[mode], "--port", str(port), "--broker-url", f"unix://{broker_path}"],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{mode} server exited with code {process.returncode}")
+        if Path(broker_path).exists():
+            try:
+                socket.create_connection(("localhost", port), timeout=0.5).close()
+                return process
+            except OSError:
+                pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"{mode} server did not start within 30 seconds")
+
+
+async def _connect_client(url: str, connect_times: List[float], latencies: List[float]):
+    """Connect one client, subscribe to the load test alert type and record latencies"""
+    client = socketio.AsyncClient(reconnection=False)
+    subscribed = asyncio.Event()
+
+    @client.on("subscription_confirmed")
+    async def on_subscribed(data):
+        subscribed.set()
+
+    @client.on("real_time_alert")
+    async def on_alert(payload):
+        latencies.append((time.time() - payload["data"]["sent_at"]) * 1000)
+
+    started = time.perf_counter()
+    await client.connect(url, transports=["websocket"])
+    await client.emit("subscribe_to_alerts", {"alert_types": [ALERT_TYPE], "user_role": "viewer"})
+    await asyncio.wait_for(subscribed.wait(), timeout=10)
+    connect_times.append((time.perf_counter() - started) * 1000)
+    return client
+
+
+async def run_load(mode: str, clients: int, alerts: int, rate: float, concurrency: int) -> Dict:
+    """Run one load test against a freshly started server"""
+    port = _free_port()
+    broker_path = str(Path(tempfile.mkdtemp(prefix="metro_load_")) / "broker.sock")
+    process = start_server(mode, port, broker_path)
+    url = f"http://localhost:{port}"
+    connect_times: List[float] = []
+    latencies: List[float] = []
+    connected = []
+    try:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def connect_one():
+            async with semaphore:
+                try:
+                    connected.append(await _connect_client(url, connect_times, latencies))
+                except Exception:
+                    pass
+
+        ramp_started = time.perf_counter()
+        await asyncio.gather(*(connect_one() for _ in range(clients)))
+        ramp_seconds = time.perf_counter() - ramp_started
+
+        publisher = UnixSocketPublisher(broker_path)
+        expected = len(connected) * alerts
+        for seq in range(alerts):
+            publisher.publish({
+                "kind": "alert",
+                "alert_type": ALERT_TYPE,
+                "data": {"seq": seq, "sent_at": time.time()},
+                "target_roles": None
+            })
+            await asyncio.sleep(1 / rate)
+        publisher.close()
+
+        deadline = time.monotonic() + 10
+        while len(latencies) < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        return {
+            "mode": mode,
+            "clients_requested": clients,
+            "clients_connected": len(connected),
+            "ramp_seconds": ramp_seconds,
+            "connect": _summarise(connect_times),
+            "alerts_published": alerts,
+            "deliveries_expected": expected,
+            "deliveries_received": len(latencies),
+            "emit_latency": _summarise(latencies),
+        }
+    finally:
+        await asyncio.gather(*(client.disconnect() for client in connected), return_exceptions=True)
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main(argv=None):
+    """CLI entry point for the Socket.IO load test"""
+    parser = argparse.ArgumentParser(description="Load test the MetroVivaram real-time alert server")
+    parser.add_argument("--modes", nargs="+", choices=sorted(SERVER_MODULES), default=["eventlet", "asgi"])
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent Socket.IO clients")
+    parser.add_argument("--alerts", type=int, default=20, help="Alerts published per run")
+    parser.add_argument("--rate", type=float, default=10.0, help="Alerts published per second")
+    parser.add_argument("--concurrency", type=int, default=50, help="Clients connecting at once")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for mode in args.modes:
+        result = asyncio.run(run_load(mode, args.clients, args.alerts, args.rate, args.concurrency))
+        results.append(result)
+        print(f"{mode:9s} clients {result['clients_connected']}/{result['clients_requested']}  "
+              f"connect p95 {result['connect']['p95_ms']:.1f} ms  "
+              f"delivered {result['deliveries_received']}/{result['deliveries_expected']}  "
+              f"latency p50 {result['emit_latency']['p50_ms']:.1f} ms "
+              f"p95 {result['emit_latency']['p95_ms']:.1f} ms "
+              f"p99 {result['emit_latency']['p99_ms']:.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    incomplete = any(r["deliveries_received"] < r["deliveries_expected"] for r in results)
+    return 1 if incomplete else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -51,4 +51,150 @@ SUPPORTED_LANGUAGES = ["en", "ml"]  # English and Malayalam
 MAX_FILE_SIZE = 50
 
 # OCR settings
-OCR_LANGUAGES = "eng+mal"  # Tesseract language codes
\ No newline at end of file
+OCR_LANGUAGES = "eng+mal"  # Tesseract language codes
+# Image preprocessing pipeline (see modules/preprocessing.py); steps run in this order
+OCR_PREPROCESS_STEPS = ["grayscale", "downscale", "denoise", "threshold"]
+OCR_TARGET_DPI = 300  # Images scanned above this resolution are downscaled to it
+OCR_MAX_IMAGE_SIDE = 3500  # Pixel limit for the long side when an image has no DPI metadata
+OCR_DENOISE_NOISE_THRESHOLD = 6.0  # Estimated noise sigma above which denoising runs
+OCR_DENOISE_STRENGTH = 10  # fastNlMeansDenoising filter strength (h)
+OCR_METRICS_SAMPLE_SIDE = 1024  # Contrast is estimated on a copy at most this large
+OCR_NOISE_TILE_SIDE = 256  # Noise is estimated on native-resolution tiles of this size
+OCR_THRESHOLD_BLOCK_SIZE = 11
+OCR_THRESHOLD_C = 2
+# PDF page routing: pages whose text layer is shorter than this are treated as scanned
+OCR_PDF_PAGE_MIN_TEXT_CHARS = 25
+OCR_PDF_RASTER_DPI = 300
+OCR_PDF_MAX_OCR_PAGES = 20  # Upper bound on pages rasterised and OCRed per PDF
+# PDF text-layer extraction backends (see modules/pdf_text.py), tried in this order;
+# "auto" picks the first one installed, or name one to force it
+PDF_TEXT_BACKEND = os.environ.get("METRO_PDF_TEXT_BACKEND", "auto")
+PDF_TEXT_BACKEND_ORDER = ["pdfium", "pdftotext", "pypdf2"]
+PDFTOTEXT_TIMEOUT = 120  # Seconds before a pdftotext subprocess is abandoned
+# OCR word layouts (boxes, confidences, line structure) kept per document, see modules/ocr_layout.py
+OCR_LAYOUT_DIR = DATA_DIR / "layouts"
+# OCR engine pool (see modules/ocr_pool.py): "tesserocr" keeps Tesseract engines warm in-process,
+# "pytesseract" runs the tesseract binary per call; "auto" prefers tesserocr when installed
+OCR_ENGINE = os.environ.get("METRO_OCR_ENGINE", "auto")
+OCR_WORKERS = int(os.environ.get("METRO_OCR_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Export settings
+EXPORT_DIR = DATA_DIR / "exports"
+EXPORT_CHUNK_SIZE = 500  # Documents read from storage per chunk
+EXPORT_FORMATS = ["csv", "jsonl", "parquet"]
+# Streamlit reads a download into memory once; larger exports must be made with the CLIs
+UI_DOWNLOAD_MAX_SIZE = int(os.environ.get("METRO_UI_DOWNLOAD_MAX_MB", "200")) * 1024 * 1024
+
+# Bulk download settings
+ZIP_READ_CHUNK_SIZE = 1024 * 1024  # Bytes copied from disk per read
+# Already-compressed formats are stored rather than deflated
+ZIP_STORED_EXTENSIONS = [".pdf", ".jpg", ".jpeg", ".png", ".docx", ".zip"]
+
+# Real-time alert dispatch queue
+ALERT_BATCH_WINDOW_SECONDS = 0.5  # Alerts arriving within this window are batched
+ALERT_QUEUE_MAX_SIZE = 1000
+ALERT_QUEUE_OVERFLOW_POLICY = "drop_oldest"  # drop_oldest, drop_newest or block
+ALERT_QUEUE_BLOCK_TIMEOUT = 2.0  # Seconds a producer waits under the "block" policy
+ALERT_COALESCE_TYPES = ["document_upload", "feedback_received", "priority_alert"]
+ALERT_COALESCE_MAX_ITEMS = 10  # Individual alerts kept inside a coalesced alert
+
+# Real-time alert service
+SOCKETIO_PORT = int(os.environ.get("METRO_SOCKETIO_PORT", "8502"))
+# "embedded" runs the Socket.IO server inside the Streamlit process (single worker);
+# "external" publishes alerts to a dedicated service (python -m modules.alert_service)
+ALERT_SERVICE_MODE = os.environ.get("METRO_ALERT_SERVICE_MODE", "embedded")
+# unix:///path/to/socket for the local broker, or redis://host:port/db
+ALERT_BROKER_URL = os.environ.get("METRO_ALERT_BROKER_URL", f"unix://{DATA_DIR / 'alert_broker.sock'}")
+ALERT_BROKER_CHANNEL = "metrovivaram_alerts"
+ALERT_SERVICE_STATUS_FILE = DATA_DIR / "alert_service_status.json"
+ALERT_SERVICE_STATUS_INTERVAL = 5  # Seconds between status file updates
+
+# Alert history (replayed to clients that reconnect)
+ALERT_HISTORY_FILE = DATA_DIR / "alert_history.jsonl"
+ALERT_HISTORY_MAX_ENTRIES = 1000  # Alerts retained in the ring buffer
+ALERT_HISTORY_EXCLUDED_TYPES = ["system_metrics"]  # Periodic updates are not worth replaying
+ALERT_HISTORY_UPLOAD_EVENT = "document_added"  # Written by the database on every upload; never sent to clients
+ALERT_REPLAY_MAX_ALERTS = 100  # Most recent missed alerts sent on reconnect
+
+# Role-based color themes
+ROLE_THEMES = {
+    "Engineer": {
+        "primary": "#4CAF50",  # Green - Engineering/Technical
+        "secondary": "#81C784",
+        "accent": "#2E7D32",
+        "surface_variant": "#1B3A1D"
+    },
+    "Finance": {
+        "primary": "#FF9800",  # Orange - Finance/Money
+        "secondary": "#FFB74D", 
+        "accent": "#F57C00",
+        "surface_variant": "#2D1F0A"
+    },
+    "HR": {
+        "primary": "#E91E63",  # Pink - HR/People
+        "secondary": "#F06292",
+        "accent": "#C2185B", 
+        "surface_variant": "#2A0E18"
+    },
+    "Station Controller": {
+        "primary": "#2196F3",  # Blue - Operations/Control
+        "secondary": "#64B5F6",
+        "accent": "#1976D2",
+        "surface_variant": "#0D1B2A"
+    },
+    "Compliance Officer": {
+        "primary": "#9C27B0",  # Purple - Compliance/Authority  
+        "secondary": "#BA68C8",
+        "accent": "#7B1FA2",
+        "surface_variant": "#1F0A26"
+    }
+}
+
+# Theme used before login and for unknown roles
+DEFAULT_THEME = {
+    "primary": "#BB86FC",
+    "secondary": "#03DAC6",
+    "accent": "#6200EE",
+    "surface_variant": "#292B32"
+}
+
+# Static assets (generated from assets/ into static/, see modules/static_assets.py)
+ASSETS_DIR = BASE_DIR / "assets"
+STATIC_DIR = BASE_DIR / "static"
+# "inline" embeds the memoised, minified CSS/JS in the page; "linked" references
+# the hashed files in static/, served by the real-time alert server
+THEME_ASSET_MODE = os.environ.get("METRO_THEME_ASSET_MODE", "inline")
+STATIC_ASSET_BASE_URL = os.environ.get("METRO_STATIC_ASSET_URL", f"http://localhost:{SOCKETIO_PORT}/static")
+SOCKETIO_CLIENT_URL = os.environ.get("METRO_SOCKETIO_CLIENT_URL", f"http://localhost:{SOCKETIO_PORT}")
+
+# Pipeline metrics (see modules/metrics.py)
+METRICS_ENABLED = os.environ.get("METRO_METRICS_ENABLED", "1") != "0"
+METRICS_HOST = os.environ.get("METRO_METRICS_HOST", "127.0.0.1")  # Prometheus endpoint stays local by default
+METRICS_PORT = int(os.environ.get("METRO_METRICS_PORT", "9464"))
+METRICS_SAMPLE_WINDOW = 512  # Recent observations kept per histogram for percentiles
+METRICS_RECENT_SPANS = 200  # Finished spans kept for the admin page
+# Roles that see the admin pages
+ADMIN_ROLES = ["Compliance Officer", "Engineer"]
+
+# System performance publisher (pushed to admins as 'system_metrics' alerts)
+SYSTEM_METRICS_INTERVAL = float(os.environ.get("METRO_SYSTEM_METRICS_INTERVAL", "10"))  # Seconds between snapshots
+SYSTEM_METRICS_VERSIONS_SCAN_INTERVAL = float(os.environ.get("METRO_VERSIONS_SCAN_INTERVAL", "900"))  # Seconds between walks of data/versions
+
+# JSON store durability and concurrency
+DB_FSYNC = os.environ.get("METRO_DB_FSYNC", "1") != "0"  # fsync temp files before the atomic rename
+DB_LOCK_TIMEOUT = 30.0  # Seconds to wait for another process's write lock
+DB_WRITE_RETRIES = 20  # Optimistic update attempts before giving up
+
+# On-disk JSON layout: compact by default; set METRO_DB_JSON_INDENT=2 for hand-readable files
+DB_JSON_INDENT = int(os.environ["METRO_DB_JSON_INDENT"]) if os.environ.get("METRO_DB_JSON_INDENT") else None
+
+# JSON codec for persistence and Socket.IO payloads: auto, orjson, msgspec or json
+JSON_BACKEND = os.environ.get("METRO_JSON_BACKEND", "auto")
+JSON_BACKEND_ORDER = ["orjson", "msgspec", "json"]
+
+# In-memory document records: summaries longer than this many UTF-8 bytes are kept zlib-compressed
+RECORD_COMPRESS_MIN_BYTES = 512
+
+# Analytics charts: time bucket label -> pandas offset alias
+ANALYTICS_TIME_BUCKETS = {"Day": "D", "Week": "W", "Month": "MS"}
+PRIORITY_LEVELS = ["High", "Medium", "Low"]
\ No newline at end of file
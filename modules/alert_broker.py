@@ -0,0 +1,353 @@
+"""
+Inter-process pub/sub channel between Streamlit workers and the alert service
+Every worker publishes alerts and database write events; a single alert
+service process subscribes and fans them out to Socket.IO clients.
+
+Two transports share one newline-delimited JSON message format:
+- unix:///path/to/socket  local broker hosted by the alert service (default)
+- redis://host:port/db    Redis pub/sub, for workers on several hosts
+"""
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from config import (ALERT_BROKER_URL, ALERT_BROKER_CHANNEL, ALERT_SERVICE_STATUS_FILE,
+                    ALERT_SERVICE_STATUS_INTERVAL, SOCKETIO_PORT)
+from modules.serialization import dumps, loads, load_file
+
+# Optional Redis transport
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def encode_message(message: Dict) -> bytes:
+    """Serialise a broker message as one JSON line"""
+    return dumps(message) + b"\n"
+
+
+def decode_message(line: bytes) -> Dict:
+    """Parse one JSON line received from the broker"""
+    return loads(line)
+
+
+class UnixSocketPublisher:
+    """Publish messages to the local alert service over a Unix domain socket"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sock = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(2.0)
+        sock.connect(self.path)
+        self._sock = sock
+
+    def publish(self, message: Dict) -> bool:
+        """Send a message, reconnecting once if the connection was lost"""
+        data = encode_message(message)
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(data)
+                    return True
+                except OSError as e:
+                    self._close_unlocked()
+                    if attempt:
+                        raise ConnectionError(f"Alert broker unavailable at {self.path}: {e}")
+        return False
+
+    def _close_unlocked(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def close(self):
+        with self._lock:
+            self._close_unlocked()
+
+
+class RedisPublisher:
+    """Publish messages on a Redis pub/sub channel"""
+
+    def __init__(self, url: str, channel: str = ALERT_BROKER_CHANNEL):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("The redis package is required for redis:// broker URLs")
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+
+    def publish(self, message: Dict) -> bool:
+        self.client.publish(self.channel, encode_message(message))
+        return True
+
+    def close(self):
+        self.client.close()
+
+
+def create_publisher(url: str = ALERT_BROKER_URL):
+    """Create a publisher for the configured broker URL"""
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        return UnixSocketPublisher(parsed.path)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisPublisher(url)
+    raise ValueError(f"Unsupported alert broker URL: {url}")
+
+
+class UnixSocketSubscriber:
+    """Local broker: accept publisher connections and hand each message to a handler"""
+
+    def __init__(self, path: str, handler: Callable[[Dict], None]):
+        self.path = path
+        self.handler = handler
+        self._server = None
+
+    def serve_forever(self):
+        """Bind the socket and process messages until the process exits"""
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()  # Stale socket from a previous run
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(128)
+        logger.info(f"Alert broker listening on {self.path}")
+        while True:
+            conn, _ = self._server.accept()
+            threading.Thread(target=self._read_connection, args=(conn,), daemon=True).start()
+
+    def _read_connection(self, conn):
+        buffer = b""
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                buffer += data
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    if line.strip():
+                        self._dispatch(line)
+
+    def _dispatch(self, line: bytes):
+        try:
+            self.handler(decode_message(line))
+        except Exception as e:
+            logger.warning(f"Alert broker message failed: {e}")
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class RedisSubscriber:
+    """Consume messages from a Redis pub/sub channel"""
+
+    def __init__(self, url: str, handler: Callable[[Dict], None], channel: str = ALERT_BROKER_CHANNEL):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("The redis package is required for redis:// broker URLs")
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self.handler = handler
+
+    def serve_forever(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        logger.info(f"Alert broker subscribed to redis channel {self.channel}")
+        for item in pubsub.listen():
+            try:
+                self.handler(decode_message(item["data"]))
+            except Exception as e:
+                logger.warning(f"Alert broker message failed: {e}")
+
+    def close(self):
+        self.client.close()
+
+
+def create_subscriber(handler: Callable[[Dict], None], url: str = ALERT_BROKER_URL):
+    """Create the subscriber side for the configured broker URL"""
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        return UnixSocketSubscriber(parsed.path, handler)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisSubscriber(url, handler)
+    raise ValueError(f"Unsupported alert broker URL: {url}")
+
+
+class AsyncUnixSocketSubscriber:
+    """asyncio version of UnixSocketSubscriber for the ASGI alert server"""
+
+    def __init__(self, path: str, handler: Callable[[Dict], None]):
+        self.path = path
+        self.handler = handler
+        self._server = None
+
+    async def start(self):
+        """Bind the socket and start accepting publisher connections"""
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()  # Stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._read_connection, path=self.path)
+        logger.info(f"Alert broker listening on {self.path}")
+
+    async def _read_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                if line.strip():
+                    await self._dispatch(line)
+        finally:
+            writer.close()
+
+    async def _dispatch(self, line: bytes):
+        try:
+            result = self.handler(decode_message(line))
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Alert broker message failed: {e}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class AsyncRedisSubscriber:
+    """asyncio version of RedisSubscriber for the ASGI alert server"""
+
+    def __init__(self, url: str, handler: Callable[[Dict], None], channel: str = ALERT_BROKER_CHANNEL):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("The redis package is required for redis:// broker URLs")
+        import redis.asyncio
+        self.client = redis.asyncio.Redis.from_url(url)
+        self.channel = channel
+        self.handler = handler
+        self._task = None
+
+    async def start(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        logger.info(f"Alert broker subscribed to redis channel {self.channel}")
+        self._task = asyncio.ensure_future(self._listen(pubsub))
+
+    async def _listen(self, pubsub):
+        async for item in pubsub.listen():
+            try:
+                result = self.handler(decode_message(item["data"]))
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Alert broker message failed: {e}")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        await self.client.close()
+
+
+def create_async_subscriber(handler: Callable[[Dict], None], url: str = ALERT_BROKER_URL):
+    """Create an asyncio subscriber for the configured broker URL"""
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        return AsyncUnixSocketSubscriber(parsed.path, handler)
+    if parsed.scheme in ("redis", "rediss"):
+        return AsyncRedisSubscriber(url, handler)
+    raise ValueError(f"Unsupported alert broker URL: {url}")
+
+
+def write_service_status(connected_clients: int, status_file: Path = ALERT_SERVICE_STATUS_FILE):
+    """Record the alert service's client count for workers in other processes"""
+    tmp_file = status_file.with_suffix(".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(dumps({
+            "connected_clients": connected_clients,
+            "pid": os.getpid(),
+            "updated_at": datetime.now().isoformat()
+        }))
+    os.replace(tmp_file, status_file)
+
+
+def read_service_status(status_file: Path = ALERT_SERVICE_STATUS_FILE) -> Optional[Dict]:
+    """Return the alert service status if it was updated recently"""
+    try:
+        if time.time() - status_file.stat().st_mtime > ALERT_SERVICE_STATUS_INTERVAL * 3:
+            return None
+        return load_file(status_file)
+    except (OSError, ValueError):
+        return None
+
+
+class RemoteAlertServer:
+    """
+    Stand-in for MetroSocketIOServer inside Streamlit workers
+
+    Exposes the emit_alert interface used by the dispatcher, but publishes
+    to the broker instead of emitting to local clients.
+    """
+
+    def __init__(self, publisher=None, port: int = SOCKETIO_PORT):
+        self.publisher = publisher or create_publisher()
+        self.port = port
+
+    def emit_alert(self, alert_type: str, data: Dict, target_roles: Optional[List[str]] = None):
+        """Publish an alert for the alert service to fan out"""
+        self.publisher.publish({
+            "kind": "alert",
+            "alert_type": alert_type,
+            "data": data,
+            "target_roles": target_roles
+        })
+
+    def publish_database_event(self, event: str, payload: Dict):
+        """Forward DocumentDatabase write events to the service's status snapshot"""
+        if event != "document_saved":
+            return
+        document = payload["document"]
+        self.publisher.publish({
+            "kind": "db_event",
+            "event": event,
+            "payload": {"document": {
+                "id": document.get("id"),
+                "priority": document.get("priority"),
+                "upload_date": document.get("upload_date")
+            }}
+        })
+
+    def get_connected_clients_count(self) -> int:
+        status = read_service_status()
+        return status["connected_clients"] if status else 0
+
+    def get_connected_clients_info(self) -> Dict:
+        status = read_service_status()
+        return {
+            'total_clients': status["connected_clients"] if status else 0,
+            'service_running': status is not None,
+            'clients': []
+        }
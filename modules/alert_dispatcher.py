@@ -0,0 +1,214 @@
+"""
+Asynchronous alert dispatch queue for MetroVivaram real-time notifications
+Sits between AlertManager and the Socket.IO server so producers (e.g. the
+upload loop) never block on emits. Alerts arriving within a short window
+are batched, and bursts of the same type are coalesced into one alert.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import (ALERT_BATCH_WINDOW_SECONDS, ALERT_QUEUE_MAX_SIZE, ALERT_QUEUE_OVERFLOW_POLICY,
+                    ALERT_QUEUE_BLOCK_TIMEOUT, ALERT_COALESCE_TYPES, ALERT_COALESCE_MAX_ITEMS)
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# Messages used when several alerts of one type are merged
+COALESCED_MESSAGES = {
+    'document_upload': "{count} new documents uploaded",
+    'feedback_received': "{count} new feedback submissions received",
+    'priority_alert': "HIGH PRIORITY: {count} documents require immediate attention",
+}
+
+
+class AlertDispatcher:
+    """Bounded background queue that batches and coalesces alerts before emitting"""
+
+    def __init__(self, sink, batch_window: float = ALERT_BATCH_WINDOW_SECONDS,
+                 max_queue_size: int = ALERT_QUEUE_MAX_SIZE,
+                 overflow_policy: str = ALERT_QUEUE_OVERFLOW_POLICY,
+                 coalesce_types: Optional[List[str]] = None):
+        """
+        Args:
+            sink: Object providing emit_alert(alert_type, data, target_roles)
+            batch_window: Seconds to wait for more alerts after the first of a batch
+            max_queue_size: Maximum number of pending alerts
+            overflow_policy: 'drop_oldest', 'drop_newest' or 'block' when the queue is full
+            coalesce_types: Alert types merged into one alert per batch
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.sink = sink
+        self.batch_window = batch_window
+        self.overflow_policy = overflow_policy
+        self.coalesce_types = set(ALERT_COALESCE_TYPES if coalesce_types is None else coalesce_types)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'submitted': 0,
+            'dropped': 0,
+            'delivered': 0,
+            'coalesced': 0,
+            'emits': 0,
+            'failures': 0,
+            'batches': 0,
+            'max_queue_depth': 0,
+            'last_batch_size': 0,
+            'last_flush_ms': 0.0,
+            'total_latency_ms': 0.0,
+        }
+        self._worker = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._worker.start()
+
+    def _count(self, key: str, amount=1):
+        with self._metrics_lock:
+            self._metrics[key] += amount
+
+    def submit(self, alert_type: str, data: Dict, target_roles: Optional[List[str]] = None) -> bool:
+        """
+        Queue an alert without blocking the caller (except under the 'block' policy)
+
+        Returns:
+            True if the alert was queued, False if it was dropped
+        """
+        item = (time.monotonic(), alert_type, data, tuple(target_roles) if target_roles else None)
+        self._count('submitted')
+
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(item, timeout=ALERT_QUEUE_BLOCK_TIMEOUT)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow_policy != "drop_oldest":
+                self._count('dropped')
+                return False
+            # Make room by discarding the oldest pending alert
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._count('dropped')
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self._count('dropped')
+                return False
+
+        with self._metrics_lock:
+            self._metrics['max_queue_depth'] = max(self._metrics['max_queue_depth'], self._queue.qsize())
+        return True
+
+    def _run(self):
+        """Worker loop: collect a batch for up to batch_window seconds, then emit it"""
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._emit_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _emit_batch(self, batch: List[tuple]):
+        """Group a batch by (type, roles) and emit each group once where allowed"""
+        started = time.monotonic()
+        groups: "OrderedDict[tuple, List[tuple]]" = OrderedDict()
+        for item in batch:
+            groups.setdefault((item[1], item[3]), []).append(item)
+
+        for (alert_type, target_roles), items in groups.items():
+            roles = list(target_roles) if target_roles else None
+            if alert_type in self.coalesce_types and len(items) > 1:
+                emits = [(alert_type, self._coalesce(alert_type, [item[2] for item in items]), roles)]
+                self._count('coalesced', len(items))
+            else:
+                emits = [(alert_type, item[2], roles) for item in items]
+
+            for emit in emits:
+                try:
+                    self.sink.emit_alert(*emit)
+                    self._count('emits')
+                except Exception as e:
+                    self._count('failures')
+                    logger.warning(f"Alert dispatch failed for '{alert_type}': {e}")
+                    break
+            else:
+                now = time.monotonic()
+                with self._metrics_lock:
+                    self._metrics['delivered'] += len(items)
+                    self._metrics['total_latency_ms'] += sum((now - item[0]) * 1000 for item in items)
+
+        with self._metrics_lock:
+            self._metrics['batches'] += 1
+            self._metrics['last_batch_size'] = len(batch)
+            self._metrics['last_flush_ms'] = (time.monotonic() - started) * 1000
+        logger.info(f"Dispatched batch of {len(batch)} alert(s) as {len(groups)} group(s)")
+
+    def _coalesce(self, alert_type: str, items: List[Dict]) -> Dict:
+        """Merge several alerts of one type into a single summary alert"""
+        count = len(items)
+        template = COALESCED_MESSAGES.get(alert_type, "{count} " + alert_type.replace('_', ' ') + " alerts")
+        return {
+            'message': template.format(count=count),
+            'count': count,
+            'coalesced': True,
+            'items': items[:ALERT_COALESCE_MAX_ITEMS],
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued alerts have been emitted; returns False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        """Flush pending alerts and stop the worker thread"""
+        self.flush(timeout)
+        self._stop.set()
+        self._worker.join(timeout)
+
+    def get_metrics(self) -> Dict:
+        """Delivery metrics for monitoring"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['queue_depth'] = self._queue.qsize()
+        metrics['overflow_policy'] = self.overflow_policy
+        metrics['batch_window_seconds'] = self.batch_window
+        total_latency = metrics.pop('total_latency_ms')
+        metrics['avg_latency_ms'] = total_latency / metrics['delivered'] if metrics['delivered'] else 0.0
+        return metrics
+
+
+def create_dispatcher(sink) -> AlertDispatcher:
+    """Create a dispatcher that flushes pending alerts at interpreter exit"""
+    dispatcher = AlertDispatcher(sink)
+    atexit.register(dispatcher.stop)
+    return dispatcher
@@ -0,0 +1,166 @@
+"""
+Persistent alert history for MetroVivaram real-time notifications
+A bounded ring buffer of emitted alerts, mirrored to a JSON Lines file so it
+survives restarts. Every alert gets a monotonically increasing integer id;
+clients report the last id they saw and receive only the alerts they missed.
+Streamlit workers, the alert service and the ASGI server all append to the
+same file, so ids are assigned under an inter-process lock on a sidecar
+.lock file after catching up with lines the other processes wrote.
+"""
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from config import ALERT_HISTORY_FILE, ALERT_HISTORY_MAX_ENTRIES
+from modules.json_store import file_lock
+from modules.serialization import dumps_str, loads
+
+
+class AlertHistory:
+    """On-disk alert ring buffer with monotonic ids"""
+
+    def __init__(self, path: Path = ALERT_HISTORY_FILE, max_entries: int = ALERT_HISTORY_MAX_ENTRIES):
+        """
+        Args:
+            path: JSON Lines file backing the buffer
+            max_entries: Number of alerts retained; older alerts are discarded
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: deque = deque(maxlen=max_entries)
+        self._next_id = 1
+        self._lines_on_disk = 0
+        self._file_id = None  # (device, inode) of the file read so far
+        self._offset = 0  # Bytes of complete lines read so far
+        self._refresh()
+
+    def _refresh(self):
+        """Read the lines other processes (e.g. the alert service) appended since the last call"""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            if file_id == self._file_id and stat.st_size == self._offset:
+                return
+            if file_id != self._file_id or stat.st_size < self._offset:
+                # New or compacted (replaced) file: reread it from the start
+                self._entries.clear()
+                self._lines_on_disk = 0
+                self._offset = 0
+                self._file_id = file_id
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # A line without its newline is still being written
+        self._offset += end
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = loads(line)
+            except ValueError:
+                continue
+            self._entries.append(entry)
+            self._lines_on_disk += 1
+            self._next_id = max(self._next_id, entry["id"] + 1)
+
+    def _compact(self):
+        """Rewrite the file with only the retained alerts"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._entries:
+                f.write(dumps_str(entry) + "\n")
+        os.replace(tmp_path, self.path)
+        self._lines_on_disk = len(self._entries)
+        stat = self.path.stat()
+        self._file_id, self._offset = (stat.st_dev, stat.st_ino), stat.st_size
+
+    def append(self, alert_type: str, data: Dict, target_roles: Optional[List[str]] = None) -> Dict:
+        """
+        Record an alert and assign its id
+
+        Returns:
+            The stored alert record (id, type, data, target_roles, timestamp)
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, file_lock(self.lock_path):
+            # Catch up under the lock, so no other process can take the same id
+            self._refresh()
+            record = {
+                "id": self._next_id,
+                "type": alert_type,
+                "data": data,
+                "target_roles": list(target_roles) if target_roles else None,
+                "timestamp": datetime.now().isoformat()
+            }
+            self._next_id += 1
+
+            # Append-only writes; the file is compacted once it holds twice the buffer
+            if self._lines_on_disk + 1 > self.max_entries * 2:
+                self._entries.append(record)
+                self._compact()
+            else:
+                with open(self.path, "ab") as f:
+                    f.write((dumps_str(record) + "\n").encode("utf-8"))
+                self._refresh()  # Reads back just our own line
+        return record
+
+    def since(self, last_id: int, alert_types: Optional[Iterable[str]] = None,
+              role: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Alerts newer than last_id that a client with the given subscriptions would have received
+
+        Args:
+            last_id: Last alert id the client saw
+            alert_types: Subscribed alert types (None = all)
+            role: Client role, used for role-targeted alerts
+            limit: Return at most this many of the most recent matches
+        """
+        alert_types = set(alert_types) if alert_types is not None else None
+        missed = []
+        with self._lock:
+            self._refresh()
+            # Entries are in id order, so walk back from the newest
+            for entry in reversed(self._entries):
+                if entry["id"] <= last_id:
+                    break
+                if alert_types is not None and entry["type"] not in alert_types:
+                    continue
+                if entry["target_roles"] and role not in entry["target_roles"]:
+                    continue
+                missed.append(entry)
+                if limit and len(missed) >= limit:
+                    break
+        missed.reverse()
+        return missed
+
+    def count_since(self, last_id: int, alert_type: str, role: Optional[str] = None) -> int:
+        """Number of events of one type after last_id, expanding coalesced alerts"""
+        return sum(entry["data"].get("count", 1) if entry["data"].get("coalesced") else 1
+                   for entry in self.since(last_id, [alert_type], role))
+
+    @property
+    def latest_id(self) -> int:
+        """Id of the newest recorded alert (0 if none)"""
+        with self._lock:
+            self._refresh()
+            return self._next_id - 1
+
+
+# Global instance
+alert_history = None
+
+def get_alert_history() -> AlertHistory:
+    """Get or create the global alert history"""
+    global alert_history
+    if alert_history is None:
+        alert_history = AlertHistory()
+    return alert_history
@@ -4,22 +4,34 @@ Provides high-level interface for sending real-time alerts
 """
 from typing import Dict, List, Optional
 from datetime import datetime
-from modules.socketio_server import get_socketio_server
+from config import ALERT_SERVICE_MODE
+from modules.socketio_server import get_socketio_server, MetroSocketIOServer, FEEDBACK_ALERT_ROLES
+from modules.alert_dispatcher import create_dispatcher
 
 class AlertManager:
     """High-level alert management for real-time notifications"""
     
     def __init__(self):
         self.socketio_server = None
+        self.dispatcher = None
         self._initialize_server()
         
     def _initialize_server(self):
-        """Initialize Socket.IO server connection"""
+        """Initialize Socket.IO server connection and the non-blocking dispatch queue"""
         try:
-            self.socketio_server = get_socketio_server()
+            if ALERT_SERVICE_MODE == "external":
+                # Alerts go through the broker to the dedicated alert service process
+                from modules.alert_broker import RemoteAlertServer
+                from modules.database import register_write_listener
+                self.socketio_server = RemoteAlertServer()
+                register_write_listener(self.socketio_server.publish_database_event)
+            else:
+                self.socketio_server = get_socketio_server()
+            self.dispatcher = create_dispatcher(self.socketio_server)
         except Exception as e:
             print(f"Alert Manager: Socket.IO server not available - {e}")
             self.socketio_server = None
+            self.dispatcher = None
             
     def is_available(self) -> bool:
         """Check if real-time alerts are available"""
@@ -37,13 +49,15 @@ class AlertManager:
             return False
             
         try:
-            self.socketio_server.emit_document_upload_alert(document_data, uploader_info)
+            queued = self.dispatcher.submit(
+                'document_upload', MetroSocketIOServer.build_document_upload_alert(document_data, uploader_info)
+            )
             
             # Special alert for high priority documents
             if document_data.get('priority') == 'High':
-                self.socketio_server.emit_priority_alert(document_data)
+                self.dispatcher.submit('priority_alert', MetroSocketIOServer.build_priority_alert(document_data))
                 
-            return True
+            return queued
         except Exception as e:
             print(f"Error sending document upload alert: {e}")
             return False
@@ -61,8 +75,11 @@ class AlertManager:
             return False
             
         try:
-            self.socketio_server.emit_feedback_alert(document_id, feedback_data, document_name)
-            return True
+            return self.dispatcher.submit(
+                'feedback_received',
+                MetroSocketIOServer.build_feedback_alert(document_id, feedback_data, document_name),
+                target_roles=FEEDBACK_ALERT_ROLES
+            )
         except Exception as e:
             print(f"Error sending feedback alert: {e}")
             return False
@@ -78,8 +95,7 @@ class AlertManager:
             return False
             
         try:
-            self.socketio_server.emit_priority_alert(document_data)
-            return True
+            return self.dispatcher.submit('priority_alert', MetroSocketIOServer.build_priority_alert(document_data))
         except Exception as e:
             print(f"Error sending priority alert: {e}")
             return False
@@ -104,8 +120,7 @@ class AlertManager:
                 'data': data or {}
             }
             
-            self.socketio_server.emit_alert(alert_type, alert_data, target_roles)
-            return True
+            return self.dispatcher.submit(alert_type, alert_data, target_roles)
         except Exception as e:
             print(f"Error sending system alert: {e}")
             return False
@@ -132,8 +147,7 @@ class AlertManager:
             }
             
             # Send to management roles only
-            self.socketio_server.emit_alert('user_activity', alert_data, target_roles=['HR', 'Compliance Officer'])
-            return True
+            return self.dispatcher.submit('user_activity', alert_data, target_roles=FEEDBACK_ALERT_ROLES)
         except Exception as e:
             print(f"Error sending user activity alert: {e}")
             return False
@@ -163,25 +177,24 @@ class AlertManager:
                 'message': f"{len(expiring_documents)} document(s) expiring soon"
             }
             
-            self.socketio_server.emit_alert('document_expiry', alert_data)
-            return True
+            return self.dispatcher.submit('document_expiry', alert_data)
         except Exception as e:
             print(f"Error sending document expiry alert: {e}")
             return False
             
-    def send_system_metrics_update(self, metrics: Dict):
+    def send_system_metrics_update(self, metrics: Dict, target_roles: Optional[List[str]] = None):
         """
         Send real-time system metrics update
         
         Args:
             metrics: Current system metrics
+            target_roles: Specific user roles to target (None = all subscribers)
         """
         if not self.is_available():
             return False
             
         try:
-            self.socketio_server.emit_system_metric_update(metrics)
-            return True
+            return self.dispatcher.submit('system_metrics', metrics, target_roles)
         except Exception as e:
             print(f"Error sending metrics update: {e}")
             return False
@@ -196,7 +209,8 @@ class AlertManager:
                 'available': True,
                 'connected_clients': self.socketio_server.get_connected_clients_count(),
                 'server_port': self.socketio_server.port,
-                'details': self.socketio_server.get_connected_clients_info()
+                'details': self.socketio_server.get_connected_clients_info(),
+                'dispatch': self.dispatcher.get_metrics()
             }
         except Exception as e:
             print(f"Error getting connection info: {e}")
@@ -0,0 +1,78 @@
+"""
+Dedicated real-time alert service process for MetroVivaram
+Owns the Socket.IO server and consumes alerts published by every Streamlit
+worker through the alert broker, so alerts fan out correctly however many
+workers are running.
+
+    METRO_ALERT_SERVICE_MODE=external python -m modules.alert_service
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import logging
+import sys
+import threading
+import time
+from typing import Dict
+
+from config import ALERT_BROKER_URL, ALERT_SERVICE_STATUS_INTERVAL, SOCKETIO_PORT
+from modules.alert_broker import create_subscriber, write_service_status
+from modules.socketio_server import MetroSocketIOServer
+
+logger = logging.getLogger(__name__)
+
+
+class AlertService:
+    """Bridge broker messages to a MetroSocketIOServer owned by this process"""
+
+    def __init__(self, port: int = SOCKETIO_PORT, broker_url: str = ALERT_BROKER_URL):
+        self.server = MetroSocketIOServer(port)
+        self.subscriber = create_subscriber(self.handle_message, broker_url)
+        self.broker_url = broker_url
+
+    def handle_message(self, message: Dict):
+        """Route one broker message to the Socket.IO server"""
+        kind = message.get("kind")
+        if kind == "alert":
+            self.server.emit_alert(message["alert_type"], message.get("data", {}), message.get("target_roles"))
+        elif kind == "db_event":
+            self.server.handle_database_event(message["event"], message.get("payload", {}))
+        else:
+            logger.warning(f"Ignoring unknown broker message kind: {kind}")
+
+    def _report_status(self):
+        """Periodically publish the client count for the Streamlit workers"""
+        while True:
+            try:
+                write_service_status(self.server.get_connected_clients_count())
+            except OSError as e:
+                logger.warning(f"Could not write alert service status: {e}")
+            time.sleep(ALERT_SERVICE_STATUS_INTERVAL)
+
+    def run(self, host: str = "localhost"):
+        """Start the broker consumer and serve Socket.IO clients until interrupted"""
+        threading.Thread(target=self.subscriber.serve_forever, daemon=True).start()
+        threading.Thread(target=self._report_status, daemon=True).start()
+        print(f"Alert service consuming {self.broker_url}")
+        try:
+            self.server.serve_forever(host)
+        finally:
+            self.subscriber.close()
+
+
+def main(argv=None):
+    """CLI entry point for the alert service"""
+    parser = argparse.ArgumentParser(description="Run the MetroVivaram real-time alert service")
+    parser.add_argument("--host", default="localhost", help="Interface for Socket.IO clients")
+    parser.add_argument("--port", type=int, default=SOCKETIO_PORT, help="Socket.IO port")
+    parser.add_argument("--broker-url", default=ALERT_BROKER_URL, help="unix:///path or redis://host:port/db")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    AlertService(args.port, args.broker_url).run(args.host)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
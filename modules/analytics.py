@@ -0,0 +1,224 @@
+"""
+Columnar analytics snapshot of the document store
+The catalogue and every feedback entry are materialised once per store
+generation into two pandas DataFrames with categorical columns (document
+type, priority, status, roles, feedback type) and datetime64 timestamps.
+The snapshot is shared by every session, and the analytics page and the
+dashboard's feedback panel read counts, time series and engagement from
+vectorised group-bys instead of looping over documents on each render.
+Without pandas, callers fall back to DocumentDatabase's per-document loops.
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from config import PRIORITY_LEVELS
+from modules.metrics import span
+from modules.storage_format import feedback_text, feedback_user
+
+# Optional columnar analytics (pandas ships with numpy)
+try:
+    import numpy as np
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+CATEGORY_COLUMNS = ("document_type", "status", "uploader_role", "uploaded_by", "language")
+RECENT_UPLOAD_DAYS = 7
+
+
+def _to_datetime(values):
+    """Parse ISO timestamps (with or without microseconds); unparseable ones become NaT"""
+    try:
+        return pd.to_datetime(values, errors="coerce", format="ISO8601")
+    except (TypeError, ValueError):  # pandas < 2.0 has no format="ISO8601"
+        return pd.to_datetime(values, errors="coerce")
+
+
+class AnalyticsSnapshot:
+    """Documents and feedback of one store generation as categorical DataFrames"""
+
+    def __init__(self, documents: List[Dict], generation: int = 0):
+        """
+        Args:
+            documents: Stored document dicts or DocumentRecords
+            generation: Store generation the documents belong to
+        """
+        self.generation = generation
+        self.built_at = datetime.now()
+        with span("analytics.build"):
+            self.documents = self._documents_frame(documents)
+            self.feedback = self._feedback_frame(documents)
+
+    @staticmethod
+    def _documents_frame(documents: List[Dict]) -> "pd.DataFrame":
+        priorities = [doc.get("priority") or "Medium" for doc in documents]
+        frame = pd.DataFrame({
+            "id": [doc.get("id") for doc in documents],
+            "filename": [doc.get("filename", "") for doc in documents],
+            "upload_date": _to_datetime([doc.get("upload_date") for doc in documents]),
+            "priority": pd.Categorical(priorities, categories=PRIORITY_LEVELS + sorted(set(priorities) - set(PRIORITY_LEVELS)),
+                                       ordered=True),
+            "classification_confidence": np.array(
+                [doc.get("classification_confidence") or 0 for doc in documents], dtype=np.float32),
+            "feedback_count": np.array([len(doc.get("feedback") or ()) for doc in documents], dtype=np.int32),
+        })
+        for column in CATEGORY_COLUMNS:
+            default = "Active" if column == "status" else "unknown"
+            frame[column] = pd.Categorical([doc.get(column) or default for doc in documents])
+        return frame
+
+    @staticmethod
+    def _feedback_frame(documents: List[Dict]) -> "pd.DataFrame":
+        rows = [(doc.get("id"), doc.get("document_type") or "unknown", entry)
+                for doc in documents for entry in (doc.get("feedback") or ())]
+        texts = [feedback_text(entry) for _, _, entry in rows]
+        return pd.DataFrame({
+            "id": [entry.get("id") for _, _, entry in rows],
+            "document_id": pd.Categorical([doc_id for doc_id, _, _ in rows]),
+            "document_type": pd.Categorical([doc_type for _, doc_type, _ in rows]),
+            "type": pd.Categorical([entry.get("type", "unknown") for _, _, entry in rows]),
+            "timestamp": _to_datetime([entry.get("timestamp") for _, _, entry in rows]),
+            "user": pd.Categorical([feedback_user(entry) for _, _, entry in rows]),
+            "text": pd.Series(texts, dtype=object),
+            "has_text": np.array([bool(text.strip()) for text in texts], dtype=bool),
+        })
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def statistics(self) -> Dict:
+        """Same shape as DocumentDatabase.get_statistics()"""
+        documents = self.documents
+        week_ago = pd.Timestamp(datetime.now() - timedelta(days=RECENT_UPLOAD_DAYS))
+        type_counts = documents["document_type"].value_counts(sort=True)
+        priority_counts = documents["priority"].value_counts(sort=False)
+        return {
+            "total_documents": len(documents),
+            "documents_by_type": {str(k): int(v) for k, v in type_counts.items() if v},
+            "documents_by_priority": {str(k): int(v) for k, v in priority_counts.items() if v},
+            "recent_uploads": int((documents["upload_date"] > week_ago).sum()),
+        }
+
+    def uploads_over_time(self, freq: str = "W", by: Optional[str] = "document_type") -> "pd.DataFrame":
+        """
+        Uploads per time bucket
+
+        Args:
+            freq: pandas offset alias of the bucket ('D', 'W', 'MS', ...)
+            by: Categorical column to split the counts by (None for a single 'uploads' column)
+
+        Returns:
+            DataFrame indexed by bucket start, one column per category
+        """
+        documents = self.documents.dropna(subset=["upload_date"])
+        grouper = pd.Grouper(key="upload_date", freq=freq)
+        if by is None:
+            return documents.groupby(grouper).size().to_frame("uploads")
+        return documents.groupby([grouper, by], observed=True).size().unstack(fill_value=0)
+
+    def feedback_summary(self) -> Dict:
+        """Same shape as DocumentDatabase.get_feedback_analytics()"""
+        feedback = self.feedback
+        documents_with_feedback = int((self.documents["feedback_count"] > 0).sum())
+        return {
+            "total_feedback": len(feedback),
+            "likes": int((feedback["type"] == "like").sum()),
+            "dislikes": int((feedback["type"] == "dislike").sum()),
+            "text_feedback_count": int(feedback["has_text"].sum()),
+            "documents_with_feedback": documents_with_feedback,
+            "engagement_rate": documents_with_feedback / len(self.documents) * 100 if len(self.documents) else 0,
+        }
+
+    def feedback_over_time(self, freq: str = "W") -> "pd.DataFrame":
+        """Feedback entries per time bucket, one column per feedback type"""
+        feedback = self.feedback.dropna(subset=["timestamp"])
+        return (feedback.groupby([pd.Grouper(key="timestamp", freq=freq), "type"], observed=True)
+                .size().unstack(fill_value=0))
+
+    def engagement_by_type(self) -> "pd.DataFrame":
+        """
+        Feedback engagement per document type
+
+        Returns:
+            DataFrame indexed by document type with documents, with_feedback,
+            engagement_rate (%), likes, dislikes and comments
+        """
+        documents = self.documents
+        engagement = documents.assign(with_feedback=documents["feedback_count"] > 0).groupby(
+            "document_type", observed=True).agg(documents=("id", "size"), with_feedback=("with_feedback", "sum"))
+        engagement["engagement_rate"] = engagement["with_feedback"] / engagement["documents"] * 100
+        feedback = self.feedback
+        reactions = pd.DataFrame({
+            "likes": feedback["type"] == "like",
+            "dislikes": feedback["type"] == "dislike",
+            "comments": feedback["has_text"],
+            "document_type": feedback["document_type"],
+        }).groupby("document_type", observed=True).sum()
+        engagement = engagement.join(reactions, how="left").fillna(0)
+        engagement[["likes", "dislikes", "comments"]] = engagement[["likes", "dislikes", "comments"]].astype(int)
+        return engagement.sort_values("documents", ascending=False)
+
+    def recent_text_feedback(self, limit: int = 5) -> List[Dict]:
+        """Same shape as DocumentDatabase.get_recent_feedback_with_text()"""
+        recent = self.feedback[self.feedback["has_text"]].sort_values("timestamp", ascending=False).head(limit)
+        return [{
+            "id": row.id,
+            "type": row.type,
+            "text": row.text,
+            "timestamp": row.timestamp.isoformat() if not pd.isna(row.timestamp) else "",
+            "user": row.user,
+            "document_id": row.document_id,
+            "feedback_type": row.type,
+        } for row in recent.itertuples(index=False)]
+
+
+class AnalyticsCache:
+    """The latest snapshot per database, rebuilt when the store generation changes"""
+
+    def __init__(self):
+        self._snapshots: Dict[str, AnalyticsSnapshot] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, db) -> Optional[AnalyticsSnapshot]:
+        """
+        Snapshot of db's current generation (None without pandas)
+
+        Args:
+            db: DocumentDatabase
+        """
+        if not PANDAS_AVAILABLE:
+            return None
+        key = str(db.db_file)
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.generation == db.documents_store.generation():
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or snapshot.generation != db.documents_store.generation():
+                # Built from the shared records, so a write costs one parse of documents.json, not two
+                documents, generation = db.load_records_with_generation()
+                snapshot = self._snapshots[key] = AnalyticsSnapshot(documents, generation)
+                self.builds += 1
+            return snapshot
+
+
+# Global instance
+analytics_cache = None
+
+def get_analytics_cache() -> AnalyticsCache:
+    """Get or create the global analytics cache"""
+    global analytics_cache
+    if analytics_cache is None:
+        analytics_cache = AnalyticsCache()
+    return analytics_cache
+
+
+def get_analytics_snapshot(db=None) -> Optional[AnalyticsSnapshot]:
+    """Shared snapshot of the database (default: the shared DocumentDatabase); None without pandas"""
+    if db is None:
+        from modules.resources import get_database
+        db = get_database()
+    return get_analytics_cache().get(db)
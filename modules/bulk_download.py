@@ -0,0 +1,156 @@
+"""
+Streaming ZIP archives of filtered documents for audits and compliance reviews
+Files are copied from uploads/ in fixed-size chunks into an archive file on
+disk, so multi-GB exports never hold the whole archive in memory.
+
+    python -m modules.bulk_download --type "Safety Notice" --from 2025-01-01 --output audit.zip
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from config import BASE_DIR, UPLOAD_DIR, EXPORT_DIR, ZIP_READ_CHUNK_SIZE, ZIP_STORED_EXTENSIONS
+
+
+def resolve_document_path(doc: Dict) -> Optional[Path]:
+    """Locate a document's file on disk, or return None if it is missing"""
+    candidates = []
+    if doc.get("file_path"):
+        file_path = Path(doc["file_path"])
+        candidates.append(file_path)
+        if not file_path.is_absolute():
+            candidates.append(BASE_DIR / file_path)
+    if doc.get("filename"):
+        candidates.append(UPLOAD_DIR / doc["filename"])
+
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+class DocumentZipBuilder:
+    """Build a ZIP archive of documents plus their metadata, streamed from disk"""
+
+    def __init__(self, chunk_size: int = ZIP_READ_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def _compression_for(self, filename: str) -> int:
+        """Skip deflating formats that are already compressed"""
+        if Path(filename).suffix.lower() in ZIP_STORED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def write_archive(self, documents: Iterable[Dict], output) -> Dict:
+        """
+        Write documents and their metadata JSON into a ZIP archive
+
+        Args:
+            documents: Iterable of document records (may be a lazy generator)
+            output: Path or seekable binary file object
+
+        Returns:
+            Dictionary with counts of archived and missing files and bytes copied
+        """
+        manifest = []
+        stats = {"documents": 0, "files": 0, "missing_files": 0, "bytes": 0}
+
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for doc in documents:
+                doc_id = doc.get("id", f"document_{stats['documents']}")
+                filename = Path(doc.get("filename") or "unnamed").name
+                folder = f"documents/{doc_id}"
+                stats["documents"] += 1
+
+                archive.writestr(
+                    f"{folder}/metadata.json",
+                    json.dumps(dict(doc), indent=2, ensure_ascii=False, default=str)
+                )
+
+                source = resolve_document_path(doc)
+                entry = {"id": doc_id, "filename": filename, "archived_as": None}
+                if source is None:
+                    stats["missing_files"] += 1
+                    entry["missing"] = True
+                else:
+                    arcname = f"{folder}/{filename}"
+                    info = zipfile.ZipInfo(arcname, date_time=time.localtime(source.stat().st_mtime)[:6])
+                    info.compress_type = self._compression_for(filename)
+                    with open(source, "rb") as src, archive.open(info, "w", force_zip64=True) as dest:
+                        shutil.copyfileobj(src, dest, self.chunk_size)
+                    size = source.stat().st_size
+                    stats["files"] += 1
+                    stats["bytes"] += size
+                    entry.update({"archived_as": arcname, "size": size})
+                manifest.append(entry)
+
+            archive.writestr("manifest.json", json.dumps({
+                "generated_at": datetime.now().isoformat(),
+                "summary": stats,
+                "documents": manifest
+            }, indent=2, ensure_ascii=False))
+
+        return stats
+
+    def build(self, documents: Iterable[Dict], directory: Path = EXPORT_DIR):
+        """
+        Build the archive into a new file under directory
+
+        Returns:
+            Tuple of (archive path, stats dictionary with the archive size in 'archive_bytes')
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=str(directory), prefix="documents_", suffix=".zip")
+        path = Path(name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                stats = self.write_archive(documents, f)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        stats["archive_bytes"] = path.stat().st_size
+        return path, stats
+
+
+def main(argv=None):
+    """CLI entry point for bulk audit downloads"""
+    from modules.resources import get_database
+    from modules.exporter import build_document_filter
+
+    parser = argparse.ArgumentParser(description="Download matching MetroVivaram documents as a ZIP archive")
+    parser.add_argument("--output", help="Output ZIP (defaults to data/exports/documents_<timestamp>.zip)")
+    parser.add_argument("--search", default="", help="Full-text search in summary, filename and type")
+    parser.add_argument("--type", dest="doc_type", default="", help="Filter by document type")
+    parser.add_argument("--priority", default="", help="Filter by priority")
+    parser.add_argument("--uploader", default="", help="Filter by uploader name")
+    parser.add_argument("--tag", default="", help="Filter by tag")
+    parser.add_argument("--from", dest="date_from", default="", help="Uploaded on or after (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", default="", help="Uploaded on or before (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output) if args.output else EXPORT_DIR / f"documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    predicate = build_document_filter(
+        search_query=args.search, uploader=args.uploader, doc_type=args.doc_type,
+        priority=args.priority, tag=args.tag, date_from=args.date_from, date_to=args.date_to
+    )
+
+    db = get_database()
+    documents = (doc for chunk in db.iter_documents(predicate=predicate) for doc in chunk)
+    stats = DocumentZipBuilder().write_archive(documents, output)
+    print(f"Archived {stats['files']} files for {stats['documents']} documents "
+          f"({stats['missing_files']} missing, {stats['bytes'] / (1024 * 1024):.1f} MB) to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
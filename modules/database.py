@@ -1,18 +1,125 @@
 """
 Simple file-based database for storing document metadata and summaries
+Every file is written atomically under an inter-process lock (see
+modules/json_store.py); read-modify-write operations retry when another
+session wrote in between, so concurrent uploads never lose each other.
 """
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-import pandas as pd
 import streamlit as st
-from config import DATA_DIR
+from config import DATA_DIR, ALERT_HISTORY_FILE, ALERT_HISTORY_UPLOAD_EVENT
+from modules.alert_history import AlertHistory, get_alert_history
+from modules.metrics import get_metrics, span
+from modules.json_store import JsonStore, ConcurrentModificationError, atomic_write_json
+from modules.storage_format import compact_feedback, feedback_text
+from modules.serialization import load_file, DocumentSchema, FeedbackEntry, AuditEntry
+from modules.document_record import to_records
+
+
+def iter_json_array(fp, read_size=65536):
+    """
+    Incrementally yield the items of a top-level JSON array from a text file
+
+    Only one item (plus a read buffer) is held in memory at a time, so very
+    large document catalogues can be streamed without json.load().
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and item separators
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos >= len(buffer):
+            if eof:
+                if started:
+                    raise ValueError("Unexpected end of JSON array")
+                return
+            more = fp.read(read_size)
+            buffer = buffer[pos:] + more
+            pos = 0
+            eof = not more
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            if end >= len(buffer) and not eof:
+                # The item might continue past the buffer (e.g. a number)
+                raise json.JSONDecodeError("Incomplete item", buffer, end)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = fp.read(read_size)
+            buffer = buffer[pos:] + more
+            pos = 0
+            eof = not more
+            continue
+
+        yield item
+        pos = end
+        if pos > read_size:
+            buffer = buffer[pos:]
+            pos = 0
+
+
+# Callables notified after successful writes, e.g. the Socket.IO status snapshot
+_write_listeners = []
+
+
+def register_write_listener(callback):
+    """Register a callable(event, payload) invoked after each database write"""
+    if callback not in _write_listeners:
+        _write_listeners.append(callback)
+
+
+def unregister_write_listener(callback):
+    """Remove a previously registered write listener"""
+    if callback in _write_listeners:
+        _write_listeners.remove(callback)
+
+
+def notify_write(event, payload):
+    """Dispatch a write event to all listeners without letting them break the write"""
+    for listener in list(_write_listeners):
+        try:
+            listener(event, payload)
+        except Exception as e:
+            print(f"Database write listener error: {e}")
+
 
 class DocumentDatabase:
-    def __init__(self):
-        self.db_file = DATA_DIR / "documents.json"
-        self.audit_file = DATA_DIR / "audit_log.json"
+    def __init__(self, data_dir=DATA_DIR):
+        """
+        Args:
+            data_dir: Directory holding documents.json, audit_log.json and versions/
+        """
+        self.data_dir = Path(data_dir)
+        self.db_file = self.data_dir / "documents.json"
+        self.audit_file = self.data_dir / "audit_log.json"
+        self.version_dir = self.data_dir / "versions"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.documents_store = JsonStore(self.db_file, name="documents")
+        self.audit_store = JsonStore(self.audit_file, name="audit_log")
+        self._records_cache = None  # (generation, records) shared by all sessions
+        self._records_lock = threading.Lock()
+        self._alert_history = None
         self.ensure_db_exists()
     
     def ensure_db_exists(self):
@@ -26,56 +133,121 @@ class DocumentDatabase:
     def load_data(self):
         """Load documents from JSON file"""
         try:
-            with open(self.db_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.documents_store.load()
         except Exception as e:
             st.error(f"Error loading database: {str(e)}")
             return []
-    
-    def save_data(self, data):
-        """Save documents to JSON file"""
+
+    def load_records(self):
+        """
+        Load documents as memory-compact DocumentRecords (for display)
+
+        Records are built once per store generation and shared by every
+        session (they are read-only); the returned list is a copy.
+        """
+        return self.load_records_with_generation()[0]
+
+    def load_records_with_generation(self):
+        """
+        Load the shared DocumentRecords together with the store generation they were built from
+
+        Returns:
+            (records, generation); the records list is a copy
+        """
+        cached = self._records_cache
+        if cached is not None and cached[0] == self.documents_store.generation():
+            return list(cached[1]), cached[0]
+        with self._records_lock:
+            cached = self._records_cache
+            if cached is None or cached[0] != self.documents_store.generation():
+                try:
+                    documents, generation = self.load_data_with_generation()
+                except Exception as e:
+                    st.error(f"Error loading database: {str(e)}")
+                    return [], None
+                cached = self._records_cache = (generation, to_records(documents))
+            return list(cached[1]), cached[0]
+
+    def load_data_with_generation(self):
+        """Load documents together with the store generation, for save_data(expected_generation=...)"""
+        return self.documents_store.load_with_generation()
+
+    def update_documents(self, mutate):
+        """
+        Apply mutate(documents) and save, retrying if another session wrote meanwhile
+
+        Args:
+            mutate: Changes the document list in place; may be called more than once
+
+        Returns:
+            mutate's return value from the committed attempt
+        """
+        return self.documents_store.update(mutate)
+
+    def iter_documents(self, chunk_size=500, predicate=None):
+        """
+        Stream documents from the JSON file in chunks
+
+        Args:
+            chunk_size: Maximum number of documents per yielded list
+            predicate: Optional callable; only documents for which it returns True are yielded
+
+        Yields:
+            Lists of at most chunk_size document dicts
+        """
+        chunk = []
+        with open(self.db_file, 'r', encoding='utf-8') as f:
+            for doc in iter_json_array(f):
+                if predicate is not None and not predicate(doc):
+                    continue
+                chunk.append(doc)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def save_data(self, data, expected_generation=None):
+        """
+        Save documents to JSON file
+
+        Args:
+            data: Full document list
+            expected_generation: Only save if nobody wrote since this generation
+                (raises ConcurrentModificationError otherwise)
+
+        Returns:
+            The new generation, or None if saving failed
+        """
         try:
-            with open(self.db_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            return self.documents_store.save(data, expected_generation)
+        except ConcurrentModificationError:
+            raise
         except Exception as e:
             st.error(f"Error saving to database: {str(e)}")
+            return None
     
     def load_audit_log(self):
         """Load audit log from JSON file"""
         try:
-            with open(self.audit_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.audit_store.load()
         except Exception as e:
             return []
     
     def save_audit_log(self, data):
         """Save audit log to JSON file"""
         try:
-            with open(self.audit_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.audit_store.save(data)
         except Exception as e:
             st.error(f"Error saving audit log: {str(e)}")
     
     def add_document(self, document_data, user_info, parent_doc_id=None):
-        """Add a new document or new version to the database, with permissions"""
-        documents = self.load_data()
+        """Add a new document or new version to the database (default permissions are implied, see storage_format)"""
         now = datetime.now()
-        if parent_doc_id:
-            doc_id = parent_doc_id
-            version_number = self.get_next_version_number(doc_id)
-        else:
-            doc_id = f"DOC_{now.strftime('%Y%m%d_%H%M%S')}_{len(documents)}"
-            version_number = 1
-        # Universal permissions: all users can access all features
-        all_roles = ["Engineer", "Finance", "HR", "Station Controller", "Compliance Officer"]
-        default_permissions = {
-            "view": all_roles,
-            "edit": all_roles,
-            "approve": all_roles,
-            "delete": all_roles
-        }
+        # Claimed up front: the version file name is reserved atomically across processes
+        version_number = self.reserve_version_number(parent_doc_id) if parent_doc_id else 1
         document_record = {
-            "id": doc_id,
+            "id": parent_doc_id,
             "filename": document_data["filename"],
             "file_type": document_data["file_type"],
             "upload_date": now.isoformat(),
@@ -94,29 +266,87 @@ class DocumentDatabase:
             "file_path": document_data.get("file_path", ""),
             "tags": document_data.get("tags", []),
             "status": "Active",
-            "version": version_number,
-            "permissions": default_permissions
+            "version": version_number
         }
+
+        def apply(documents):
+            if not parent_doc_id:
+                # The id depends on the catalogue size, so it is recomputed on every attempt
+                document_record["id"] = f"DOC_{now.strftime('%Y%m%d_%H%M%S')}_{len(documents)}"
+            DocumentSchema.from_dict(document_record)  # Raises SchemaError on schema drift
+            doc_id = document_record["id"]
+            index = next((i for i, doc in enumerate(documents) if doc["id"] == doc_id), None)
+            previous = documents.pop(index) if index is not None else None
+            documents.append(document_record)
+            return previous
+
+        try:
+            previous = self.update_documents(apply)
+        except BaseException:
+            # Schema error, lock timeout or too many conflicts: give the version number back
+            if parent_doc_id:
+                self.release_version_number(parent_doc_id, version_number)
+            raise
+        doc_id = document_record["id"]
         self.save_version(doc_id, version_number, document_record)
-        documents = [doc for doc in documents if doc["id"] != doc_id]
-        documents.append(document_record)
-        self.save_data(documents)
+        notify_write("document_saved", {"document": document_record, "previous": previous})
+        self.record_upload_event(document_record)
         action = "UPLOAD" if version_number == 1 else "NEW_VERSION"
         self.log_activity(action, doc_id, user_info, f"{action} document: {document_data['filename']} (v{version_number})")
         return document_record  # Return the full document record instead of just the ID
 
+    def get_alert_history(self):
+        """Alert history next to this database (the shared one for the default data directory)"""
+        if self._alert_history is None:
+            path = self.data_dir / ALERT_HISTORY_FILE.name
+            if path.resolve() == ALERT_HISTORY_FILE.resolve():
+                self._alert_history = get_alert_history()
+            else:
+                self._alert_history = AlertHistory(path)
+        return self._alert_history
+
+    def record_upload_event(self, document_record):
+        """Note an upload in the alert history, so new-upload notices work without the alert server"""
+        try:
+            self.get_alert_history().append(ALERT_HISTORY_UPLOAD_EVENT, {
+                "document_id": document_record["id"],
+                "filename": document_record.get("filename"),
+                "version": document_record.get("version", 1)
+            })
+        except OSError as e:
+            print(f"Could not record upload in alert history: {e}")
+
     def save_version(self, doc_id, version_number, document_record):
         """Save a version of a document to a separate file"""
-        version_dir = Path("data/versions")
-        version_dir.mkdir(parents=True, exist_ok=True)
-        version_file = version_dir / f"{doc_id}_v{version_number}.json"
-        with open(version_file, "w", encoding="utf-8") as f:
-            json.dump(document_record, f, indent=2, ensure_ascii=False)
+        self.version_dir.mkdir(parents=True, exist_ok=True)
+        version_file = self.version_dir / f"{doc_id}_v{version_number}.json"
+        with span("db.write", file="version"):
+            size = atomic_write_json(version_file, document_record)
+        get_metrics().inc("metro_db_write_bytes_total", size, file="version")
+
+    def reserve_version_number(self, doc_id):
+        """Claim the next free version number by creating its (empty) version file exclusively"""
+        self.version_dir.mkdir(parents=True, exist_ok=True)
+        version_number = self.get_next_version_number(doc_id)
+        while True:
+            try:
+                with open(self.version_dir / f"{doc_id}_v{version_number}.json", "x", encoding="utf-8"):
+                    return version_number
+            except FileExistsError:
+                version_number += 1
+
+    def release_version_number(self, doc_id, version_number):
+        """Remove a reserved version file that was never written (no-op once it has content)"""
+        version_file = self.version_dir / f"{doc_id}_v{version_number}.json"
+        try:
+            if version_file.stat().st_size == 0:
+                version_file.unlink()
+        except FileNotFoundError:
+            pass
 
     def get_next_version_number(self, doc_id):
         """Get the next version number for a document"""
-        version_dir = Path("data/versions")
-        existing = [f for f in version_dir.glob(f"{doc_id}_v*.json")]
+        existing = [f for f in self.version_dir.glob(f"{doc_id}_v*.json")]
         if not existing:
             return 1
         nums = [int(f.stem.split("_v")[-1]) for f in existing]
@@ -124,33 +354,45 @@ class DocumentDatabase:
 
     def get_version_history(self, doc_id):
         """Return all versions for a document (sorted by version)"""
-        version_dir = Path("data/versions")
-        files = sorted(version_dir.glob(f"{doc_id}_v*.json"), key=lambda f: int(f.stem.split("_v")[-1]))
+        files = sorted(self.version_dir.glob(f"{doc_id}_v*.json"), key=lambda f: int(f.stem.split("_v")[-1]))
         versions = []
         for f in files:
-            with open(f, "r", encoding="utf-8") as vf:
-                versions.append(json.load(vf))
+            if f.stat().st_size == 0:
+                continue  # Reserved by an upload that is still being saved
+            versions.append(load_file(f))
         return versions
 
     def restore_version(self, doc_id, version_number, user_info):
         """Restore a specific version as the current version"""
-        version_dir = Path("data/versions")
-        version_file = version_dir / f"{doc_id}_v{version_number}.json"
+        version_file = self.version_dir / f"{doc_id}_v{version_number}.json"
         if not version_file.exists():
             raise FileNotFoundError(f"Version {version_number} not found for {doc_id}")
-        with open(version_file, "r", encoding="utf-8") as f:
-            version_data = json.load(f)
+        if version_file.stat().st_size == 0:
+            # Reserved by an upload that is still being saved (or failed before cleanup)
+            raise FileNotFoundError(f"Version {version_number} of {doc_id} has not been saved")
+        version_data = load_file(version_file)
         # Update main db
-        documents = self.load_data()
-        documents = [doc for doc in documents if doc["id"] != doc_id]
-        documents.append(version_data)
-        self.save_data(documents)
+        def apply(documents):
+            index = next((i for i, doc in enumerate(documents) if doc["id"] == doc_id), None)
+            previous = documents.pop(index) if index is not None else None
+            documents.append(version_data)
+            return previous
+
+        previous = self.update_documents(apply)
+        notify_write("document_saved", {"document": version_data, "previous": previous})
         self.log_activity("RESTORE_VERSION", doc_id, user_info, f"Restored version {version_number}")
         return True
     
-    def get_documents_by_role(self, user_role):
-        """Get all documents - role restrictions removed for universal access"""
-        documents = self.load_data()
+    def get_documents_by_role(self, user_role, documents=None):
+        """
+        Get all documents - role restrictions removed for universal access
+
+        Args:
+            user_role: Role of the requesting user
+            documents: Already loaded documents to filter instead of reloading
+        """
+        if documents is None:
+            documents = self.load_data()
         # Return all active documents regardless of role
         filtered_docs = [
             doc for doc in documents
@@ -217,20 +459,17 @@ class DocumentDatabase:
     
     def log_activity(self, action, doc_id, user_info, details=""):
         """Log user activity for audit purposes"""
-        audit_log = self.load_audit_log()
-        
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "action": action,
-            "document_id": doc_id,
-            "user_name": user_info["name"],
-            "user_role": user_info["role"],
-            "details": details,
-            "ip_address": "localhost"  # In real app, get actual IP
-        }
+        log_entry = AuditEntry(
+            timestamp=datetime.now().isoformat(),
+            action=action,
+            document_id=doc_id,
+            user_name=user_info["name"],
+            user_role=user_info["role"],
+            details=details,
+            ip_address="localhost"  # In real app, get actual IP
+        ).to_dict()
         
-        audit_log.append(log_entry)
-        self.save_audit_log(audit_log)
+        self.audit_store.update(lambda audit_log: audit_log.append(log_entry))
     
     def get_audit_log(self, limit=100):
         """Get recent audit log entries"""
@@ -298,38 +537,35 @@ class DocumentDatabase:
             
             if text_feedback and not feedback_content:
                 feedback_content = text_feedback
-            documents = self.load_data()
             
-            # Find the document
-            document_found = False
-            for doc in documents:
-                if doc.get("id") == document_id:
-                    document_found = True
+            def apply(documents):
+                # Find the document
+                for doc in documents:
+                    if doc.get("id") != document_id:
+                        continue
                     
                     # Initialize feedback array if it doesn't exist
                     if "feedback" not in doc:
                         doc["feedback"] = []
                     
                     # Create feedback entry
-                    feedback_entry = {
-                        "id": f"feedback_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(doc['feedback']) + 1}",
-                        "type": feedback_type,
-                        "content": feedback_content,
-                        "text": feedback_content,  # For compatibility with analytics
-                        "text_feedback": feedback_content,  # For compatibility with dashboard display
-                        "timestamp": datetime.now().isoformat(),
-                        "user": user_info.get("name", "Anonymous") if user_info else "Anonymous",
-                        "user_name": user_info.get("name", "Anonymous") if user_info else "Anonymous"  # For compatibility
-                    }
+                    feedback_entry = FeedbackEntry(
+                        id=f"feedback_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(doc['feedback']) + 1}",
+                        type=feedback_type,
+                        text=feedback_content or "",
+                        timestamp=datetime.now().isoformat(),
+                        user=user_info.get("name", "Anonymous") if user_info else "Anonymous"
+                    ).to_dict()
                     
                     doc["feedback"].append(feedback_entry)
-                    break
+                    return feedback_entry
+                raise KeyError(document_id)  # Aborts the update without writing
             
-            if not document_found:
+            try:
+                feedback_entry = self.update_documents(apply)
+            except KeyError:
                 return {"success": False, "error": f"Document with ID {document_id} not found"}
-            
-            # Save updated documents
-            self.save_data(documents)
+            notify_write("feedback_added", {"document_id": document_id, "feedback": feedback_entry})
             
             # Log the feedback action
             self.log_activity(
@@ -352,14 +588,14 @@ class DocumentDatabase:
             document_id: Unique identifier of the document
             
         Returns:
-            List of feedback entries or empty list if none found
+            List of feedback entries (id, type, text, timestamp, user) or empty list if none found
         """
         try:
             documents = self.load_data()
             
             for doc in documents:
                 if doc.get("id") == document_id:
-                    return doc.get("feedback", [])
+                    return [compact_feedback(entry) for entry in doc.get("feedback", [])]
             
             return []
             
@@ -394,7 +630,7 @@ class DocumentDatabase:
                             dislikes += 1
                         
                         # Count text feedback
-                        if feedback.get("text") and feedback.get("text").strip():
+                        if feedback_text(feedback).strip():
                             text_feedback_count += 1
             
             return {
@@ -433,8 +669,8 @@ class DocumentDatabase:
             for doc in documents:
                 if doc.get("feedback"):
                     for feedback in doc["feedback"]:
-                        if feedback.get("text") and feedback.get("text").strip():
-                            feedback_entry = feedback.copy()
+                        if feedback_text(feedback).strip():
+                            feedback_entry = compact_feedback(feedback)
                             feedback_entry["document_id"] = doc["id"]
                             feedback_entry["feedback_type"] = feedback.get("type", "text")
                             all_feedback.append(feedback_entry)
@@ -3,13 +3,17 @@ Document Classification module using keyword-based rules
 """
 import re
 from config import DOCUMENT_TYPES
-from fuzzywuzzy import fuzz
+from modules.lazy import lazy_import
+from modules.metrics import timed
 import streamlit as st
 
+fuzz = lazy_import('fuzzywuzzy.fuzz')
+
 class DocumentClassifier:
     def __init__(self):
         self.document_types = DOCUMENT_TYPES
         
+    @timed("classify")
     def classify_document(self, text, filename=""):
         """Classify document based on content and filename"""
         text_lower = text.lower()
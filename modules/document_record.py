@@ -0,0 +1,150 @@
+"""
+Memory-compact in-memory document records
+A loaded document is a DocumentRecord instead of a plain dict: a slotted
+object with one slot per DocumentSchema field, the enum-like strings
+(document type, priority, status, roles, uploader, language) interned so
+100k records share a handful of str objects, and the heavy fields kept
+encoded until they are read - long summaries zlib-compressed, feedback and
+the nested dicts as compact JSON bytes. Records behave like read-only dicts
+(record['summary'], record.get('tags', []), dict(record)), so the pages keep
+working unchanged; writes still go through DocumentDatabase on plain dicts.
+
+    python -m benchmarks.record_memory --documents 100000
+"""
+import dataclasses
+import sys
+import zlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List
+
+from config import RECORD_COMPRESS_MIN_BYTES
+from modules.serialization import DocumentSchema, dumps, loads
+
+FIELDS = tuple(field.name for field in dataclasses.fields(DocumentSchema) if field.name != "extra")
+INTERNED_FIELDS = frozenset({"document_type", "priority", "status", "uploader_role", "uploaded_by",
+                             "file_type", "language"})
+ENCODED_FIELDS = frozenset({"feedback", "text_stats", "key_information", "permissions"})
+
+_MISSING = object()  # Slot value of a field the stored document does not have
+_EMPTY_LIST = object()  # Slot value of an empty list (read back as a fresh [])
+_FIELD_SET = frozenset(FIELDS)
+_SHARED_BYTES = {}  # Encoded values that repeat across documents (default permissions, {} and [])
+
+
+def _encode(key: str, value: Any) -> Any:
+    """Slot representation of a field value"""
+    if value is None:
+        return None
+    if key in INTERNED_FIELDS and type(value) is str:
+        return sys.intern(value)
+    if key == "summary" and type(value) is str:
+        raw = value.encode("utf-8")
+        return zlib.compress(raw, 1) if len(raw) >= RECORD_COMPRESS_MIN_BYTES else value
+    if key in ENCODED_FIELDS:
+        # Copy: the encoder's buffer is over-allocated
+        encoded = memoryview(dumps(value)).tobytes()
+        if key == "permissions" or len(encoded) <= 2:
+            return _SHARED_BYTES.setdefault(encoded, encoded)  # Few distinct values
+        return encoded
+    if type(value) is list and not value:
+        return _EMPTY_LIST
+    return value
+
+
+def _decode(key: str, value: Any) -> Any:
+    """Field value of a slot representation (heavy fields are decoded on every read)"""
+    if type(value) is bytes:
+        if key == "summary":
+            return zlib.decompress(value).decode("utf-8")
+        if key in ENCODED_FIELDS:
+            return loads(value)
+    if value is _EMPTY_LIST:
+        return []
+    return value
+
+
+class DocumentRecord(Mapping):
+    """
+    One stored document with a read-only dict interface
+
+    Records are shared by every session through the per-generation cache,
+    so item assignment raises TypeError; use copy() for a mutable dict.
+    """
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, data: Dict = None):
+        """
+        Args:
+            data: Stored document dict (keys outside DocumentSchema are kept as extras)
+        """
+        data = data or {}
+        for key in FIELDS:
+            value = data.get(key, _MISSING)
+            setattr(self, key, _MISSING if value is _MISSING else _encode(key, value))
+        extra = {key: value for key, value in data.items() if key not in _FIELD_SET}
+        self._extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DocumentRecord":
+        return cls(data)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return _decode(key, value)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if getattr(self, key) is not _MISSING:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for key in FIELDS if getattr(self, key) is not _MISSING) + len(self._extra or ())
+
+    def __repr__(self) -> str:
+        return f"DocumentRecord(id={self.get('id')!r}, filename={self.get('filename')!r})"
+
+    def __reduce__(self):
+        # The slot sentinels are module-level objects, so pickle via the plain dict
+        return DocumentRecord, (self.to_dict(),)
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the stored layout"""
+        return {key: self[key] for key in self}
+
+    def copy(self) -> Dict:
+        """Mutable plain-dict copy (like dict.copy())"""
+        return self.to_dict()
+
+    def schema(self, strict: bool = False) -> DocumentSchema:
+        """The record as a validated DocumentSchema"""
+        return DocumentSchema.from_dict(self.to_dict(), strict=strict)
+
+
+def to_records(documents: Iterable[Dict]) -> List[DocumentRecord]:
+    """
+    Convert loaded document dicts to records
+
+    A list is consumed from the end as it is converted, so the dicts are
+    freed one by one instead of both representations peaking together.
+    """
+    if isinstance(documents, list):
+        records = []
+        while documents:
+            records.append(DocumentRecord(documents.pop()))
+        records.reverse()
+        return records
+    return [DocumentRecord(document) for document in documents]
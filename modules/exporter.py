@@ -0,0 +1,220 @@
+"""
+Streaming export of the document catalogue to CSV, JSON Lines and Parquet
+Documents are read from the storage layer in chunks so memory stays constant
+regardless of archive size. Run as a CLI for nightly exports:
+
+    python -m modules.exporter --format parquet --output data/exports/catalogue.parquet
+"""
+import argparse
+import csv
+import io
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import EXPORT_CHUNK_SIZE, EXPORT_DIR, EXPORT_FORMATS
+from modules.serialization import dumps
+
+# Optional Parquet support (pyarrow ships with the pandas data stack)
+try:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Flat, stable column layout shared by every export format
+EXPORT_COLUMNS = [
+    "id", "filename", "file_type", "document_type", "priority", "status", "version",
+    "upload_date", "uploaded_by", "uploader_role", "language", "classification_confidence",
+    "tags", "action_items", "deadlines", "risks", "expiry_date", "review_date",
+    "feedback_count", "summary", "file_path"
+]
+
+LIST_COLUMNS = {"tags", "action_items", "deadlines", "risks"}
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+def build_document_filter(search_query: str = "", uploader: str = "", doc_type: str = "",
+                          priority: str = "", tag: str = "", date_from=None, date_to=None) -> Optional[Callable[[Dict], bool]]:
+    """
+    Build a single-pass predicate matching the dashboard's search & filter fields
+
+    Returns:
+        Callable taking a document dict, or None when no filter is active
+    """
+    search_query = (search_query or "").lower()
+    uploader = (uploader or "").lower()
+    doc_type = (doc_type or "").lower()
+    tag = (tag or "").lower()
+    date_from = str(date_from) if date_from else ""
+    date_to = str(date_to) if date_to else ""
+
+    if not any([search_query, uploader, doc_type, priority, tag, date_from, date_to]):
+        return None
+
+    def predicate(doc):
+        if search_query and search_query not in (doc.get('summary', '') + doc.get('filename', '') + doc.get('document_type', '')).lower():
+            return False
+        if uploader and uploader not in doc.get('uploaded_by', '').lower():
+            return False
+        if doc_type and doc_type not in doc.get('document_type', '').lower():
+            return False
+        if priority and doc.get('priority', '') != priority:
+            return False
+        if tag and tag not in ' '.join(doc.get('tags', [])).lower():
+            return False
+        upload_day = doc.get('upload_date', '')[:10]
+        if date_from and upload_day < date_from:
+            return False
+        if date_to and upload_day > date_to:
+            return False
+        return True
+
+    return predicate
+
+
+def flatten_document(doc: Dict) -> Dict:
+    """Flatten a document record into one export row"""
+    row = {}
+    for column in EXPORT_COLUMNS:
+        if column == "feedback_count":
+            row[column] = len(doc.get("feedback", []) or [])
+        elif column in LIST_COLUMNS:
+            row[column] = "; ".join(str(item) for item in (doc.get(column) or []))
+        elif column == "version":
+            row[column] = int(doc.get("version", 1) or 1)
+        elif column == "classification_confidence":
+            row[column] = float(doc.get(column, 0) or 0)
+        else:
+            value = doc.get(column)
+            row[column] = "" if value is None else str(value)
+    return row
+
+
+class DocumentExporter:
+    """Chunked exporter writing directly from the document storage layer"""
+
+    def __init__(self, db=None, chunk_size: int = EXPORT_CHUNK_SIZE):
+        if db is None:
+            from modules.resources import get_database
+            db = get_database()
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def iter_rows(self, predicate: Optional[Callable[[Dict], bool]] = None) -> Iterable[List[Dict]]:
+        """Yield chunks of flattened export rows"""
+        for chunk in self.db.iter_documents(chunk_size=self.chunk_size, predicate=predicate):
+            yield [flatten_document(doc) for doc in chunk]
+
+    def export(self, fmt: str, output, predicate: Optional[Callable[[Dict], bool]] = None) -> Dict:
+        """
+        Export documents in the given format
+
+        Args:
+            fmt: One of 'csv', 'jsonl' or 'parquet'
+            output: Path or binary file object to write to
+            predicate: Optional document filter
+
+        Returns:
+            Dictionary with the number of rows and chunks written
+        """
+        fmt = fmt.lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        if isinstance(output, (str, Path)):
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            with open(output, "wb") as f:
+                return self.export(fmt, f, predicate)
+
+        if fmt == "csv":
+            return self._export_csv(output, predicate)
+        if fmt == "jsonl":
+            return self._export_jsonl(output, predicate)
+        return self._export_parquet(output, predicate)
+
+    def _export_csv(self, output, predicate) -> Dict:
+        """Write CSV rows chunk by chunk"""
+        text_output = io.TextIOWrapper(output, encoding="utf-8", newline="", write_through=True)
+        try:
+            writer = csv.DictWriter(text_output, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            rows = chunks = 0
+            for chunk in self.iter_rows(predicate):
+                writer.writerows(chunk)
+                rows += len(chunk)
+                chunks += 1
+        finally:
+            # Hand the underlying binary stream back to the caller
+            text_output.detach()
+        return {"format": "csv", "rows": rows, "chunks": chunks}
+
+    def _export_jsonl(self, output, predicate) -> Dict:
+        """Write one JSON object per line"""
+        rows = chunks = 0
+        for chunk in self.iter_rows(predicate):
+            output.write(b"".join(dumps(row) + b"\n" for row in chunk))
+            rows += len(chunk)
+            chunks += 1
+        return {"format": "jsonl", "rows": rows, "chunks": chunks}
+
+    def _export_parquet(self, output, predicate) -> Dict:
+        """Write one Parquet row group per chunk"""
+        if not PARQUET_AVAILABLE:
+            raise RuntimeError("Parquet export requires pandas and pyarrow")
+
+        schema = pa.schema([
+            (column, pa.int64() if column in ("version", "feedback_count")
+             else pa.float64() if column == "classification_confidence"
+             else pa.string())
+            for column in EXPORT_COLUMNS
+        ])
+        rows = chunks = 0
+        writer = pq.ParquetWriter(output, schema, compression="snappy")
+        try:
+            for chunk in self.iter_rows(predicate):
+                frame = pd.DataFrame(chunk, columns=EXPORT_COLUMNS)
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+                rows += len(chunk)
+                chunks += 1
+        finally:
+            writer.close()
+        return {"format": "parquet", "rows": rows, "chunks": chunks}
+
+
+def main(argv=None):
+    """CLI entry point for scheduled catalogue exports"""
+    parser = argparse.ArgumentParser(description="Export the MetroVivaram document catalogue")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv", help="Output format")
+    parser.add_argument("--output", help="Output file (defaults to data/exports/documents_<timestamp>.<format>)")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Documents read per chunk")
+    parser.add_argument("--type", dest="doc_type", default="", help="Filter by document type")
+    parser.add_argument("--priority", default="", help="Filter by priority")
+    parser.add_argument("--uploader", default="", help="Filter by uploader name")
+    parser.add_argument("--tag", default="", help="Filter by tag")
+    parser.add_argument("--from", dest="date_from", default="", help="Uploaded on or after (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", default="", help="Uploaded on or before (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    output = args.output or EXPORT_DIR / f"documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{args.format}"
+    predicate = build_document_filter(
+        uploader=args.uploader, doc_type=args.doc_type, priority=args.priority,
+        tag=args.tag, date_from=args.date_from, date_to=args.date_to
+    )
+
+    exporter = DocumentExporter(chunk_size=args.chunk_size)
+    result = exporter.export(args.format, output, predicate)
+    print(f"Exported {result['rows']} documents ({result['chunks']} chunks) to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
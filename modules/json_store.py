@@ -0,0 +1,238 @@
+"""
+Crash-safe JSON files shared between processes
+Writes go to a temp file in the same directory, are fsynced and then
+atomically renamed over the target, so readers and crashes only ever see a
+complete file. Writers take an advisory lock on a sidecar .lock file, and
+every write bumps a generation number kept in a sidecar .meta file, which
+lets read-modify-write updates detect that another session got there first
+and retry instead of losing its change.
+
+    store = JsonStore(Path("data/documents.json"), name="documents")
+    store.update(lambda documents: documents.append(record))
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from config import DB_FSYNC, DB_LOCK_TIMEOUT, DB_WRITE_RETRIES, DB_JSON_INDENT
+from modules.metrics import get_metrics, span
+from modules.serialization import dumps, load_file
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+    import msvcrt  # Windows
+
+LOCK_POLL_INTERVAL = 0.01
+NEW_FILE_MODE = 0o644
+REPLACE_ATTEMPTS = 5  # Windows refuses to replace a file another process has open
+
+
+class ConcurrentModificationError(RuntimeError):
+    """The file was written by someone else since it was read"""
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename in the directory entry (not supported on Windows)"""
+    if not FCNTL_AVAILABLE:
+        return
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path: Path, data: Any, fsync: bool = DB_FSYNC, indent: Optional[int] = DB_JSON_INDENT,
+                      backend: Optional[str] = None) -> int:
+    """
+    Replace path with the JSON encoding of data, all or nothing
+
+    Args:
+        path: Target file
+        data: JSON-serialisable value
+        fsync: Flush the temp file (and the directory) to disk before returning
+        indent: None for compact JSON, otherwise spaces per level
+        backend: JSON backend override (see modules/serialization.py)
+
+    Returns:
+        Bytes written
+    """
+    path = Path(path)
+    payload = dumps(data, indent=indent, backend=backend)
+    size = len(payload)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp creates the file private (0600); keep the target's permissions instead
+        try:
+            os.chmod(tmp_name, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_name, NEW_FILE_MODE)
+        for attempt in range(REPLACE_ATTEMPTS):
+            try:
+                os.replace(tmp_name, path)
+                break
+            except PermissionError:
+                if attempt == REPLACE_ATTEMPTS - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(path.parent)
+    return size
+
+
+@contextmanager
+def file_lock(lock_path: Path, shared: bool = False, timeout: float = DB_LOCK_TIMEOUT):
+    """
+    Advisory inter-process lock on lock_path
+
+    Args:
+        lock_path: Lock file (created if missing)
+        shared: Take a shared (reader) lock; Windows always locks exclusively
+        timeout: Seconds to wait before raising TimeoutError
+    """
+    deadline = time.monotonic() + timeout
+    with open(lock_path, "a+b") as f:
+        while True:
+            try:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(f.fileno(), (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock on {lock_path}")
+                time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JsonStore:
+    """One JSON file with atomic writes, a write lock and a generation counter"""
+
+    def __init__(self, path: Path, name: str = None, default: Callable[[], Any] = list):
+        """
+        Args:
+            path: JSON file
+            name: Label used in metrics (default: the file stem)
+            default: Factory for the initial value when the file does not exist
+        """
+        self.path = Path(path)
+        self.name = name or self.path.stem
+        self.default = default
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.meta_path = self.path.with_name(self.path.name + ".meta")
+        self._local = threading.local()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    @contextmanager
+    def locked(self, shared: bool = False):
+        """Hold the store's lock (re-entrant within a thread)"""
+        depth = getattr(self._local, "depth", 0)
+        if depth:
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+        with file_lock(self.lock_path, shared=shared):
+            self._local.depth = 1
+            try:
+                yield
+            finally:
+                self._local.depth = 0
+
+    def generation(self) -> int:
+        """Number of writes so far (0 for a store never written through JsonStore)"""
+        try:
+            return int(load_file(self.meta_path).get("generation", 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    def load(self) -> Any:
+        """Current contents (no lock needed: writes replace the file atomically)"""
+        if not self.path.exists():
+            return self.default()
+        return load_file(self.path)
+
+    def load_with_generation(self) -> Tuple[Any, int]:
+        """Contents together with the generation they belong to"""
+        with self.locked(shared=True):
+            return self.load(), self.generation()
+
+    def save(self, data: Any, expected_generation: int = None) -> int:
+        """
+        Write data atomically
+
+        Args:
+            data: New contents
+            expected_generation: If given, only write when the store is still at
+                this generation (raises ConcurrentModificationError otherwise)
+
+        Returns:
+            The new generation
+        """
+        with span("db.write", file=self.name), self.locked():
+            generation = self.generation()
+            if expected_generation is not None and generation != expected_generation:
+                get_metrics().inc("metro_db_write_conflicts_total", file=self.name)
+                raise ConcurrentModificationError(
+                    f"{self.path.name} changed (generation {generation}, expected {expected_generation})"
+                )
+            size = atomic_write_json(self.path, data)
+            generation += 1
+            atomic_write_json(self.meta_path, {"generation": generation, "bytes": size}, indent=None)
+        get_metrics().inc("metro_db_write_bytes_total", size, file=self.name)
+        return generation
+
+    def update(self, mutate: Callable[[Any], Any], retries: int = DB_WRITE_RETRIES) -> Any:
+        """
+        Optimistic read-modify-write
+
+        mutate receives the freshly loaded contents and changes them in place;
+        if another writer committed in the meantime it is called again on the
+        newer contents, so it must not have side effects outside the data.
+        An exception raised by mutate aborts the update without writing.
+
+        Returns:
+            Whatever mutate returned on the attempt that was committed
+        """
+        for attempt in range(retries):
+            data, generation = self.load_with_generation()
+            result = mutate(data)
+            try:
+                self.save(data, expected_generation=generation)
+                return result
+            except ConcurrentModificationError:
+                # Randomised backoff so colliding writers spread out
+                time.sleep(random.uniform(0, 0.005 * (attempt + 1)))
+        raise ConcurrentModificationError(f"Gave up updating {self.path.name} after {retries} attempts")
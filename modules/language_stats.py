@@ -0,0 +1,145 @@
+"""
+Single-pass script histograms for language detection
+Counts Malayalam (U+0D00-U+0D7F) and ASCII Latin letters with C-level scans
+over the UTF-8 encoding instead of collecting every regex match into lists.
+Histograms add up, so per-page counts can be merged into a document-level
+analysis without scanning the combined text again.
+"""
+from typing import Dict, Optional
+
+from modules.lazy import lazy_import
+
+langdetect = lazy_import('langdetect')
+
+# A document is hybrid when both scripts make up more than this share (%)
+HYBRID_MIN_PERCENTAGE = 10
+
+ASCII_LETTERS = bytes(range(ord('A'), ord('Z') + 1)) + bytes(range(ord('a'), ord('z') + 1))
+
+# Every Malayalam-block character encodes as E0 B4 xx (U+0D00-U+0D3F) or E0 B5 xx
+# (U+0D40-U+0D7F); E0 is always a lead byte, so these pairs never match mid-character
+MALAYALAM_UTF8_PREFIXES = (b'\xe0\xb4', b'\xe0\xb5')
+
+
+def count_scripts(text: str):
+    """(Malayalam characters, ASCII letters) in a text"""
+    encoded = text.encode('utf-8', 'surrogatepass')
+    malayalam = sum(encoded.count(prefix) for prefix in MALAYALAM_UTF8_PREFIXES)
+    # ASCII bytes only ever encode ASCII characters in UTF-8
+    english = len(encoded) - len(encoded.translate(None, ASCII_LETTERS))
+    return malayalam, english
+
+
+class ScriptHistogram:
+    """Mergeable character counts behind detect_content_language"""
+
+    __slots__ = ('malayalam', 'english', 'total', 'has_content')
+
+    def __init__(self, malayalam: int = 0, english: int = 0, total: int = 0, has_content: bool = False):
+        """
+        Args:
+            malayalam: Characters in the Malayalam block
+            english: ASCII letters
+            total: Characters other than the space character
+            has_content: Whether any non-whitespace character was seen
+        """
+        self.malayalam = malayalam
+        self.english = english
+        self.total = total
+        self.has_content = has_content
+
+    @classmethod
+    def from_text(cls, text: str) -> 'ScriptHistogram':
+        return cls().update(text)
+
+    def update(self, text: str) -> 'ScriptHistogram':
+        """Add the counts of more text (in place)"""
+        if not text:
+            return self
+        malayalam, english = count_scripts(text)
+        self.malayalam += malayalam
+        self.english += english
+        self.total += len(text) - text.count(' ')
+        self.has_content = self.has_content or bool(text.strip())
+        return self
+
+    def __add__(self, other: 'ScriptHistogram') -> 'ScriptHistogram':
+        return ScriptHistogram(self.malayalam + other.malayalam, self.english + other.english,
+                               self.total + other.total, self.has_content or other.has_content)
+
+    def __iadd__(self, other: 'ScriptHistogram') -> 'ScriptHistogram':
+        self.malayalam += other.malayalam
+        self.english += other.english
+        self.total += other.total
+        self.has_content = self.has_content or other.has_content
+        return self
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ScriptHistogram) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"ScriptHistogram(malayalam={self.malayalam}, english={self.english}, "
+                f"total={self.total}, has_content={self.has_content})")
+
+    @property
+    def malayalam_percentage(self) -> float:
+        return (self.malayalam / self.total * 100) if self.total > 0 else 0
+
+    @property
+    def english_percentage(self) -> float:
+        return (self.english / self.total * 100) if self.total > 0 else 0
+
+    def analysis(self, text: Optional[str] = None) -> Dict[str, any]:
+        """
+        Language analysis in the format of AdvancedOCRProcessor.detect_content_language
+
+        Args:
+            text: The counted text; only needed for the langdetect fallback when it
+                contains neither script (treated as unknown if omitted)
+        """
+        if not self.has_content:
+            return {
+                'primary_language': 'unknown',
+                'languages_detected': [],
+                'is_hybrid': False,
+                'confidence': 0.0
+            }
+
+        malayalam_percentage = self.malayalam_percentage
+        english_percentage = self.english_percentage
+        is_hybrid = (self.malayalam > 0 and self.english > 0
+                     and min(malayalam_percentage, english_percentage) > HYBRID_MIN_PERCENTAGE)
+
+        if is_hybrid:
+            primary_language = 'hybrid'
+            languages_detected = ['english', 'malayalam']
+            confidence = min(malayalam_percentage, english_percentage) / 100
+        elif malayalam_percentage > english_percentage:
+            primary_language = 'malayalam'
+            languages_detected = ['malayalam']
+            confidence = malayalam_percentage / 100
+        elif english_percentage > 0:
+            primary_language = 'english'
+            languages_detected = ['english']
+            confidence = english_percentage / 100
+        else:
+            # Neither script: fall back to langdetect
+            primary_language, languages_detected, confidence = 'unknown', [], 0.0
+            if text is not None:
+                try:
+                    detected_lang = langdetect.detect(text)
+                    primary_language = 'english' if detected_lang == 'en' else 'unknown'
+                    languages_detected = [primary_language] if primary_language != 'unknown' else []
+                    confidence = 0.7
+                except langdetect.LangDetectException:
+                    pass
+
+        return {
+            'primary_language': primary_language,
+            'languages_detected': languages_detected,
+            'is_hybrid': is_hybrid,
+            'confidence': confidence,
+            'malayalam_percentage': malayalam_percentage,
+            'english_percentage': english_percentage
+        }
@@ -0,0 +1,84 @@
+"""
+Deferred imports and cached capability probes
+Heavy optional libraries (transformers, pytesseract, OpenCV, ...) are only
+imported when first used, so Streamlit cold starts and pages that never OCR
+or summarise do not pay for them.
+"""
+import importlib
+import importlib.util
+import shutil
+import threading
+from functools import lru_cache
+from typing import Callable, Optional
+
+
+class LazyModule:
+    """Module proxy that performs the real import on first attribute access"""
+
+    def __init__(self, name: str, on_load: Optional[Callable] = None):
+        """
+        Args:
+            name: Dotted module name, e.g. 'fuzzywuzzy.fuzz'
+            on_load: Optional callback receiving the module once it is imported
+        """
+        self.__dict__['_name'] = name
+        self.__dict__['_on_load'] = on_load
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    if self.__dict__['_on_load'] is not None:
+                        self.__dict__['_on_load'](module)
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+def lazy_import(name: str, on_load: Optional[Callable] = None) -> LazyModule:
+    """Return a proxy for a module that is imported when first used"""
+    return LazyModule(name, on_load)
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """Check whether a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def module_importable(*names: str) -> bool:
+    """Import the given modules once and cache whether that succeeded"""
+    try:
+        for name in names:
+            importlib.import_module(name)
+        return True
+    except ImportError:
+        return False
+
+
+@lru_cache(maxsize=None)
+def find_executable(name: str, *fallback_paths: str) -> Optional[str]:
+    """Locate an executable on PATH or at one of the fallback paths (cached)"""
+    for candidate in (name,) + fallback_paths:
+        path = shutil.which(candidate)
+        if path:
+            return path
+    return None
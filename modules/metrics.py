@@ -0,0 +1,305 @@
+"""
+Lightweight tracing and metrics for the document pipeline
+Context-manager spans time each stage on the monotonic clock and feed
+per-span histograms; counters and gauges cover everything else. Metrics are
+process-local, served in Prometheus text format on a local port and shown
+on the admin metrics page.
+
+    with span("ocr.page", method="ocr"):
+        ...
+"""
+import bisect
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from config import (METRICS_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_SAMPLE_WINDOW,
+                    METRICS_RECENT_SPANS)
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+SPAN_METRIC = "metro_span_duration_seconds"
+SPAN_ERRORS_METRIC = "metro_span_errors_total"
+
+METRIC_HELP = {
+    SPAN_METRIC: "Duration of instrumented pipeline stages",
+    SPAN_ERRORS_METRIC: "Instrumented stages that raised an exception",
+    "metro_pdf_pages_total": "PDF pages extracted, by routing method",
+    "metro_db_write_bytes_total": "Bytes written to the JSON database files",
+    "metro_db_write_conflicts_total": "Database writes rejected because another session wrote first",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative buckets for Prometheus plus a window of recent samples for percentiles"""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "recent")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window: int = METRICS_SAMPLE_WINDOW):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def percentile(self, q: float) -> float:
+        """q-th percentile (0-100) of the recent samples (0.0 when empty)"""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+class MetricsRegistry:
+    """Process-wide counters, gauges, histograms and a log of recent spans"""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._recent_spans = deque(maxlen=METRICS_RECENT_SPANS)
+        self._local = threading.local()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increase a counter"""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to its current value"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value in a histogram"""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """
+        Time a block of work
+
+        Args:
+            name: Stage name, e.g. 'ocr.process_document'
+            labels: Extra labels (keep their values low-cardinality)
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        started_at = time.time()
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            self.observe(SPAN_METRIC, elapsed, span=name, **labels)
+            if status == "error":
+                self.inc(SPAN_ERRORS_METRIC, span=name, **labels)
+            with self._lock:
+                self._recent_spans.append({"span": name, "labels": dict(labels), "parent": parent,
+                                           "started_at": started_at, "ms": elapsed * 1000, "status": status})
+
+    def timed(self, name: str, **labels):
+        """Decorator wrapping every call of a function in a span"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def span_summary(self) -> List[Dict]:
+        """Per-span count, total and latency percentiles in milliseconds"""
+        with self._lock:
+            items = [(labels, histogram) for (name, labels), histogram in self._histograms.items()
+                     if name == SPAN_METRIC]
+            rows = []
+            for labels, histogram in items:
+                label_map = dict(labels)
+                rows.append({
+                    "span": label_map.pop("span", ""),
+                    "labels": label_map,
+                    "count": histogram.count,
+                    "total_ms": histogram.sum * 1000,
+                    "mean_ms": histogram.sum / histogram.count * 1000 if histogram.count else 0.0,
+                    "p50_ms": histogram.percentile(50) * 1000,
+                    "p95_ms": histogram.percentile(95) * 1000,
+                    "p99_ms": histogram.percentile(99) * 1000,
+                    "errors": self._counters.get((SPAN_ERRORS_METRIC, labels), 0),
+                })
+        return sorted(rows, key=lambda row: (row["span"], sorted(row["labels"].items())))
+
+    def histogram_percentiles(self, name: str, **labels) -> Dict[str, float]:
+        """p50/p95/p99 and count of one histogram (zeros when it has no samples)"""
+        with self._lock:
+            histogram = self._histograms.get((name, _labels(labels)))
+            if histogram is None:
+                return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+            return {"count": histogram.count, "p50": histogram.percentile(50),
+                    "p95": histogram.percentile(95), "p99": histogram.percentile(99)}
+
+    def counters(self) -> List[Dict]:
+        with self._lock:
+            return [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())]
+
+    def recent_spans(self, limit: int = 50) -> List[Dict]:
+        """Most recent finished spans, newest first"""
+        with self._lock:
+            return list(self._recent_spans)[-limit:][::-1]
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            families: Dict[str, List] = {}
+            for (name, labels), value in self._counters.items():
+                families.setdefault((name, "counter"), []).append((labels, value))
+            for (name, labels), value in self._gauges.items():
+                families.setdefault((name, "gauge"), []).append((labels, value))
+            for (name, labels), histogram in self._histograms.items():
+                families.setdefault((name, "histogram"), []).append((labels, histogram))
+
+            for (name, kind), series in sorted(families.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series, key=lambda item: item[0]):
+                    if kind != "histogram":
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + (float("inf"),), value.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {value.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._recent_spans.clear()
+
+
+# Global instance
+metrics = MetricsRegistry()
+
+def get_metrics() -> MetricsRegistry:
+    """Get the global metrics registry"""
+    return metrics
+
+def span(name: str, **labels):
+    """Time a block of work on the global registry"""
+    return metrics.span(name, **labels)
+
+def timed(name: str, **labels):
+    """Decorator timing every call of a function on the global registry"""
+    return metrics.timed(name, **labels)
+
+
+def _metrics_handler():
+    """Request handler class for /metrics (http.server is only imported when the endpoint starts)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes are too frequent to log
+
+    return _MetricsHandler
+
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> bool:
+    """
+    Serve /metrics in a daemon thread (once per process)
+
+    Returns:
+        True if the endpoint is running
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return True
+        if not metrics.enabled:
+            return False
+        try:
+            from http.server import ThreadingHTTPServer
+            _server = ThreadingHTTPServer((host, port), _metrics_handler())
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint not started on {host}:{port}: {e}")
+            return False
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"📈 Prometheus metrics at http://{host}:{port}/metrics")
+        return True
+
+def metrics_server_address() -> Optional[str]:
+    """URL of the running metrics endpoint, if any"""
+    if _server is None:
+        return None
+    host, port = _server.server_address[:2]
+    return f"http://{host}:{port}/metrics"
@@ -0,0 +1,251 @@
+"""
+Structured OCR output built from Tesseract's image_to_data
+Words are kept in parallel array columns (boxes, confidences, block/paragraph/
+line ids) instead of one dict per word, so a page of layout costs a few bytes
+per word in memory and on disk. Layouts give real word confidences, let
+previews highlight matches, and are stored per document so later steps can
+reuse the recognised text without running OCR again.
+"""
+import string
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+from config import OCR_LAYOUT_DIR
+from modules.serialization import dumps, load_file
+
+Box = Tuple[int, int, int, int]  # left, top, width, height
+
+# Tesseract image_to_data level of word rows
+WORD_LEVEL = 5
+
+_INT_COLUMNS = ("left", "top", "width", "height", "block", "par", "line")
+
+
+def _normalize(word: str) -> str:
+    return word.strip(string.punctuation + "“”‘’").lower()
+
+
+class OCRLayout:
+    """Words of one OCRed page with their boxes, confidences and line structure"""
+
+    __slots__ = ("image_size", "page_num", "words", "conf") + _INT_COLUMNS
+
+    def __init__(self, image_size: Tuple[int, int] = (0, 0), page_num: int = 0):
+        """
+        Args:
+            image_size: (width, height) of the image the boxes refer to
+            page_num: Zero-based page index within the document
+        """
+        self.image_size = tuple(image_size)
+        self.page_num = page_num
+        self.words: List[str] = []
+        self.conf = array("f")
+        for column in _INT_COLUMNS:
+            setattr(self, column, array("I"))
+
+    @classmethod
+    def from_tesseract(cls, data: Dict[str, list], image_size: Tuple[int, int], page_num: int = 0) -> "OCRLayout":
+        """
+        Build a layout from pytesseract.image_to_data(..., output_type=Output.DICT)
+
+        Only word rows with text are kept; block/paragraph/line rows are implied by the ids.
+        """
+        layout = cls(image_size, page_num)
+        for i, level in enumerate(data["level"]):
+            word = str(data["text"][i]).strip()
+            if int(level) != WORD_LEVEL or not word:
+                continue
+            layout.add_word(word, (int(data["left"][i]), int(data["top"][i]), int(data["width"][i]),
+                                   int(data["height"][i])),
+                            float(data["conf"][i]), int(data["block_num"][i]), int(data["par_num"][i]),
+                            int(data["line_num"][i]))
+        return layout
+
+    def add_word(self, word: str, box: Box, confidence: float, block: int, par: int, line: int):
+        """Append one word (confidence on Tesseract's 0-100 scale, -1 when unknown)"""
+        self.words.append(word)
+        self.left.append(box[0])
+        self.top.append(box[1])
+        self.width.append(box[2])
+        self.height.append(box[3])
+        self.conf.append(confidence)
+        self.block.append(block)
+        self.par.append(par)
+        self.line.append(line)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def box(self, index: int) -> Box:
+        return self.left[index], self.top[index], self.width[index], self.height[index]
+
+    def _line_spans(self) -> Iterator[Tuple[int, int]]:
+        """(start, end) word index ranges of each text line, in reading order"""
+        start = 0
+        for i in range(1, len(self.words) + 1):
+            if i == len(self.words) or (self.block[i], self.par[i], self.line[i]) != \
+                    (self.block[start], self.par[start], self.line[start]):
+                yield start, i
+                start = i
+
+    @property
+    def text(self) -> str:
+        """Plain text: words joined by spaces, lines by newlines, paragraphs by blank lines"""
+        parts = []
+        previous = None
+        for start, end in self._line_spans():
+            if previous is not None:
+                same_paragraph = (self.block[start], self.par[start]) == (self.block[previous], self.par[previous])
+                parts.append("\n" if same_paragraph else "\n\n")
+            parts.append(" ".join(self.words[start:end]))
+            previous = start
+        return "".join(parts)
+
+    def _line_info(self, start: int, end: int) -> Dict:
+        return {
+            "text": " ".join(self.words[start:end]),
+            "box": self._union(range(start, end)),
+            "confidence": self._mean_confidence(range(start, end)),
+            "block": self.block[start],
+            "page_num": self.page_num,
+        }
+
+    def lines(self) -> List[Dict]:
+        """Text lines with their bounding box and mean confidence (0-1)"""
+        return [self._line_info(start, end) for start, end in self._line_spans()]
+
+    def _union(self, indices) -> Box:
+        indices = list(indices)
+        left = min(self.left[i] for i in indices)
+        top = min(self.top[i] for i in indices)
+        right = max(self.left[i] + self.width[i] for i in indices)
+        bottom = max(self.top[i] + self.height[i] for i in indices)
+        return left, top, right - left, bottom - top
+
+    def _mean_confidence(self, indices) -> float:
+        """Character-weighted mean word confidence on a 0-1 scale"""
+        weighted = total = 0
+        for i in indices:
+            if self.conf[i] < 0:
+                continue
+            chars = len(self.words[i])
+            weighted += self.conf[i] * chars
+            total += chars
+        return weighted / total / 100 if total else 0.0
+
+    @property
+    def mean_confidence(self) -> float:
+        """Tesseract's own confidence for the page, weighted by word length (0-1)"""
+        return self._mean_confidence(range(len(self.words)))
+
+    def _matches(self, query: str) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        (line start, line end, match start, match end) word indices of each occurrence of a query
+
+        A phrase matches consecutive words on one line, each containing the
+        corresponding query word (case-insensitive, ignoring punctuation).
+        """
+        tokens = [token for token in (_normalize(token) for token in query.split()) if token]
+        if not tokens:
+            return
+        normalized = [_normalize(word) for word in self.words]
+        for start, end in self._line_spans():
+            for i in range(start, end - len(tokens) + 1):
+                if all(token in normalized[i + k] for k, token in enumerate(tokens)):
+                    yield start, end, i, i + len(tokens)
+
+    def find(self, query: str) -> List[Box]:
+        """Boxes of every occurrence of a word or phrase"""
+        return [self._union(range(first, last)) for _, _, first, last in self._matches(query)]
+
+    def find_lines(self, query: str) -> List[Dict]:
+        """Lines (as returned by lines()) containing a word or phrase"""
+        spans = sorted({(start, end) for start, end, _, _ in self._matches(query)})
+        return [self._line_info(start, end) for start, end in spans]
+
+    def to_dict(self) -> Dict:
+        """Column-oriented, JSON-serialisable form"""
+        data = {"image_size": list(self.image_size), "page_num": self.page_num, "words": self.words,
+                "conf": [round(value, 1) for value in self.conf]}
+        for column in _INT_COLUMNS:
+            data[column] = getattr(self, column).tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "OCRLayout":
+        layout = cls(tuple(data["image_size"]), data.get("page_num", 0))
+        layout.words = list(data["words"])
+        layout.conf = array("f", data["conf"])
+        for column in _INT_COLUMNS:
+            setattr(layout, column, array("I", data[column]))
+        return layout
+
+
+def layout_path(doc_id):
+    return OCR_LAYOUT_DIR / f"{doc_id}.json"
+
+
+def save_layouts(doc_id, layouts: List[OCRLayout]) -> bool:
+    """
+    Store the OCR layouts of a document's pages
+
+    Args:
+        doc_id: Document id from the database
+        layouts: One layout per OCRed page
+
+    Returns:
+        True if anything was written
+    """
+    if not layouts:
+        return False
+    try:
+        OCR_LAYOUT_DIR.mkdir(parents=True, exist_ok=True)
+        with open(layout_path(doc_id), "wb") as f:
+            f.write(dumps({"pages": [layout.to_dict() for layout in layouts]}))
+        return True
+    except Exception as e:
+        print(f"Error saving OCR layout for document {doc_id}: {e}")
+        return False
+
+
+def load_layouts(doc_id) -> List[OCRLayout]:
+    """Stored OCR layouts of a document ([] when the document was not OCRed)"""
+    path = layout_path(doc_id)
+    if not path.exists():
+        return []
+    try:
+        return [OCRLayout.from_dict(page) for page in load_file(path)["pages"]]
+    except Exception as e:
+        print(f"Error loading OCR layout for document {doc_id}: {e}")
+        return []
+
+
+def highlight_matches(image, layout: OCRLayout, query: str, color: str = "#FFB300", width: int = 3):
+    """
+    Draw boxes around matches of a query on a copy of the page image
+
+    The image may differ in size from the one that was OCRed (e.g. the original
+    before preprocessing downscaled it); boxes are scaled to fit.
+
+    Returns:
+        Tuple of (annotated RGB image, number of matches)
+    """
+    from PIL import ImageDraw
+
+    boxes = layout.find(query)
+    annotated = image.convert("RGB")
+    if not boxes:
+        return annotated, 0
+    ocr_width, ocr_height = layout.image_size
+    scale_x = annotated.width / ocr_width if ocr_width else 1.0
+    scale_y = annotated.height / ocr_height if ocr_height else 1.0
+    draw = ImageDraw.Draw(annotated)
+    for left, top, box_width, box_height in boxes:
+        draw.rectangle([left * scale_x - 2, top * scale_y - 2, (left + box_width) * scale_x + 2,
+                        (top + box_height) * scale_y + 2], outline=color, width=width)
+    return annotated, len(boxes)
+
+
+def layouts_text(layouts: List[OCRLayout]) -> str:
+    """Document text rebuilt from stored layouts, in page order"""
+    return "\n".join(layout.text for layout in sorted(layouts, key=lambda layout: layout.page_num))
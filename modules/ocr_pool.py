@@ -0,0 +1,207 @@
+"""
+Pool of warm Tesseract engines for OCR
+With tesserocr installed, each worker keeps its Tesseract engines (one per
+language/config combination) initialised for the life of the process and
+receives PIL images in memory, so a page costs no process spawn, temp file or
+traineddata reload. Without tesserocr the pool falls back to pytesseract,
+with the same worker limit bounding how many tesseract processes run at once.
+"""
+import logging
+import queue
+import shlex
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from PIL import Image
+
+from config import OCR_ENGINE, OCR_WORKERS
+from modules.lazy import lazy_import, module_importable
+
+tesserocr = lazy_import('tesserocr')
+
+logger = logging.getLogger(__name__)
+
+OCR_ENGINES = ("tesserocr", "pytesseract")
+
+# Column names of pytesseract.image_to_data(..., output_type=Output.DICT)
+DATA_COLUMNS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+                "left", "top", "width", "height", "conf", "text")
+
+
+def parse_tesseract_config(config: str) -> Tuple[int, int, Tuple[Tuple[str, str], ...]]:
+    """
+    Split a tesseract command-line config into engine settings
+
+    Returns:
+        Tuple of (page segmentation mode, OCR engine mode, sorted (name, value) variables)
+    """
+    psm, oem, variables = 3, 3, {}
+    args = shlex.split(config, posix=False) if config else []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ("--psm", "--oem", "-c") and i + 1 < len(args):
+            value = args[i + 1]
+            if arg == "--psm":
+                psm = int(value)
+            elif arg == "--oem":
+                oem = int(value)
+            else:
+                name, _, setting = value.partition("=")
+                variables[name] = setting
+            i += 2
+        else:
+            i += 1
+    return psm, oem, tuple(sorted(variables.items()))
+
+
+def resolve_engine(engine: str = OCR_ENGINE) -> str:
+    """Engine actually used for a configured name ('auto' prefers tesserocr)"""
+    if engine not in OCR_ENGINES + ("auto",):
+        raise ValueError(f"Unknown OCR engine: {engine} (choose from auto, {', '.join(OCR_ENGINES)})")
+    if engine in ("auto", "tesserocr") and module_importable('tesserocr'):
+        return "tesserocr"
+    if engine == "tesserocr":
+        logger.warning("tesserocr is not installed; falling back to pytesseract")
+    return "pytesseract"
+
+
+class TesserocrWorker:
+    """One thread's set of initialised Tesseract engines"""
+
+    def __init__(self):
+        self._apis: Dict[Tuple, object] = {}
+
+    def _api(self, lang: str, oem: int, variables: Tuple[Tuple[str, str], ...]):
+        # Variables such as the character whitelist stick to an engine, so each
+        # combination gets its own; there are only a handful in practice
+        key = (lang, oem, variables)
+        api = self._apis.get(key)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=lang, oem=oem)
+            for name, value in variables:
+                api.SetVariable(name, value)
+            self._apis[key] = api
+        return api
+
+    def image_to_data(self, image: Image.Image, lang: str, config: str = '') -> Dict[str, List]:
+        """Recognise an image and return word rows in pytesseract's image_to_data layout"""
+        psm, oem, variables = parse_tesseract_config(config)
+        api = self._api(lang, oem, variables)
+        api.SetPageSegMode(psm)
+        api.SetImage(image)
+        api.Recognize()
+
+        data = {column: [] for column in DATA_COLUMNS}
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+        level = tesserocr.RIL.WORD
+        block = par = line = word = 0
+        for result in tesserocr.iterate_level(iterator, level):
+            if result.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                block, par, line = block + 1, 0, 0
+            if result.IsAtBeginningOf(tesserocr.RIL.PARA):
+                par, line = par + 1, 0
+            if result.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line, word = line + 1, 0
+            word += 1
+            bbox = result.BoundingBox(level)
+            if bbox is None:
+                continue
+            left, top, right, bottom = bbox
+            for column, value in zip(DATA_COLUMNS, (5, 1, block, par, line, word, left, top, right - left,
+                                                    bottom - top, result.Confidence(level),
+                                                    result.GetUTF8Text(level) or "")):
+                data[column].append(value)
+        return data
+
+    def close(self):
+        for api in self._apis.values():
+            api.End()
+        self._apis.clear()
+
+
+class OCRWorkerPool:
+    """Bounded pool of OCR workers shared by every session in the process"""
+
+    def __init__(self, workers: int = OCR_WORKERS, engine: str = OCR_ENGINE):
+        """
+        Args:
+            workers: Maximum concurrent OCR calls (and warm tesserocr workers)
+            engine: 'auto', 'tesserocr' or 'pytesseract'
+        """
+        self.workers = max(1, workers)
+        self.engine = resolve_engine(engine)
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._idle = queue.LifoQueue()  # Most recently used worker first: its engines are warm
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'total_ms': 0.0, 'workers_created': 0, 'waiting': 0, 'in_flight': 0}
+
+    @contextmanager
+    def _worker(self):
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            worker = TesserocrWorker()
+            with self._lock:
+                self._stats['workers_created'] += 1
+        try:
+            yield worker
+        finally:
+            self._idle.put(worker)
+
+    def image_to_data(self, image: Image.Image, lang: str, config: str = '') -> Dict[str, List]:
+        """
+        OCR an in-memory image
+
+        Args:
+            image: PIL image (already preprocessed)
+            lang: Tesseract language code, e.g. 'eng+mal'
+            config: Tesseract command-line options (--psm, --oem, -c name=value)
+
+        Returns:
+            Dict of columns as returned by pytesseract.image_to_data with Output.DICT
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._stats['waiting'] += 1
+        with self._slots:
+            with self._lock:
+                self._stats['waiting'] -= 1
+                self._stats['in_flight'] += 1
+            try:
+                if self.engine == "tesserocr":
+                    with self._worker() as worker:
+                        data = worker.image_to_data(image, lang, config)
+                else:
+                    from modules.ocr_processor import pytesseract
+                    data = pytesseract.image_to_data(image, lang=lang, config=config,
+                                                     output_type=pytesseract.Output.DICT)
+            finally:
+                with self._lock:
+                    self._stats['in_flight'] -= 1
+        with self._lock:
+            self._stats['calls'] += 1
+            self._stats['total_ms'] += (time.perf_counter() - started) * 1000
+        return data
+
+    def get_stats(self) -> Dict:
+        """Engine, worker limit, queue depth and call timings"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['engine'] = self.engine
+        stats['workers'] = self.workers
+        stats['idle_workers'] = self._idle.qsize()
+        stats['avg_ms'] = stats['total_ms'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
+
+    def close(self):
+        """Release every warm engine"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
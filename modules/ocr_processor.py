@@ -2,59 +2,67 @@
 Advanced OCR Processing module for extracting text from images and PDFs
 Supports English, Malayalam, and hybrid content detection with Tesseract OCR
 """
-import pytesseract
 from PIL import Image, ImageEnhance, ImageFilter
-import PyPDF2
-from pdf2image import convert_from_bytes
 import io
 import streamlit as st
-from langdetect import detect, LangDetectException
 import logging
 import re
 from typing import Dict, List, Tuple, Optional
 import subprocess
-import shutil
+from modules.lazy import lazy_import, module_importable, find_executable
+from modules.preprocessing import ImagePreprocessor
+from modules.pdf_text import extract_pdf_pages
+from modules.ocr_layout import OCRLayout
+from modules.language_stats import ScriptHistogram
+from modules.metrics import get_metrics, span, timed
+from config import OCR_PDF_PAGE_MIN_TEXT_CHARS, OCR_PDF_RASTER_DPI, OCR_PDF_MAX_OCR_PAGES
+
+TESSERACT_FALLBACK_PATHS = (
+    '/usr/bin/tesseract',
+    '/usr/local/bin/tesseract',
+    '/opt/homebrew/bin/tesseract',
+    'C:\\Program Files\\Tesseract-OCR\\tesseract.exe',
+    'C:\\Program Files (x86)\\Tesseract-OCR\\tesseract.exe'
+)
 
 # Check for Tesseract availability
 def check_tesseract():
-    """Check if Tesseract is available on the system"""
+    """Check if Tesseract is available on the system (probed once, then cached)"""
     try:
-        # Try to find tesseract executable
-        tesseract_cmd = shutil.which('tesseract')
-        if tesseract_cmd:
-            return True, tesseract_cmd
-        
-        # Try common installation paths
-        common_paths = [
-            '/usr/bin/tesseract',
-            '/usr/local/bin/tesseract',
-            '/opt/homebrew/bin/tesseract',
-            'C:\\Program Files\\Tesseract-OCR\\tesseract.exe',
-            'C:\\Program Files (x86)\\Tesseract-OCR\\tesseract.exe'
-        ]
-        
-        for path in common_paths:
-            if shutil.which(path):
-                return True, path
-                
-        return False, None
+        tesseract_cmd = find_executable('tesseract', *TESSERACT_FALLBACK_PATHS)
+        return (True, tesseract_cmd) if tesseract_cmd else (False, None)
     except Exception:
         return False, None
 
-TESSERACT_AVAILABLE, TESSERACT_PATH = check_tesseract()
+def tesseract_available() -> bool:
+    return check_tesseract()[0]
+
+def cv2_available() -> bool:
+    """Optional OpenCV for enhanced image preprocessing, imported on first use"""
+    return module_importable('cv2', 'numpy')
 
-# Configure pytesseract if available
-if TESSERACT_AVAILABLE and TESSERACT_PATH:
-    pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
+def _configure_pytesseract(module):
+    """Point pytesseract at the detected binary when it is first imported"""
+    available, path = check_tesseract()
+    if available and path:
+        module.pytesseract.tesseract_cmd = path
 
-# Optional OpenCV import for enhanced image preprocessing
-try:
-    import cv2
-    import numpy as np
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-    # Warning will be shown in the UI when preprocessing is first used
+# Heavy dependencies are only imported when OCR or PDF extraction actually runs
+pytesseract = lazy_import('pytesseract', on_load=_configure_pytesseract)
+PyPDF2 = lazy_import('PyPDF2')
+pdf2image = lazy_import('pdf2image')
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+def __getattr__(name):
+    """Availability flags are computed on first access (PEP 562)"""
+    if name == 'TESSERACT_AVAILABLE':
+        return check_tesseract()[0]
+    if name == 'TESSERACT_PATH':
+        return check_tesseract()[1]
+    if name == 'CV2_AVAILABLE':
+        return cv2_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class AdvancedOCRProcessor:
     def __init__(self):
@@ -65,116 +73,46 @@ class AdvancedOCRProcessor:
             'hybrid': 'eng+mal'
         }
         self.logger = logging.getLogger(__name__)
+        self.preprocessor = ImagePreprocessor()
         
-        # Show system status on initialization
-        if not CV2_AVAILABLE:
-            self.logger.info("OpenCV not available - using PIL-based image preprocessing")
-        if not TESSERACT_AVAILABLE:
+        # Show system status on initialization (OpenCV is reported on first preprocessing)
+        if not tesseract_available():
             self.logger.warning("Tesseract OCR not available - OCR functionality will be limited")
         
     def detect_content_language(self, text: str) -> Dict[str, any]:
         """
         Detect language content and provide confidence scores
-        """
-        if not text.strip():
-            return {
-                'primary_language': 'unknown',
-                'languages_detected': [],
-                'is_hybrid': False,
-                'confidence': 0.0
-            }
         
-        # Check for Malayalam Unicode range
-        malayalam_pattern = r'[\u0d00-\u0d7f]+'
-        malayalam_matches = re.findall(malayalam_pattern, text)
-        has_malayalam = len(malayalam_matches) > 0
-        
-        # Check for English content
-        english_pattern = r'[a-zA-Z]+'
-        english_matches = re.findall(english_pattern, text)
-        has_english = len(english_matches) > 0
-        
-        # Calculate language percentages
-        total_chars = len(text.replace(' ', ''))
-        malayalam_chars = sum(len(match) for match in malayalam_matches)
-        english_chars = sum(len(match) for match in english_matches)
-        
-        malayalam_percentage = (malayalam_chars / total_chars * 100) if total_chars > 0 else 0
-        english_percentage = (english_chars / total_chars * 100) if total_chars > 0 else 0
-        
-        # Determine primary language and hybrid status
-        is_hybrid = has_malayalam and has_english and min(malayalam_percentage, english_percentage) > 10
-        
-        if is_hybrid:
-            primary_language = 'hybrid'
-            languages_detected = ['english', 'malayalam']
-            confidence = min(malayalam_percentage, english_percentage) / 100
-        elif malayalam_percentage > english_percentage:
-            primary_language = 'malayalam'
-            languages_detected = ['malayalam']
-            confidence = malayalam_percentage / 100
-        elif english_percentage > 0:
-            primary_language = 'english'
-            languages_detected = ['english']
-            confidence = english_percentage / 100
-        else:
-            # Fallback to langdetect
-            try:
-                detected_lang = detect(text)
-                primary_language = 'english' if detected_lang == 'en' else 'unknown'
-                languages_detected = [primary_language] if primary_language != 'unknown' else []
-                confidence = 0.7
-            except LangDetectException:
-                primary_language = 'unknown'
-                languages_detected = []
-                confidence = 0.0
-        
-        return {
-            'primary_language': primary_language,
-            'languages_detected': languages_detected,
-            'is_hybrid': is_hybrid,
-            'confidence': confidence,
-            'malayalam_percentage': malayalam_percentage,
-            'english_percentage': english_percentage
-        }
+        Scripts are counted in a single pass (see modules/language_stats.py);
+        use ScriptHistogram directly to merge counts from several pages.
+        """
+        return ScriptHistogram.from_text(text).analysis(text)
     
     def preprocess_image(self, image: Image.Image) -> Image.Image:
         """
         Preprocess image for better OCR accuracy
         Uses OpenCV for advanced processing when available, falls back to PIL
         """
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        if CV2_AVAILABLE:
-            # Advanced preprocessing with OpenCV
-            try:
-                # Convert PIL image to OpenCV format
-                cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-                
-                # Convert to grayscale
-                gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-                
-                # Apply denoising
-                denoised = cv2.fastNlMeansDenoising(gray)
-                
-                # Apply adaptive thresholding
-                thresh = cv2.adaptiveThreshold(
-                    denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-                )
-                
-                # Convert back to PIL Image
-                processed_image = Image.fromarray(thresh)
-                
-            except Exception as e:
-                self.logger.warning(f"OpenCV preprocessing failed, using PIL fallback: {e}")
-                processed_image = self._preprocess_with_pil(image)
-        else:
-            # Fallback to PIL-based preprocessing
-            processed_image = self._preprocess_with_pil(image)
+        return self.preprocess_image_with_report(image)[0]
+    
+    def preprocess_image_with_report(self, image: Image.Image) -> Tuple[Image.Image, Dict[str, any]]:
+        """
+        Run the configured preprocessing pipeline (see modules/preprocessing.py)
         
-        return processed_image
+        Returns:
+            Tuple of (processed image, report with quality metrics and per-step timings)
+        """
+        try:
+            with span("ocr.preprocess"):
+                processed_image, report = self.preprocessor.run(image)
+            self.logger.debug(f"Preprocessing took {report['total_ms']:.1f} ms: "
+                              + ", ".join(f"{step['name']}={step['ms']:.1f}ms" for step in report['steps']))
+            return processed_image, report
+        except Exception as e:
+            self.logger.warning(f"Image preprocessing failed, using PIL fallback: {e}")
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            return self._preprocess_with_pil(image), {'backend': 'pil', 'steps': [], 'total_ms': 0.0, 'error': str(e)}
     
     def _preprocess_with_pil(self, image: Image.Image) -> Image.Image:
         """
@@ -204,7 +142,7 @@ class AdvancedOCRProcessor:
         """
         try:
             # Check if Tesseract is available
-            if not TESSERACT_AVAILABLE:
+            if not tesseract_available():
                 return {
                     'text': '',
                     'language_analysis': self.detect_content_language(''),
@@ -215,82 +153,9 @@ class AdvancedOCRProcessor:
                     'error': 'Tesseract OCR is not available on this system. Please install Tesseract for OCR functionality.'
                 }
             
-            # Load and preprocess image
+            # Load the image and run the OCR pipeline on it
             image = Image.open(image_file)
-            processed_image = self.preprocess_image(image)
-            
-            results = {}
-            
-            if auto_detect_language:
-                # Try different language combinations
-                lang_configs = [
-                    ('hybrid', 'eng+mal'),
-                    ('english', 'eng'),
-                    ('malayalam', 'mal')
-                ]
-                
-                best_result = None
-                best_confidence = 0
-                
-                for lang_name, lang_code in lang_configs:
-                    try:
-                        # Custom OCR config for better accuracy
-                        custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz\u0d00-\u0d7f\u0020\u002e\u002c\u003a\u003b\u0028\u0029\u002d\u002f'
-                        
-                        text = pytesseract.image_to_string(
-                            processed_image, 
-                            lang=lang_code,
-                            config=custom_config
-                        )
-                        
-                        if text.strip():
-                            lang_analysis = self.detect_content_language(text)
-                            
-                            # Calculate overall confidence
-                            ocr_confidence = len(text.strip()) / 100  # Simple heuristic
-                            total_confidence = (lang_analysis['confidence'] + min(ocr_confidence, 1.0)) / 2
-                            
-                            if total_confidence > best_confidence:
-                                best_confidence = total_confidence
-                                best_result = {
-                                    'text': text,
-                                    'language_analysis': lang_analysis,
-                                    'ocr_language': lang_name,
-                                    'confidence': total_confidence
-                                }
-                    
-                    except Exception as e:
-                        self.logger.warning(f"OCR failed for {lang_name}: {str(e)}")
-                        continue
-                
-                if best_result:
-                    results = best_result
-                else:
-                    # Fallback to basic English OCR
-                    text = pytesseract.image_to_string(processed_image, lang='eng')
-                    lang_analysis = self.detect_content_language(text)
-                    results = {
-                        'text': text,
-                        'language_analysis': lang_analysis,
-                        'ocr_language': 'english',
-                        'confidence': 0.5
-                    }
-            else:
-                # Use hybrid language model by default
-                text = pytesseract.image_to_string(processed_image, lang='eng+mal')
-                lang_analysis = self.detect_content_language(text)
-                results = {
-                    'text': text,
-                    'language_analysis': lang_analysis,
-                    'ocr_language': 'hybrid',
-                    'confidence': lang_analysis['confidence']
-                }
-            
-            # Add text statistics and extraction method
-            results['text_stats'] = self.get_text_stats(results['text'])
-            results['extraction_method'] = 'ocr_image'
-            
-            return results
+            return self.ocr_image(image, auto_detect_language)
             
         except Exception as e:
             self.logger.error(f"Error performing OCR on image: {str(e)}")
@@ -304,81 +169,244 @@ class AdvancedOCRProcessor:
                 'error': str(e)
             }
     
+    def _ocr_layout(self, image: Image.Image, lang_code: str, config: str = '') -> OCRLayout:
+        """Run Tesseract once on a pooled engine, keeping word boxes, confidences and line structure"""
+        from modules.resources import get_ocr_pool
+        with span("ocr.tesseract", lang=lang_code):
+            data = get_ocr_pool().image_to_data(image, lang_code, config)
+        return OCRLayout.from_tesseract(data, image.size)
+    
+    def ocr_image(self, image: Image.Image, auto_detect_language: bool = True) -> Dict[str, any]:
+        """
+        Preprocess and OCR an already loaded image (used for images and PDF pages)
+        
+        Confidence combines how well the text fits the detected language with
+        Tesseract's own character-weighted word confidence. The word layout is
+        returned under 'layouts' (one OCRLayout per page).
+        """
+        processed_image, preprocessing = self.preprocess_image_with_report(image)
+        
+        results = {}
+        
+        if auto_detect_language:
+            # Try different language combinations
+            lang_configs = [
+                ('hybrid', 'eng+mal'),
+                ('english', 'eng'),
+                ('malayalam', 'mal')
+            ]
+        
+            best_result = None
+            best_confidence = 0
+        
+            for lang_name, lang_code in lang_configs:
+                try:
+                    # Custom OCR config for better accuracy
+                    custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz\u0d00-\u0d7f\u0020\u002e\u002c\u003a\u003b\u0028\u0029\u002d\u002f'
+        
+                    layout = self._ocr_layout(processed_image, lang_code, custom_config)
+                    text = layout.text
+        
+                    if text.strip():
+                        script_counts = ScriptHistogram.from_text(text)
+                        lang_analysis = script_counts.analysis(text)
+        
+                        # Calculate overall confidence
+                        total_confidence = (lang_analysis['confidence'] + layout.mean_confidence) / 2
+        
+                        if total_confidence > best_confidence:
+                            best_confidence = total_confidence
+                            best_result = {
+                                'text': text,
+                                'language_analysis': lang_analysis,
+                                'ocr_language': lang_name,
+                                'confidence': total_confidence,
+                                'word_confidence': layout.mean_confidence,
+                                'layouts': [layout],
+                                'script_counts': script_counts
+                            }
+        
+                except Exception as e:
+                    self.logger.warning(f"OCR failed for {lang_name}: {str(e)}")
+                    continue
+        
+            if best_result:
+                results = best_result
+            else:
+                # Fallback to basic English OCR
+                layout = self._ocr_layout(processed_image, 'eng')
+                script_counts = ScriptHistogram.from_text(layout.text)
+                results = {
+                    'text': layout.text,
+                    'language_analysis': script_counts.analysis(layout.text),
+                    'ocr_language': 'english',
+                    'confidence': layout.mean_confidence,
+                    'word_confidence': layout.mean_confidence,
+                    'layouts': [layout],
+                    'script_counts': script_counts
+                }
+        else:
+            # Use hybrid language model by default
+            layout = self._ocr_layout(processed_image, 'eng+mal')
+            script_counts = ScriptHistogram.from_text(layout.text)
+            lang_analysis = script_counts.analysis(layout.text)
+            results = {
+                'text': layout.text,
+                'language_analysis': lang_analysis,
+                'ocr_language': 'hybrid',
+                'confidence': (lang_analysis['confidence'] + layout.mean_confidence) / 2,
+                'word_confidence': layout.mean_confidence,
+                'layouts': [layout],
+                'script_counts': script_counts
+            }
+        
+        # Add text statistics and extraction method
+        results['text_stats'] = self.get_text_stats(results['text'])
+        results['extraction_method'] = 'ocr_image'
+        results['preprocessing'] = preprocessing
+        
+        return results
+    
+    @staticmethod
+    def _page_has_images(page) -> bool:
+        """Whether a PDF page draws any image or form XObject (True when unsure)"""
+        try:
+            resources = page.get('/Resources')
+            if resources is None:
+                return True  # Possibly inherited from the page tree
+            xobjects = resources.get_object().get('/XObject')
+            if xobjects is None:
+                return False
+            for xobject in xobjects.get_object().values():
+                if xobject.get_object().get('/Subtype') in ('/Image', '/Form'):
+                    return True
+            return False
+        except Exception:
+            return True
+    
     def extract_text_from_pdf(self, pdf_file, auto_detect_language: bool = True) -> Dict[str, any]:
         """
-        Extract text from PDF file - handles both text-based and scanned PDFs
+        Extract text from PDF file - handles text-based, scanned and mixed PDFs
+        
+        Each page is routed on its own: the text layer is used where it exists,
+        and only image-only pages are rasterised and OCRed. Page texts are
+        merged in page order. The text layer comes from the fastest installed
+        backend (see modules/pdf_text.py).
         """
         try:
-            # First, try to extract text directly (for text-based PDFs)
             pdf_file.seek(0)  # Reset file pointer
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            direct_text = ""
-            
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                direct_text += page.extract_text() + "\n"
+            pdf_bytes = pdf_file.read()
+            with span("pdf.text_layer"):
+                page_texts, text_backend = extract_pdf_pages(pdf_bytes)
             
-            # If we got meaningful text, analyze it
-            if direct_text.strip() and len(direct_text.strip()) > 50:
-                lang_analysis = self.detect_content_language(direct_text)
-                return {
-                    'text': direct_text,
-                    'language_analysis': lang_analysis,
-                    'extraction_method': 'direct_text',
-                    'confidence': lang_analysis['confidence'],
-                    'text_stats': self.get_text_stats(direct_text)
-                }
+            pdf_reader = None  # Only opened to inspect pages with little or no text
+            page_methods = []
+            scanned_pages = []
+            for page_num, text in enumerate(page_texts):
+                if len(text.strip()) >= OCR_PDF_PAGE_MIN_TEXT_CHARS:
+                    page_methods.append('text')
+                    continue
+                if pdf_reader is None:
+                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+                if self._page_has_images(pdf_reader.pages[page_num]):
+                    page_methods.append('scanned')
+                    scanned_pages.append(page_num)
+                else:
+                    page_methods.append('text' if text.strip() else 'blank')
             
-            # If no text or very little text, treat as scanned PDF
-            pdf_file.seek(0)  # Reset file pointer
-            pdf_bytes = pdf_file.read()
+            ocr_confidences = []
+            preprocessing_reports = []
+            layouts = []
+            ocr_script_counts = {}
+            errors = []
+            if scanned_pages and not tesseract_available():
+                errors.append('Tesseract OCR is not available; scanned pages were skipped')
+                for page_num in scanned_pages:
+                    page_methods[page_num] = 'ocr_unavailable'
+            else:
+                for page_num in scanned_pages[:OCR_PDF_MAX_OCR_PAGES]:
+                    try:
+                        with span("pdf.page_ocr"):
+                            # Rasterise just this page
+                            with span("pdf.rasterise"):
+                                images = pdf2image.convert_from_bytes(
+                                    pdf_bytes, dpi=OCR_PDF_RASTER_DPI, first_page=page_num + 1, last_page=page_num + 1
+                                )
+                            page_result = self.ocr_image(images[0], auto_detect_language)
+                    except Exception as e:
+                        self.logger.warning(f"OCR failed for PDF page {page_num + 1}: {e}")
+                        errors.append(f"Page {page_num + 1}: {e}")
+                        page_methods[page_num] = 'ocr_failed'
+                        continue
+                    preprocessing_reports.append(page_result['preprocessing'])
+                    for layout in page_result.get('layouts', []):
+                        layout.page_num = page_num
+                        layouts.append(layout)
+                    if page_result['text'].strip():
+                        page_texts[page_num] = f"--- Page {page_num + 1} ---\n" + page_result['text']
+                        ocr_script_counts[page_num] = page_result['script_counts']
+                        ocr_confidences.append(page_result['confidence'])
+                    page_methods[page_num] = 'ocr'
+                for page_num in scanned_pages[OCR_PDF_MAX_OCR_PAGES:]:
+                    page_methods[page_num] = 'ocr_skipped'
             
-            # Convert PDF pages to images
-            try:
-                images = convert_from_bytes(pdf_bytes, dpi=300, first_page=1, last_page=3)  # Limit to first 3 pages for performance
-            except Exception as e:
-                return {
-                    'text': direct_text,  # Return whatever we got
-                    'language_analysis': self.detect_content_language(direct_text),
-                    'extraction_method': 'direct_text_fallback',
-                    'confidence': 0.3,
-                    'text_stats': self.get_text_stats(direct_text),
-                    'error': f"PDF to image conversion failed: {str(e)}"
-                }
+            for method in page_methods:
+                get_metrics().inc("metro_pdf_pages_total", method=method)
             
-            # Perform OCR on each page
-            all_text = ""
-            total_confidence = 0
-            page_count = 0
+            # Merge in page order
+            all_text = "".join(text + "\n" for text in page_texts if text.strip())
             
-            for i, image in enumerate(images):
-                # Convert to bytes for processing
-                img_byte_arr = io.BytesIO()
-                image.save(img_byte_arr, format='PNG')
-                img_byte_arr.seek(0)
-                
-                # Perform OCR on this page
-                page_result = self.extract_text_from_image(img_byte_arr, auto_detect_language)
-                
-                if page_result['text'].strip():
-                    all_text += f"\n--- Page {i+1} ---\n" + page_result['text'] + "\n"
-                    total_confidence += page_result['confidence']
-                    page_count += 1
+            # Merge per-page script counts; OCRed page text is not scanned again
+            script_counts = ScriptHistogram()
+            for page_num, text in enumerate(page_texts):
+                if not text.strip():
+                    continue
+                if page_num in ocr_script_counts:
+                    script_counts += ocr_script_counts[page_num]
+                    script_counts.update(f"--- Page {page_num + 1} ---\n")
+                else:
+                    script_counts.update(text)
+                script_counts.update("\n")
+            lang_analysis = script_counts.analysis(all_text)
             
-            # Calculate average confidence
-            avg_confidence = total_confidence / page_count if page_count > 0 else 0
+            text_pages = page_methods.count('text')
+            ocr_pages = page_methods.count('ocr')
+            if ocr_pages and text_pages:
+                extraction_method = 'hybrid_pdf'
+            elif ocr_pages:
+                extraction_method = 'ocr_scanned_pdf'
+            elif all_text.strip():
+                extraction_method = 'direct_text'
+            else:
+                extraction_method = 'direct_text_fallback'
             
-            # Analyze the combined text
-            lang_analysis = self.detect_content_language(all_text)
+            # Text-layer pages count with the language confidence, OCR pages with their own
+            confidence_parts = [lang_analysis['confidence']] * text_pages + ocr_confidences
+            confidence = sum(confidence_parts) / len(confidence_parts) if confidence_parts else 0.0
             
-            return {
+            result = {
                 'text': all_text,
                 'language_analysis': lang_analysis,
-                'extraction_method': 'ocr_scanned_pdf',
-                'confidence': avg_confidence,
-                'pages_processed': page_count,
+                'extraction_method': extraction_method,
+                'confidence': confidence,
+                'pages_total': len(page_methods),
+                'pages_direct': text_pages,
+                'pages_processed': ocr_pages,
+                'page_methods': page_methods,
+                'text_backend': text_backend,
+                'layouts': layouts,
                 'text_stats': self.get_text_stats(all_text)
             }
+            if preprocessing_reports:
+                result['preprocessing'] = {
+                    'total_ms': sum(report['total_ms'] for report in preprocessing_reports),
+                    'pages': preprocessing_reports
+                }
+            if errors and not all_text.strip():
+                result['error'] = "; ".join(errors)
+            elif errors:
+                result['warnings'] = errors
+            return result
             
         except Exception as e:
             self.logger.error(f"Error extracting text from PDF: {str(e)}")
@@ -426,6 +454,7 @@ class AdvancedOCRProcessor:
                 'error': str(e)
             }
     
+    @timed("ocr.process_document")
     def process_document(self, uploaded_file, auto_detect_language: bool = True) -> Dict[str, any]:
         """
         Main method to process any document type with advanced OCR
@@ -516,7 +545,15 @@ class AdvancedOCRProcessor:
         extraction_method = result.get('extraction_method', 'ocr_processing')
         method_summary = f"⚙️ Method: {extraction_method.replace('_', ' ').title()}"
         
-        return f"{lang_summary}\n{stats_summary}\n{confidence_summary}\n{method_summary}"
+        summary = f"{lang_summary}\n{stats_summary}\n{confidence_summary}\n{method_summary}"
+        if result.get('pages_total'):
+            summary += (f"\n📄 Pages: {result['pages_total']} total, {result['pages_direct']} from text layer, "
+                        f"{result['pages_processed']} OCRed")
+            if result.get('text_backend'):
+                summary += f" (text layer via {result['text_backend']})"
+        if result.get('preprocessing'):
+            summary += f"\n🧹 Preprocessing: {result['preprocessing']['total_ms']:.0f} ms"
+        return summary
 
 
 # Backward compatibility - maintain old class name as alias
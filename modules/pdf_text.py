@@ -0,0 +1,189 @@
+"""
+Pluggable PDF text-layer extraction
+PyPDF2's pure-Python extract_text() is slow on long text PDFs, so the text
+layer is read by the fastest backend installed: pdfium (pypdfium2), poppler's
+pdftotext binary run as a subprocess, or PyPDF2 as the always-available
+fallback. Every backend streams one string per page, in page order.
+"""
+import codecs
+import io
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from config import PDF_TEXT_BACKEND, PDF_TEXT_BACKEND_ORDER, PDFTOTEXT_TIMEOUT
+from modules.lazy import lazy_import, module_available, find_executable
+
+pdfium = lazy_import('pypdfium2')
+PyPDF2 = lazy_import('PyPDF2')
+
+logger = logging.getLogger(__name__)
+
+
+class PdfTextBackend:
+    """Base class: yields the text layer of each page of a PDF"""
+
+    name = "base"
+
+    def is_available(self) -> bool:
+        raise NotImplementedError
+
+    def iter_pages(self, pdf_bytes: bytes) -> Iterator[str]:
+        """
+        Stream page texts
+
+        Args:
+            pdf_bytes: Raw PDF content
+
+        Returns:
+            Iterator yielding one string per page, in page order ('' for pages without text)
+        """
+        raise NotImplementedError
+
+
+class PdfiumBackend(PdfTextBackend):
+    """PDFium through pypdfium2 - native, by far the fastest"""
+
+    name = "pdfium"
+
+    def is_available(self) -> bool:
+        return module_available('pypdfium2')
+
+    def iter_pages(self, pdf_bytes: bytes) -> Iterator[str]:
+        document = pdfium.PdfDocument(pdf_bytes)
+        try:
+            for index in range(len(document)):
+                page = document[index]
+                textpage = page.get_textpage()
+                try:
+                    # PDFium separates lines with CRLF
+                    yield textpage.get_text_range().replace("\r\n", "\n")
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            document.close()
+
+
+class PdftotextBackend(PdfTextBackend):
+    """Poppler's pdftotext, streamed from a subprocess; pages are split on form feeds"""
+
+    name = "pdftotext"
+    chunk_size = 64 * 1024
+
+    def is_available(self) -> bool:
+        return find_executable('pdftotext') is not None
+
+    def iter_pages(self, pdf_bytes: bytes) -> Iterator[str]:
+        # pdftotext needs a seekable input, so the PDF goes through a temporary file
+        handle, path = tempfile.mkstemp(suffix=".pdf")
+        process = None
+        try:
+            with os.fdopen(handle, "wb") as tmp:
+                tmp.write(pdf_bytes)
+            process = subprocess.Popen(
+                [find_executable('pdftotext'), "-enc", "UTF-8", "-q", path, "-"],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+            watchdog = threading.Timer(PDFTOTEXT_TIMEOUT, process.kill)
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                pending = ""
+                for chunk in iter(lambda: process.stdout.read(self.chunk_size), b""):
+                    pending += decoder.decode(chunk)
+                    *pages, pending = pending.split("\f")
+                    yield from pages
+                pending += decoder.decode(b"", final=True)
+                # Every page, including the last, is terminated by a form feed
+                if pending.strip():
+                    yield pending
+                returncode = process.wait()
+            finally:
+                watchdog.cancel()
+            if returncode != 0:
+                raise RuntimeError(f"pdftotext exited with status {returncode}")
+        finally:
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()
+            if process is not None:
+                process.stdout.close()
+            os.unlink(path)
+
+
+class PyPDF2Backend(PdfTextBackend):
+    """Pure-Python PyPDF2 - slowest, but installed everywhere"""
+
+    name = "pypdf2"
+
+    def is_available(self) -> bool:
+        return module_available('PyPDF2')
+
+    def iter_pages(self, pdf_bytes: bytes) -> Iterator[str]:
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+
+PDF_TEXT_BACKENDS = {
+    backend.name: backend for backend in (PdfiumBackend(), PdftotextBackend(), PyPDF2Backend())
+}
+
+
+def available_backends() -> List[str]:
+    """Installed backends, in preference order"""
+    return [name for name in PDF_TEXT_BACKEND_ORDER
+            if name in PDF_TEXT_BACKENDS and PDF_TEXT_BACKENDS[name].is_available()]
+
+
+@lru_cache(maxsize=None)
+def get_pdf_text_backend(name: str = PDF_TEXT_BACKEND) -> PdfTextBackend:
+    """
+    Resolve a backend by name
+
+    Args:
+        name: Backend name, or 'auto' for the first installed one in PDF_TEXT_BACKEND_ORDER
+
+    Returns:
+        The requested backend, or the automatic choice when it is not installed
+    """
+    if name != "auto":
+        if name not in PDF_TEXT_BACKENDS:
+            raise ValueError(f"Unknown PDF text backend: {name} (choose from {sorted(PDF_TEXT_BACKENDS)})")
+        if PDF_TEXT_BACKENDS[name].is_available():
+            return PDF_TEXT_BACKENDS[name]
+        logger.warning(f"PDF text backend '{name}' is not installed; choosing automatically")
+    available = available_backends()
+    return PDF_TEXT_BACKENDS[available[0] if available else "pypdf2"]
+
+
+def extract_pdf_pages(pdf_bytes: bytes, backend: Optional[str] = None) -> Tuple[List[str], str]:
+    """
+    Extract the text layer of every page, falling back to the next backend on failure
+
+    Args:
+        pdf_bytes: Raw PDF content
+        backend: Backend name (defaults to config.PDF_TEXT_BACKEND)
+
+    Returns:
+        Tuple of (page texts in page order, name of the backend that produced them)
+    """
+    first = get_pdf_text_backend(backend or PDF_TEXT_BACKEND)
+    candidates = [first] + [PDF_TEXT_BACKENDS[name] for name in available_backends() if name != first.name]
+    if PDF_TEXT_BACKENDS["pypdf2"] not in candidates:
+        candidates.append(PDF_TEXT_BACKENDS["pypdf2"])
+
+    last_error = None
+    for candidate in candidates:
+        try:
+            return list(candidate.iter_pages(pdf_bytes)), candidate.name
+        except Exception as e:
+            logger.warning(f"PDF text backend '{candidate.name}' failed: {e}")
+            last_error = e
+    raise last_error
@@ -0,0 +1,19 @@
+"""
+Redaction of sensitive information in extracted text
+Email addresses, phone numbers and currency amounts are replaced before text
+is summarised and stored.
+"""
+import re
+
+REDACTION_PATTERNS = [
+    (re.compile(r'[\w\.-]+@[\w\.-]+'), '[REDACTED EMAIL]'),
+    (re.compile(r'\b\d{10,13}\b'), '[REDACTED PHONE]'),
+    (re.compile(r'₹?\s?\d{1,3}(,\d{3})*(\.\d+)?'), '[REDACTED AMOUNT]'),
+]
+
+
+def redact_sensitive(text: str) -> str:
+    """Replace emails, phone numbers and amounts with placeholders"""
+    for pattern, replacement in REDACTION_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
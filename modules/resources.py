@@ -0,0 +1,151 @@
+"""
+Process-wide resource registry for MetroVivaram
+Stateless processors (database handle, OCR processor, classifier,
+summarizer) are constructed once per process and shared by every Streamlit
+rerun, session and CLI tool, instead of being rebuilt on each page render.
+"""
+import atexit
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class ResourceRegistry:
+    """Named, lazily constructed singletons with lifecycle hooks"""
+
+    def __init__(self):
+        self._factories: Dict[str, Dict] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._stats = {'hits': 0, 'misses': 0, 'closed': 0}
+
+    def register(self, name: str, factory: Callable[[], Any],
+                 on_create: Optional[Callable[[Any], None]] = None,
+                 on_close: Optional[Callable[[Any], None]] = None):
+        """
+        Register how to build a resource
+
+        Args:
+            name: Resource name used with get()
+            factory: Zero-argument callable constructing the resource
+            on_create: Optional hook called once with the new instance
+            on_close: Optional hook called with the instance when it is closed
+        """
+        with self._lock:
+            self._factories[name] = {'factory': factory, 'on_create': on_create, 'on_close': on_close}
+
+    def get(self, name: str) -> Any:
+        """Return the shared instance, constructing it on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            self._stats['hits'] += 1
+            return instance
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            instance = self._instances.get(name)
+            if instance is not None:
+                self._stats['hits'] += 1
+                return instance
+            if name not in self._factories:
+                raise KeyError(f"Unknown resource: {name}")
+            spec = self._factories[name]
+            instance = spec['factory']()
+            if spec['on_create'] is not None:
+                spec['on_create'](instance)
+            self._instances[name] = instance
+            self._stats['misses'] += 1
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether a resource has already been constructed"""
+        return name in self._instances
+
+    def peek(self, name: str) -> Optional[Any]:
+        """The instance if it has been constructed, without building it"""
+        return self._instances.get(name)
+
+    def close(self, name: str):
+        """Run a resource's close hook and drop it; the next get() rebuilds it"""
+        with self._lock:
+            instance = self._instances.pop(name, None)
+            if instance is None:
+                return
+            on_close = self._factories[name]['on_close']
+            self._stats['closed'] += 1
+        if on_close is not None:
+            try:
+                on_close(instance)
+            except Exception as e:
+                print(f"Error closing resource '{name}': {e}")
+
+    def close_all(self):
+        """Close every constructed resource (registered to run at exit)"""
+        for name in list(self._instances):
+            self.close(name)
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters and the currently loaded resources"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['loaded'] = sorted(self._instances)
+        return stats
+
+
+def _create_database():
+    from modules.database import DocumentDatabase
+    return DocumentDatabase()
+
+
+def _create_ocr_processor():
+    from modules.ocr_processor import AdvancedOCRProcessor
+    return AdvancedOCRProcessor()
+
+
+def _create_ocr_pool():
+    from modules.ocr_pool import OCRWorkerPool
+    return OCRWorkerPool()
+
+
+def _create_classifier():
+    from modules.document_classifier import DocumentClassifier
+    return DocumentClassifier()
+
+
+def _create_summarizer():
+    from modules.summarizer import DocumentSummarizer
+    return DocumentSummarizer()
+
+
+# Global instance
+registry = ResourceRegistry()
+registry.register('database', _create_database)
+registry.register('ocr_processor', _create_ocr_processor)
+registry.register('ocr_pool', _create_ocr_pool, on_close=lambda pool: pool.close())
+registry.register('classifier', _create_classifier)
+registry.register('summarizer', _create_summarizer)
+atexit.register(registry.close_all)
+
+
+def get_registry() -> ResourceRegistry:
+    """Get the global resource registry"""
+    return registry
+
+def get_database():
+    """Shared DocumentDatabase"""
+    return registry.get('database')
+
+def get_ocr_processor():
+    """Shared AdvancedOCRProcessor"""
+    return registry.get('ocr_processor')
+
+def get_ocr_pool():
+    """Shared OCRWorkerPool of warm Tesseract engines"""
+    return registry.get('ocr_pool')
+
+def get_classifier():
+    """Shared DocumentClassifier"""
+    return registry.get('classifier')
+
+def get_summarizer():
+    """Shared DocumentSummarizer (loads the transformers model on first use)"""
+    return registry.get('summarizer')
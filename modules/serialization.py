@@ -0,0 +1,332 @@
+"""
+Central JSON codec and typed record schemas
+Every persistence path (the JSON store, version files, OCR layouts, alert
+history, the alert broker) and the Socket.IO servers encode and decode
+through this module. The fastest installed backend is used - orjson, then
+msgspec, then the standard library - and all three produce the same compact,
+UTF-8 JSON. Slotted dataclasses describe the stored document, feedback and
+audit records so schema drift is caught on write and by the checker:
+
+    python -m modules.serialization --check data
+"""
+import argparse
+import collections.abc
+import dataclasses
+import datetime
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
+
+from config import JSON_BACKEND, JSON_BACKEND_ORDER, DATA_DIR
+from modules.lazy import lazy_import, module_available
+
+orjson = lazy_import('orjson')
+msgspec = lazy_import('msgspec')
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _default(obj):
+    """
+    Encode values the JSON types do not cover (records, dates, paths, sets, numpy values)
+
+    Raises:
+        TypeError: For anything else, so every backend fails the same way
+            instead of silently writing a string
+    """
+    if isinstance(obj, Struct):
+        return obj.to_dict()
+    if isinstance(obj, collections.abc.Mapping):
+        return dict(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if type(obj).__module__ == "numpy" and hasattr(obj, "tolist"):
+        return obj.tolist()  # numpy scalars become Python numbers, arrays lists
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(name: str = JSON_BACKEND) -> str:
+    """The backend to use for a configured name ('auto' picks the first installed one)"""
+    if name == "auto":
+        return next(backend for backend in JSON_BACKEND_ORDER if backend == "json" or module_available(backend))
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if name != "json" and not module_available(name):
+        print(f"⚠️ {name} is not installed - using the standard json module")
+        return "json"
+    return name
+
+
+def dumps(obj: Any, indent: Optional[int] = None, backend: Optional[str] = None) -> bytes:
+    """
+    Encode obj as UTF-8 JSON
+
+    Args:
+        obj: Value to encode (Structs, dates, paths and sets are converted)
+        indent: None for compact output, otherwise spaces per level
+        backend: Override the configured backend
+
+    Returns:
+        Encoded bytes
+    """
+    backend = backend or resolve_backend()
+    if backend == "orjson" and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    if backend == "msgspec":
+        encoded = msgspec.json.encode(obj, enc_hook=_default)
+        return msgspec.json.format(encoded, indent=indent) if indent else encoded
+    separators = (",", ":") if indent is None else (",", ": ")
+    return json.dumps(obj, ensure_ascii=False, default=_default, indent=indent,
+                      separators=separators).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str], backend: Optional[str] = None) -> Any:
+    """
+    Decode JSON from bytes or str
+
+    Raises:
+        ValueError: If the input is not valid JSON (whatever the backend)
+    """
+    backend = backend or resolve_backend()
+    if backend == "orjson":
+        return orjson.loads(data)  # orjson.JSONDecodeError is a ValueError
+    if backend == "msgspec":
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    if not isinstance(data, str):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def dumps_str(obj: Any, indent: Optional[int] = None) -> str:
+    """Encode obj as a JSON str (for text protocols)"""
+    return dumps(obj, indent=indent).decode("utf-8")
+
+
+def load_file(path: Path) -> Any:
+    """Decode a whole JSON file"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+class SocketIOJSON:
+    """json-module stand-in for python-socketio's json= option"""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs) -> str:
+        return dumps_str(obj)
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return loads(s)
+
+
+socketio_json = SocketIOJSON()
+
+
+# ---------------------------------------------------------------------------
+# Typed records
+# ---------------------------------------------------------------------------
+
+class SchemaError(ValueError):
+    """A record does not match its schema"""
+
+    def __init__(self, record_type: str, problems: List[str]):
+        super().__init__(f"Invalid {record_type}: " + "; ".join(problems))
+        self.problems = problems
+
+
+def _matches(value, annotation) -> bool:
+    if annotation is Any:
+        return True
+    origin = get_origin(annotation)
+    if origin is Union:
+        return any(_matches(value, arg) for arg in get_args(annotation))
+    if origin in (list, List):
+        (item_type,) = get_args(annotation) or (Any,)
+        return isinstance(value, list) and all(_matches(item, item_type) for item in value)
+    if origin in (dict, Dict):
+        return isinstance(value, dict)
+    if annotation is type(None):
+        return value is None
+    if annotation is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if annotation is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, annotation)
+
+
+def _type_name(annotation) -> str:
+    return getattr(annotation, "__name__", None) or str(annotation).replace("typing.", "")
+
+
+def struct(cls):
+    """Class decorator: a slotted dataclass (slots need Python 3.10+)"""
+    if sys.version_info >= (3, 10):
+        return dataclasses.dataclass(slots=True)(cls)
+    return dataclasses.dataclass(cls)
+
+
+class Struct:
+    """Base for the typed records: validation and dict conversion"""
+
+    __slots__ = ()
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _schema(cls):
+        hints = get_type_hints(cls)
+        fields = {field.name: field for field in dataclasses.fields(cls)}
+        required = {name for name, field in fields.items()
+                    if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING}
+        return {name: hints[name] for name in fields if name != "extra"}, required, "extra" in fields
+
+    @classmethod
+    def problems(cls, data: Dict) -> List[str]:
+        """Schema violations of a raw record (empty when it is valid)"""
+        if not isinstance(data, dict):
+            return [f"expected an object, got {type(data).__name__}"]
+        types, required, open_schema = cls._schema()
+        problems = [f"missing '{name}'" for name in sorted(required) if name not in data]
+        for name, value in data.items():
+            annotation = types.get(name)
+            if annotation is None:
+                if not open_schema:
+                    problems.append(f"unknown field '{name}'")
+            elif not _matches(value, annotation):
+                problems.append(f"'{name}' should be {_type_name(annotation)}, got {type(value).__name__}")
+        return problems
+
+    @classmethod
+    def from_dict(cls, data: Dict, strict: bool = True):
+        """
+        Build a record from a raw dict
+
+        Args:
+            data: Raw record as decoded from JSON
+            strict: Raise SchemaError on any problem; otherwise only on missing fields
+        """
+        problems = cls.problems(data)
+        if problems and (strict or any(problem.startswith("missing") for problem in problems)):
+            raise SchemaError(cls.__name__, problems)
+        types, _, open_schema = cls._schema()
+        kwargs = {name: value for name, value in data.items() if name in types}
+        if open_schema:
+            kwargs["extra"] = {name: value for name, value in data.items() if name not in types}
+        return cls(**kwargs)
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the stored layout (extra fields are merged back in)"""
+        data = {}
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            if field.name == "extra":
+                data.update(value)
+            elif value is not None or field.default is not None:
+                data[field.name] = value
+        return data
+
+
+@struct
+class FeedbackEntry(Struct):
+    id: str
+    type: str
+    timestamp: str
+    text: str = ""
+    user: str = "Anonymous"
+
+
+@struct
+class AuditEntry(Struct):
+    timestamp: str
+    action: str
+    document_id: Optional[str]
+    user_name: str
+    user_role: str
+    details: str = ""
+    ip_address: str = "localhost"
+
+
+@struct
+class DocumentSchema(Struct):
+    """Stored document; fields added by later features are kept in 'extra'"""
+    id: str
+    filename: str
+    file_type: str
+    upload_date: str
+    uploaded_by: str
+    uploader_role: str
+    document_type: str
+    summary: str
+    classification_confidence: float = 0.0
+    action_items: List[str] = dataclasses.field(default_factory=list)
+    deadlines: List[Any] = dataclasses.field(default_factory=list)
+    risks: List[str] = dataclasses.field(default_factory=list)
+    priority: str = "Medium"
+    language: str = "unknown"
+    text_stats: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    key_information: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    file_path: str = ""
+    tags: List[str] = dataclasses.field(default_factory=list)
+    status: str = "Active"
+    version: int = 1
+    permissions: Optional[Dict[str, List[str]]] = None
+    feedback: Optional[List[Dict[str, Any]]] = None
+    extra: Dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+def check_store(data_dir: Path = DATA_DIR) -> Dict[str, List[str]]:
+    """
+    Validate every stored record
+
+    Returns:
+        Problems keyed by '<file>#<record id or index>'
+    """
+    data_dir = Path(data_dir)
+    report = {}
+    documents_file = data_dir / "documents.json"
+    if documents_file.exists():
+        for index, document in enumerate(load_file(documents_file)):
+            key = f"documents.json#{document.get('id', index) if isinstance(document, dict) else index}"
+            problems = DocumentSchema.problems(document)
+            for position, entry in enumerate((document.get("feedback") or []) if isinstance(document, dict) else []):
+                problems += [f"feedback[{position}]: {problem}" for problem in FeedbackEntry.problems(entry)]
+            if problems:
+                report[key] = problems
+    audit_file = data_dir / "audit_log.json"
+    if audit_file.exists():
+        for index, entry in enumerate(load_file(audit_file)):
+            problems = AuditEntry.problems(entry)
+            if problems:
+                report[f"audit_log.json#{index}"] = problems
+    return report
+
+
+def main(argv=None):
+    """CLI entry point: report the active backend and validate a data directory"""
+    parser = argparse.ArgumentParser(description="JSON codec information and schema checks")
+    parser.add_argument("--check", type=Path, metavar="DATA_DIR", help="Validate the records in a data directory")
+    args = parser.parse_args(argv)
+
+    print(f"JSON backend: {resolve_backend()} (configured: {JSON_BACKEND})")
+    if args.check is None:
+        return 0
+    report = check_store(args.check)
+    for key, problems in report.items():
+        print(f"{key}: " + "; ".join(problems))
+    print(f"{len(report)} record(s) with schema problems" if report else "All records match their schemas")
+    return 1 if report else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Asyncio (ASGI) variant of the MetroVivaram real-time alert server
+Runs socketio.AsyncServer under uvicorn as its own process, consuming the
+alert broker with an asyncio subscriber. Clients see the same events as
+with the eventlet server (real_time_alert, system_status,
+system_status_delta, subscription_confirmed, connection_established).
+
+    METRO_ALERT_SERVICE_MODE=external python -m modules.socketio_asgi
+    METRO_ALERT_SERVICE_MODE=external uvicorn --factory modules.socketio_asgi:create_app --port 8502
+"""
+import argparse
+import asyncio
+import inspect
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import socketio
+
+from config import ALERT_BROKER_URL, ALERT_SERVICE_STATUS_INTERVAL, SOCKETIO_PORT, STATIC_DIR
+from modules.alert_broker import create_async_subscriber, write_service_status
+from modules.alert_history import get_alert_history
+from modules.serialization import socketio_json
+from modules.socketio_server import (MetroSocketIOServer, SystemStatusSnapshot,
+                                     missed_alert_payloads, record_alert)
+
+# Optional ASGI web server
+try:
+    import uvicorn
+    UVICORN_AVAILABLE = True
+except ImportError:
+    UVICORN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+async def _maybe_await(result):
+    """Room helpers are coroutines in newer python-socketio releases only"""
+    if inspect.isawaitable(result):
+        await result
+
+
+class MetroAsyncSocketIOServer:
+    """AsyncServer counterpart of MetroSocketIOServer, fed by the alert broker"""
+
+    def __init__(self, broker_url: str = ALERT_BROKER_URL):
+        self.sio = socketio.AsyncServer(
+            cors_allowed_origins=["http://localhost:8501", "http://127.0.0.1:8501", "*"],
+            cors_credentials=True,
+            async_mode='asgi',
+            json=socketio_json,
+            logger=False,
+            engineio_logger=False
+        )
+        self.app = socketio.ASGIApp(self.sio, static_files={'/static': str(STATIC_DIR)},
+                                    on_startup=self.startup, on_shutdown=self.shutdown)
+
+        self.connected_clients: Dict[str, Dict] = {}
+        self.status_snapshot = SystemStatusSnapshot()
+        self.history = get_alert_history()
+        self.subscriber = create_async_subscriber(self.handle_broker_message, broker_url)
+        self._status_task = None
+
+        self._register_events()
+
+    def _register_events(self):
+        """Register all Socket.IO event handlers"""
+
+        @self.sio.event
+        async def connect(sid, environ, auth):
+            """Handle client connection"""
+            logger.debug(f"Client {sid} connected")
+            self.connected_clients[sid] = {
+                'connected_at': datetime.now().isoformat(),
+                'user_info': auth if auth else {},
+                'subscriptions': []
+            }
+            await self.sio.emit('connection_established', {
+                'message': 'Connected to MetroVivaram real-time alerts',
+                'timestamp': datetime.now().isoformat(),
+                'client_id': sid
+            }, room=sid)
+            await self._send_system_status(sid)
+
+        @self.sio.event
+        async def disconnect(sid):
+            """Handle client disconnection"""
+            logger.debug(f"Client {sid} disconnected")
+            self.connected_clients.pop(sid, None)
+
+        @self.sio.event
+        async def subscribe_to_alerts(sid, data):
+            """Subscribe client to specific alert types"""
+            alert_types = data.get('alert_types', [])
+            user_role = data.get('user_role', 'viewer')
+
+            client = self.connected_clients.get(sid)
+            if client is None:
+                return
+
+            for room in client.get('rooms', []):
+                await _maybe_await(self.sio.leave_room(sid, room))
+            rooms = [MetroSocketIOServer._role_room(user_role)]
+            for alert_type in alert_types:
+                rooms.append(MetroSocketIOServer._alert_room(alert_type))
+                rooms.append(MetroSocketIOServer._alert_room(alert_type, user_role))
+            for room in rooms:
+                await _maybe_await(self.sio.enter_room(sid, room))
+
+            client['subscriptions'] = alert_types
+            client['rooms'] = rooms
+            client['user_info']['role'] = user_role
+
+            await self.sio.emit('subscription_confirmed', {
+                'subscribed_to': alert_types,
+                'message': f'Subscribed to {len(alert_types)} alert types',
+                'latest_alert_id': self.history.latest_id
+            }, room=sid)
+
+            for payload in missed_alert_payloads(self.history, data.get('last_alert_id'), alert_types, user_role):
+                await self.sio.emit('real_time_alert', payload, room=sid)
+
+        @self.sio.event
+        async def request_system_status(sid, data):
+            """Send current system status to requesting client"""
+            await self._send_system_status(sid)
+
+    async def _send_system_status(self, sid: str):
+        """Send current system status to a specific client"""
+        try:
+            status = self.status_snapshot.as_dict()
+            status['connected_clients'] = len(self.connected_clients)
+            status['timestamp'] = datetime.now().isoformat()
+            await self.sio.emit('system_status', status, room=sid)
+        except Exception as e:
+            logger.warning(f"Error sending system status: {e}")
+
+    async def emit_alert(self, alert_type: str, data: Dict, target_roles: Optional[List[str]] = None):
+        """Emit a real-time alert to subscribed clients (see MetroSocketIOServer.emit_alert)"""
+        alert_payload = record_alert(self.history, alert_type, data, target_roles)
+        if target_roles is None:
+            await self.sio.emit('real_time_alert', alert_payload, room=MetroSocketIOServer._alert_room(alert_type))
+        else:
+            for role in target_roles:
+                await self.sio.emit('real_time_alert', alert_payload,
+                                    room=MetroSocketIOServer._alert_room(alert_type, role))
+
+    async def handle_database_event(self, event: str, payload: Dict):
+        """Update the status snapshot and broadcast only the fields that changed"""
+        if event != 'document_saved':
+            return
+        changes = self.status_snapshot.apply_document(payload['document'])
+        if changes:
+            changes['timestamp'] = datetime.now().isoformat()
+            await self.sio.emit('system_status_delta', changes)
+
+    async def handle_broker_message(self, message: Dict):
+        """Route one broker message published by a Streamlit worker"""
+        kind = message.get('kind')
+        if kind == 'alert':
+            await self.emit_alert(message['alert_type'], message.get('data', {}), message.get('target_roles'))
+        elif kind == 'db_event':
+            await self.handle_database_event(message['event'], message.get('payload', {}))
+        else:
+            logger.warning(f"Ignoring unknown broker message kind: {kind}")
+
+    async def _report_status(self):
+        """Periodically publish the client count for the Streamlit workers"""
+        while True:
+            try:
+                write_service_status(len(self.connected_clients))
+            except OSError as e:
+                logger.warning(f"Could not write alert service status: {e}")
+            await asyncio.sleep(ALERT_SERVICE_STATUS_INTERVAL)
+
+    async def startup(self):
+        """ASGI lifespan startup: load the status snapshot and start consuming the broker"""
+        loop = asyncio.get_running_loop()
+        try:
+            # The initial corpus scan is blocking file I/O; keep it off the event loop
+            await loop.run_in_executor(None, self.status_snapshot.ensure_loaded)
+        except Exception as e:
+            logger.warning(f"Could not preload system status: {e}")
+        await self.subscriber.start()
+        self._status_task = asyncio.ensure_future(self._report_status())
+
+    async def shutdown(self):
+        """ASGI lifespan shutdown"""
+        if self._status_task is not None:
+            self._status_task.cancel()
+        await self.subscriber.close()
+
+    def get_connected_clients_count(self) -> int:
+        """Get number of connected clients"""
+        return len(self.connected_clients)
+
+
+def create_app(broker_url: str = ALERT_BROKER_URL):
+    """ASGI application factory for uvicorn"""
+    return MetroAsyncSocketIOServer(broker_url).app
+
+
+def main(argv=None):
+    """CLI entry point for the ASGI alert server"""
+    parser = argparse.ArgumentParser(description="Run the MetroVivaram real-time alert server under uvicorn")
+    parser.add_argument("--host", default="localhost", help="Interface for Socket.IO clients")
+    parser.add_argument("--port", type=int, default=SOCKETIO_PORT, help="Socket.IO port")
+    parser.add_argument("--broker-url", default=ALERT_BROKER_URL, help="unix:///path or redis://host:port/db")
+    args = parser.parse_args(argv)
+
+    if not UVICORN_AVAILABLE:
+        print("uvicorn is required for the ASGI alert server: pip install uvicorn")
+        return 1
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    uvicorn.run(create_app(args.broker_url), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
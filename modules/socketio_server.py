@@ -3,32 +3,168 @@ Real-time Socket.IO server for MetroVivaram Document Management System
 Handles real-time alerts and notifications between server and clients
 """
 import socketio
-import eventlet
 import threading
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List, Optional
 import json
+import logging
+from config import SOCKETIO_PORT, ALERT_HISTORY_EXCLUDED_TYPES, ALERT_REPLAY_MAX_ALERTS, STATIC_DIR
+from modules.alert_history import get_alert_history
+from modules.serialization import socketio_json
+
+logger = logging.getLogger(__name__)
+
+# Management roles that receive feedback and user activity alerts
+FEEDBACK_ALERT_ROLES = ['HR', 'Compliance Officer']
+
+
+class SystemStatusSnapshot:
+    """
+    In-memory system status maintained from DocumentDatabase write events
+
+    The corpus is scanned once (streamed) on first use; afterwards each
+    write adjusts the counters, so reading the status is O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        # doc_id -> (priority, upload day) for the current version of each document
+        self._documents: Dict[str, tuple] = {}
+        self._uploads_by_day: Counter = Counter()
+        self.total_documents = 0
+        self.high_priority_documents = 0
+
+    @staticmethod
+    def _key(document: Dict) -> tuple:
+        return document.get('priority'), document.get('upload_date', '')[:10]
+
+    def ensure_loaded(self, db=None):
+        """Build the snapshot with a single streamed pass over the corpus"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if db is None:
+                from modules.resources import get_database
+                db = get_database()
+            for chunk in db.iter_documents():
+                for document in chunk:
+                    self._add(document.get('id'), self._key(document))
+            self._loaded = True
+
+    def _add(self, doc_id: str, key: tuple):
+        priority, upload_day = key
+        self._documents[doc_id] = key
+        self.total_documents += 1
+        if priority == 'High':
+            self.high_priority_documents += 1
+        self._uploads_by_day[upload_day] += 1
+
+    def _remove(self, doc_id: str):
+        priority, upload_day = self._documents.pop(doc_id)
+        self.total_documents -= 1
+        if priority == 'High':
+            self.high_priority_documents -= 1
+        self._uploads_by_day[upload_day] -= 1
+        if self._uploads_by_day[upload_day] <= 0:
+            del self._uploads_by_day[upload_day]
+
+    def apply_document(self, document: Dict) -> Dict:
+        """
+        Apply a saved (new, re-versioned or restored) document
+
+        Returns:
+            Dictionary of status fields whose values changed
+        """
+        with self._lock:
+            if not self._loaded:
+                # The initial scan will pick this document up
+                return {}
+            before = self._counts()
+            doc_id = document.get('id')
+            if doc_id in self._documents:
+                self._remove(doc_id)
+            self._add(doc_id, self._key(document))
+            after = self._counts()
+        return {key: value for key, value in after.items() if before.get(key) != value}
+
+    def _counts(self) -> Dict:
+        return {
+            'total_documents': self.total_documents,
+            'high_priority_documents': self.high_priority_documents,
+            'uploads_today': self._uploads_by_day.get(datetime.now().strftime('%Y-%m-%d'), 0)
+        }
+
+    def as_dict(self) -> Dict:
+        """Current status counters"""
+        with self._lock:
+            return self._counts()
+
+
+def record_alert(history, alert_type: str, data: Dict, target_roles: Optional[List[str]] = None) -> Dict:
+    """
+    Build the real_time_alert payload, persisting it in the alert history
+
+    Returns:
+        Payload whose 'id' is the history id (a string id for unrecorded types)
+    """
+    if alert_type in ALERT_HISTORY_EXCLUDED_TYPES:
+        return {
+            'type': alert_type,
+            'data': data,
+            'timestamp': datetime.now().isoformat(),
+            'id': f"{alert_type}_{datetime.now().timestamp()}"
+        }
+    record = history.append(alert_type, data, target_roles)
+    return {'type': alert_type, 'data': data, 'timestamp': record['timestamp'], 'id': record['id']}
+
+
+def missed_alert_payloads(history, last_alert_id, alert_types: List[str], role: str) -> List[Dict]:
+    """Payloads for the alerts a reconnecting client missed, oldest first"""
+    if not isinstance(last_alert_id, int) or isinstance(last_alert_id, bool):
+        return []
+    return [
+        {'type': entry['type'], 'data': entry['data'], 'timestamp': entry['timestamp'],
+         'id': entry['id'], 'replayed': True}
+        for entry in history.since(last_alert_id, alert_types, role, limit=ALERT_REPLAY_MAX_ALERTS)
+    ]
+
 
 class MetroSocketIOServer:
     """Socket.IO server for real-time alerts and notifications"""
     
-    def __init__(self, port: int = 8502):
+    def __init__(self, port: int = SOCKETIO_PORT):
         self.port = port
         # Create Socket.IO server with enhanced CORS configuration for Streamlit integration
         self.sio = socketio.Server(
             cors_allowed_origins=["http://localhost:8501", "http://127.0.0.1:8501", "*"],
             cors_credentials=True,
             async_mode='eventlet',
+            json=socketio_json,
             logger=False,  # Reduce logging to avoid conflicts
             engineio_logger=False
         )
         
-        # Wrap with WSGI app
-        self.app = socketio.WSGIApp(self.sio)
+        # Wrap with WSGI app; also serves the hashed theme assets from static/
+        self.app = socketio.WSGIApp(self.sio, static_files={'/static': str(STATIC_DIR)})
         
         # Store connected clients and their info
         self.connected_clients: Dict[str, Dict] = {}
         
+        # Status counters kept current by database write events
+        self.status_snapshot = SystemStatusSnapshot()
+        
+        # Persistent alert history for replay on reconnect
+        self.history = get_alert_history()
+        try:
+            from modules.database import register_write_listener
+            register_write_listener(self.handle_database_event)
+        except ImportError as e:
+            print(f"Socket.IO server: database events unavailable - {e}")
+        
         # Register event handlers
         self._register_events()
         
@@ -71,51 +207,89 @@ class MetroSocketIOServer:
             user_role = data.get('user_role', 'viewer')
             
             if sid in self.connected_clients:
-                self.connected_clients[sid]['subscriptions'] = alert_types
-                self.connected_clients[sid]['user_info']['role'] = user_role
+                client = self.connected_clients[sid]
+                
+                # Swap room memberships so targeted emits become room broadcasts
+                for room in client.get('rooms', []):
+                    self.sio.leave_room(sid, room)
+                rooms = [self._role_room(user_role)]
+                for alert_type in alert_types:
+                    rooms.append(self._alert_room(alert_type))
+                    rooms.append(self._alert_room(alert_type, user_role))
+                for room in rooms:
+                    self.sio.enter_room(sid, room)
+                
+                client['subscriptions'] = alert_types
+                client['rooms'] = rooms
+                client['user_info']['role'] = user_role
                 
                 self.sio.emit('subscription_confirmed', {
                     'subscribed_to': alert_types,
-                    'message': f'Subscribed to {len(alert_types)} alert types'
+                    'message': f'Subscribed to {len(alert_types)} alert types',
+                    'latest_alert_id': self.history.latest_id
                 }, room=sid)
                 
+                # Replay whatever the client missed while disconnected
+                for payload in missed_alert_payloads(self.history, data.get('last_alert_id'), alert_types, user_role):
+                    self.sio.emit('real_time_alert', payload, room=sid)
+                
         @self.sio.event
         def request_system_status(sid, data):
             """Send current system status to requesting client"""
             self._send_system_status(sid)
             
+    @staticmethod
+    def _role_room(role: str) -> str:
+        """Room containing every client of a role"""
+        return f"role:{role}"
+        
+    @staticmethod
+    def _alert_room(alert_type: str, role: Optional[str] = None) -> str:
+        """Room of clients subscribed to an alert type, optionally narrowed to one role"""
+        if role is None:
+            return f"alert:{alert_type}"
+        return f"alert:{alert_type}|role:{role}"
+        
     def _send_system_status(self, sid: str):
         """Send current system status to a specific client"""
-        from modules.database import DocumentDatabase
-        
         try:
-            db = DocumentDatabase()
-            documents = db.load_data()
-            
-            # Get system metrics
-            total_docs = len(documents)
-            high_priority = len([d for d in documents if d.get('priority') == 'High'])
-            recent_uploads = len([d for d in documents if d.get('upload_date', '').startswith(datetime.now().strftime('%Y-%m-%d'))])
-            
-            status = {
-                'total_documents': total_docs,
-                'high_priority_documents': high_priority,
-                'uploads_today': recent_uploads,
-                'connected_clients': len(self.connected_clients),
-                'timestamp': datetime.now().isoformat()
-            }
+            self.status_snapshot.ensure_loaded()
+            status = self.status_snapshot.as_dict()
+            status['connected_clients'] = len(self.connected_clients)
+            status['timestamp'] = datetime.now().isoformat()
             
             self.sio.emit('system_status', status, room=sid)
             
         except Exception as e:
             print(f"Error sending system status: {e}")
             
+    def handle_database_event(self, event: str, payload: Dict):
+        """Update the status snapshot and broadcast only the fields that changed"""
+        if event != 'document_saved':
+            return
+        changes = self.status_snapshot.apply_document(payload['document'])
+        if changes:
+            changes['timestamp'] = datetime.now().isoformat()
+            self.sio.emit('system_status_delta', changes)
+            
+    def serve_forever(self, host: str = 'localhost'):
+        """Run the Socket.IO server in the current thread (blocks)"""
+        # Imported here so the ASGI server can share this module without eventlet
+        import eventlet
+        import eventlet.wsgi
+        try:
+            # Warm the status snapshot so client connects never scan the corpus
+            self.status_snapshot.ensure_loaded()
+        except Exception as e:
+            print(f"Could not preload system status: {e}")
+        print(f"Starting Socket.IO server on port {self.port}...")
+        eventlet.wsgi.server(eventlet.listen((host, self.port)), self.app)
+        
     def start_server(self):
         """Start the Socket.IO server in a separate thread"""
         def run_server():
             try:
-                print(f"Starting Socket.IO server on port {self.port}...")
-                eventlet.wsgi.server(eventlet.listen(('localhost', self.port)), self.app)
+                self.serve_forever()
             except Exception as e:
                 print(f"Socket.IO server error: {e}")
                 
@@ -132,31 +306,23 @@ class MetroSocketIOServer:
         Args:
             alert_type: Type of alert (document_upload, feedback_received, priority_alert, etc.)
             data: Alert data to send
-            target_roles: List of user roles to send alert to (None = all clients)
+            target_roles: List of user roles to send alert to (None = all subscribers)
         """
-        alert_payload = {
-            'type': alert_type,
-            'data': data,
-            'timestamp': datetime.now().isoformat(),
-            'id': f"{alert_type}_{datetime.now().timestamp()}"
-        }
+        alert_payload = record_alert(self.history, alert_type, data, target_roles)
         
-        # Send to all clients or filtered by role
+        # One room broadcast per alert (or per targeted role); only subscribers receive it
         if target_roles is None:
-            # Send to all connected clients
-            self.sio.emit('real_time_alert', alert_payload)
-            print(f"Alert '{alert_type}' sent to all {len(self.connected_clients)} clients")
+            self.sio.emit('real_time_alert', alert_payload, room=self._alert_room(alert_type))
+            logger.debug(f"Alert '{alert_type}' sent to subscribers")
         else:
-            # Send to specific roles only
-            for sid, client_info in self.connected_clients.items():
-                client_role = client_info.get('user_info', {}).get('role', 'viewer')
-                if client_role in target_roles:
-                    self.sio.emit('real_time_alert', alert_payload, room=sid)
-            print(f"Alert '{alert_type}' sent to clients with roles: {target_roles}")
+            for role in target_roles:
+                self.sio.emit('real_time_alert', alert_payload, room=self._alert_room(alert_type, role))
+            logger.debug(f"Alert '{alert_type}' sent to subscribers with roles: {target_roles}")
             
-    def emit_document_upload_alert(self, document_data: Dict, uploader_info: Dict):
-        """Emit alert for new document upload"""
-        alert_data = {
+    @staticmethod
+    def build_document_upload_alert(document_data: Dict, uploader_info: Dict) -> Dict:
+        """Build the alert data for a new document upload"""
+        return {
             'document_id': document_data.get('id'),
             'filename': document_data.get('filename'),
             'document_type': document_data.get('document_type'),
@@ -166,11 +332,10 @@ class MetroSocketIOServer:
             'message': f"New {document_data.get('priority', 'Medium').lower()} priority document uploaded: {document_data.get('filename')}"
         }
         
-        self.emit_alert('document_upload', alert_data)
-        
-    def emit_feedback_alert(self, document_id: str, feedback_data: Dict, document_name: str):
-        """Emit alert for new feedback submission"""
-        alert_data = {
+    @staticmethod
+    def build_feedback_alert(document_id: str, feedback_data: Dict, document_name: str) -> Dict:
+        """Build the alert data for a new feedback submission"""
+        return {
             'document_id': document_id,
             'document_name': document_name,
             'feedback_type': feedback_data.get('type'),
@@ -179,12 +344,10 @@ class MetroSocketIOServer:
             'message': f"New {feedback_data.get('type')} feedback received for {document_name}"
         }
         
-        # Send to management roles (HR and Compliance Officer)
-        self.emit_alert('feedback_received', alert_data, target_roles=['HR', 'Compliance Officer'])
-        
-    def emit_priority_alert(self, document_data: Dict):
-        """Emit alert for high priority documents"""
-        alert_data = {
+    @staticmethod
+    def build_priority_alert(document_data: Dict) -> Dict:
+        """Build the alert data for a high priority document"""
+        return {
             'document_id': document_data.get('id'),
             'filename': document_data.get('filename'),
             'document_type': document_data.get('document_type'),
@@ -192,7 +355,19 @@ class MetroSocketIOServer:
             'message': f"HIGH PRIORITY: {document_data.get('filename')} requires immediate attention"
         }
         
-        self.emit_alert('priority_alert', alert_data)
+    def emit_document_upload_alert(self, document_data: Dict, uploader_info: Dict):
+        """Emit alert for new document upload"""
+        self.emit_alert('document_upload', self.build_document_upload_alert(document_data, uploader_info))
+        
+    def emit_feedback_alert(self, document_id: str, feedback_data: Dict, document_name: str):
+        """Emit alert for new feedback submission"""
+        # Send to management roles (HR and Compliance Officer)
+        self.emit_alert('feedback_received', self.build_feedback_alert(document_id, feedback_data, document_name),
+                        target_roles=FEEDBACK_ALERT_ROLES)
+        
+    def emit_priority_alert(self, document_data: Dict):
+        """Emit alert for high priority documents"""
+        self.emit_alert('priority_alert', self.build_priority_alert(document_data))
         
     def emit_system_metric_update(self, metrics: Dict):
         """Emit system metrics update"""
@@ -220,14 +395,14 @@ class MetroSocketIOServer:
 # Global instance
 socketio_server = None
 
-def get_socketio_server(port: int = 8502) -> MetroSocketIOServer:
+def get_socketio_server(port: int = SOCKETIO_PORT) -> MetroSocketIOServer:
     """Get or create the global Socket.IO server instance"""
     global socketio_server
     if socketio_server is None:
         socketio_server = MetroSocketIOServer(port)
     return socketio_server
 
-def start_socketio_server(port: int = 8502):
+def start_socketio_server(port: int = SOCKETIO_PORT):
     """Start the Socket.IO server"""
     server = get_socketio_server(port)
     return server.start_server()
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Static asset pipeline for the MetroVivaram theme and real-time client
+Sources in assets/ are minified once per process. Role colour variants are
+generated from config.ROLE_THEMES, and every file is written to static/
+under a content hash so browsers can cache it indefinitely.
+
+    python -m modules.static_assets    # prebuild static/ at deploy time
+"""
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import (ASSETS_DIR, STATIC_DIR, ROLE_THEMES, DEFAULT_THEME,
+                    THEME_ASSET_MODE, STATIC_ASSET_BASE_URL, SOCKETIO_CLIENT_URL)
+
+SOCKETIO_CDN_URL = "https://cdn.socket.io/4.0.0/socket.io.min.js"
+
+ROOT_TEMPLATE = """:root {{
+    --material-primary: {primary};
+    --material-on-primary: #1C1B1F;
+    --material-secondary: {secondary};
+    --material-accent: {accent};
+    --material-background: #181A20;
+    --material-surface: #23242B;
+    --material-surface-variant: {surface_variant};
+    --material-outline: #79747E;
+    --material-error: #CF6679;
+    --material-radius: 20px;
+    --material-elevation: 0 2px 8px 0 rgba(187,134,252,0.10);
+    --material-font: 'Google Sans', 'Roboto', 'Arial', sans-serif;
+}}"""
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js: str) -> str:
+    """Drop indentation, blank lines and whole-line comments (strings are left untouched)"""
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if line and not line.startswith("//"):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def role_slug(role: Optional[str]) -> str:
+    """File-name friendly role name ('default' when no role theme applies)"""
+    if not role or role not in ROLE_THEMES:
+        return "default"
+    return re.sub(r"[^a-z0-9]+", "-", role.lower()).strip("-")
+
+
+def _hashed_name(stem: str, suffix: str, content: str) -> str:
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:10]
+    return f"{stem}.{digest}{suffix}"
+
+
+@lru_cache(maxsize=None)
+def _compiled_assets() -> Dict[str, str]:
+    """Logical asset name -> minified content, built once per process"""
+    assets = {
+        "theme.css": minify_css((ASSETS_DIR / "theme.css").read_text(encoding="utf-8")),
+        "realtime_alerts.js": minify_js(
+            (ASSETS_DIR / "realtime_alerts.js").read_text(encoding="utf-8").replace("__SOCKETIO_URL__", SOCKETIO_CLIENT_URL)
+        ),
+    }
+    for role, theme in [(None, DEFAULT_THEME)] + list(ROLE_THEMES.items()):
+        assets[f"theme-{role_slug(role)}.css"] = minify_css(ROOT_TEMPLATE.format(**theme))
+    return assets
+
+
+@lru_cache(maxsize=None)
+def build_assets(static_dir: Path = STATIC_DIR) -> Dict[str, str]:
+    """
+    Write every asset to static_dir under a content-hashed name
+
+    Returns:
+        Manifest mapping logical names (e.g. 'theme-hr.css') to hashed file names
+    """
+    static_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for name, content in _compiled_assets().items():
+        stem, suffix = Path(name).stem, Path(name).suffix
+        hashed = _hashed_name(stem, suffix, content)
+        target = static_dir / hashed
+        if not target.exists():
+            target.write_text(content, encoding="utf-8")
+        manifest[name] = hashed
+    (static_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def asset_url(name: str) -> str:
+    """Public URL of a hashed static asset"""
+    return f"{STATIC_ASSET_BASE_URL}/{build_assets()[name]}"
+
+
+@lru_cache(maxsize=None)
+def get_theme_html(user_role: Optional[str] = None) -> str:
+    """Markup applying the role theme: <link> tags, or one inline <style> block"""
+    role_sheet = f"theme-{role_slug(user_role)}.css"
+    if THEME_ASSET_MODE == "linked":
+        return (f'<link rel="stylesheet" href="{escape(asset_url(role_sheet))}">'
+                f'<link rel="stylesheet" href="{escape(asset_url("theme.css"))}">')
+    assets = _compiled_assets()
+    return f"<style>{assets[role_sheet]}{assets['theme.css']}</style>"
+
+
+@lru_cache(maxsize=None)
+def get_realtime_client_html() -> str:
+    """Markup loading the Socket.IO client and the real-time alert handlers"""
+    if THEME_ASSET_MODE == "linked":
+        script = f'<script src="{escape(asset_url("realtime_alerts.js"))}"></script>'
+    else:
+        script = f"<script>{_compiled_assets()['realtime_alerts.js']}</script>"
+    return f'<script src="{SOCKETIO_CDN_URL}"></script>{script}'
+
+
+def main(argv=None):
+    """CLI entry point: prebuild the hashed assets"""
+    manifest = build_assets()
+    for name, hashed in sorted(manifest.items()):
+        print(f"{name:28s} -> {STATIC_DIR.name}/{hashed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
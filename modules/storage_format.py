@@ -0,0 +1,184 @@
+"""
+Compact on-disk schema for the document store
+Feedback entries keep their text and author once ('text', 'user') instead of
+under three and two legacy names, and documents only store 'permissions'
+when they differ from the default every-role grant. The accessors read both
+the compact and the legacy layout, so older files keep working until they
+are migrated:
+
+    python -m modules.storage_format --data-dir data --dry-run
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config import DATA_DIR, USER_ROLES
+
+PERMISSION_ACTIONS = ("view", "edit", "approve", "delete")
+DEFAULT_PERMISSIONS = {action: list(USER_ROLES) for action in PERMISSION_ACTIONS}
+
+# Legacy field names, in order of preference
+FEEDBACK_TEXT_FIELDS = ("text", "content", "text_feedback")
+FEEDBACK_USER_FIELDS = ("user", "user_name")
+
+
+def feedback_text(entry: Dict) -> str:
+    """Comment text of a feedback entry ('' for likes/dislikes without text)"""
+    for field in FEEDBACK_TEXT_FIELDS:
+        if entry.get(field):
+            return entry[field]
+    return ""
+
+
+def feedback_user(entry: Dict) -> str:
+    """Name of the user who left a feedback entry"""
+    for field in FEEDBACK_USER_FIELDS:
+        if entry.get(field):
+            return entry[field]
+    return "Anonymous"
+
+
+def compact_feedback(entry: Dict) -> Dict:
+    """Feedback entry in the compact layout: id, type, text, timestamp, user"""
+    return {
+        "id": entry.get("id"),
+        "type": entry.get("type", "unknown"),
+        "text": feedback_text(entry),
+        "timestamp": entry.get("timestamp", ""),
+        "user": feedback_user(entry),
+    }
+
+
+def document_permissions(document: Dict) -> Dict[str, List[str]]:
+    """Effective permissions of a document (the default grant when none are stored)"""
+    return document.get("permissions") or DEFAULT_PERMISSIONS
+
+
+def _is_default_permissions(permissions: Optional[Dict]) -> bool:
+    if not permissions:
+        return True
+    return (set(permissions) == set(PERMISSION_ACTIONS) and
+            all(set(permissions[action]) == set(USER_ROLES) for action in PERMISSION_ACTIONS))
+
+
+def compact_document(document: Dict) -> Dict:
+    """Copy of a stored document in the compact layout"""
+    compact = dict(document)
+    if _is_default_permissions(compact.get("permissions")):
+        compact.pop("permissions", None)
+    if compact.get("feedback"):
+        compact["feedback"] = [compact_feedback(entry) for entry in compact["feedback"]]
+    return compact
+
+
+def _best_ms(func: Callable, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_format(data, repeat: int = 3, indent: Optional[int] = None, backend: Optional[str] = None) -> Dict:
+    """
+    Size, parse time and (atomic) write time of data in one JSON layout
+
+    Args:
+        data: Records to encode
+        repeat: Timing runs (fastest is kept)
+        indent: None for compact JSON
+        backend: JSON backend (default: the configured one)
+
+    Returns:
+        Dict with 'bytes', 'parse_ms' and 'write_ms'
+    """
+    from modules.json_store import atomic_write_json
+    from modules.serialization import loads
+    with tempfile.TemporaryDirectory(prefix="metro_format_") as tmp:
+        path = Path(tmp) / "sample.json"
+        write_ms = _best_ms(lambda: atomic_write_json(path, data, indent=indent, backend=backend), repeat)
+        raw = path.read_bytes()
+    parse_ms = _best_ms(lambda: loads(raw, backend=backend), repeat)
+    return {"bytes": len(raw), "parse_ms": parse_ms, "write_ms": write_ms}
+
+
+def migrate(data_dir: Path = DATA_DIR, dry_run: bool = False, repeat: int = 3) -> List[Dict]:
+    """
+    Rewrite documents.json, audit_log.json and versions/ in the compact layout
+
+    Args:
+        data_dir: Database directory
+        dry_run: Only measure; leave the files untouched
+        repeat: Timing runs per measurement (fastest is kept)
+
+    Returns:
+        One report per file group with 'before' and 'after' measurements
+    """
+    from modules.database import DocumentDatabase
+    from modules.json_store import atomic_write_json
+    from modules.serialization import load_file
+
+    db = DocumentDatabase(data_dir=data_dir)
+    legacy = {"indent": 2, "backend": "json"}  # The original pretty-printed stdlib layout
+    reports = []
+
+    documents = db.documents_store.load()
+    compact_documents = [compact_document(doc) for doc in documents]
+    reports.append({"file": db.db_file.name, "records": len(documents),
+                    "before": measure_format(documents, repeat, **legacy),
+                    "after": measure_format(compact_documents, repeat)})
+
+    audit_log = db.audit_store.load()
+    reports.append({"file": db.audit_file.name, "records": len(audit_log),
+                    "before": measure_format(audit_log, repeat, **legacy),
+                    "after": measure_format(audit_log, repeat)})
+
+    version_files = sorted(f for f in db.version_dir.glob("*.json") if f.stat().st_size) if db.version_dir.exists() else []
+    versions = [load_file(f) for f in version_files]
+    compact_versions = [compact_document(version) for version in versions]
+    reports.append({"file": f"{db.version_dir.name}/*.json", "records": len(versions),
+                    "before": measure_format(versions, repeat, **legacy),
+                    "after": measure_format(compact_versions, repeat)})
+
+    if not dry_run:
+        def apply(current):
+            current[:] = [compact_document(doc) for doc in current]
+        db.documents_store.update(apply)
+        db.audit_store.update(lambda current: None)  # Re-encode only
+        for path, version in zip(version_files, compact_versions):
+            atomic_write_json(path, version)
+    return reports
+
+
+def main(argv=None):
+    """CLI entry point: migrate a data directory to the compact layout"""
+    parser = argparse.ArgumentParser(description="Migrate the JSON document store to the compact layout")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="Report sizes and timings without rewriting")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per measurement (fastest is kept)")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    reports = migrate(args.data_dir, args.dry_run, args.repeat)
+    for report in reports:
+        before, after = report["before"], report["after"]
+        saved = 1 - after["bytes"] / before["bytes"] if before["bytes"] else 0.0
+        print(f"{report['file']:18s} {report['records']:>7d} records  "
+              f"size {before['bytes']:>10,d} -> {after['bytes']:>10,d} B ({saved:.0%} smaller)  "
+              f"parse {before['parse_ms']:7.2f} -> {after['parse_ms']:7.2f} ms  "
+              f"write {before['write_ms']:7.2f} -> {after['write_ms']:7.2f} ms")
+    print("Dry run: no files changed" if args.dry_run else f"Migrated {args.data_dir}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(reports, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,17 @@
-from transformers import pipeline
+from modules.metrics import span, timed
+
 
 class DocumentSummarizer:
     def __init__(self):
         print("Inside summarizer init")
-        self.summarizer = pipeline(
-            "summarization",
-            model="sshleifer/distilbart-cnn-12-6",
-            device_map="auto"
-        )
+        # transformers (and torch) take seconds to import; only pay for it when summarising
+        from transformers import pipeline
+        with span("summarize.model_load"):
+            self.summarizer = pipeline(
+                "summarization",
+                model="sshleifer/distilbart-cnn-12-6",
+                device_map="auto"
+            )
 
     def chunk_text(self, text, max_chars=2000):  # Larger chunks for better context
         sentences = text.split('. ')
@@ -23,6 +27,7 @@ class DocumentSummarizer:
             chunks.append(current_chunk.strip())
         return chunks
 
+    @timed("summarize")
     def get_document_insights(self, text, doc_type, filename):
         if not text:
             return {
@@ -38,7 +43,8 @@ class DocumentSummarizer:
 
         for chunk in chunks:
             # Very aggressive summarization - much shorter output
-            result = self.summarizer(chunk, max_length=25, min_length=10, do_sample=False)
+            with span("summarize.chunk"):
+                result = self.summarizer(chunk, max_length=25, min_length=10, do_sample=False)
             raw_summary = result[0]['summary_text'] if result else ""
             if raw_summary.strip():
                 summaries.append(f"• {raw_summary.strip()}")
@@ -0,0 +1,267 @@
+"""
+Periodic system performance snapshots for the admin page
+A daemon thread samples process memory and CPU, OCR throughput, summariser
+latency, cache hit rates, database file sizes, Socket.IO clients and queue
+depths every SYSTEM_METRICS_INTERVAL seconds, and pushes each snapshot to
+admin roles as a 'system_metrics' alert. psutil is used when installed.
+"""
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import DATA_DIR, ADMIN_ROLES, SYSTEM_METRICS_INTERVAL, SYSTEM_METRICS_VERSIONS_SCAN_INTERVAL
+from modules.lazy import lazy_import, module_available
+from modules.metrics import get_metrics, SPAN_METRIC
+from modules.resources import get_registry
+
+psutil = lazy_import('psutil')
+PSUTIL_AVAILABLE = module_available('psutil')
+
+# Memoised functions whose hit rates are reported: (module, function)
+CACHED_FUNCTIONS = [
+    ("modules.static_assets", "get_theme_html"),
+    ("modules.static_assets", "get_realtime_client_html"),
+    ("modules.pdf_text", "get_pdf_text_backend"),
+    ("modules.lazy", "module_importable"),
+]
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (0 when it cannot be read)"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Peak, not current
+    except ImportError:
+        return 0
+
+
+_dir_sizes: Dict[Path, tuple] = {}  # Directory -> (monotonic time of the walk, bytes)
+_dir_sizes_lock = threading.Lock()
+
+
+def _dir_size(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(entry.stat().st_size for entry in path.rglob("*") if entry.is_file())
+
+
+def cached_dir_size(path: Path, max_age: float = SYSTEM_METRICS_VERSIONS_SCAN_INTERVAL) -> int:
+    """
+    Total size of a directory tree, walked at most once per max_age seconds
+
+    The version store holds one file per document version, so walking it on
+    every metrics sample would stat the whole catalogue every few seconds.
+    """
+    path = Path(path)
+    cached = _dir_sizes.get(path)
+    if cached is not None and time.monotonic() - cached[0] < max_age:
+        return cached[1]
+    with _dir_sizes_lock:
+        cached = _dir_sizes.get(path)
+        if cached is None or time.monotonic() - cached[0] >= max_age:
+            cached = _dir_sizes[path] = (time.monotonic(), _dir_size(path))
+        return cached[1]
+
+
+def database_file_sizes(data_dir: Path = DATA_DIR) -> Dict[str, int]:
+    """Sizes in bytes of the JSON database files and the version store (refreshed every few minutes)"""
+    data_dir = Path(data_dir)
+    sizes = {}
+    for name, path in (("documents", data_dir / "documents.json"), ("audit_log", data_dir / "audit_log.json")):
+        sizes[name] = path.stat().st_size if path.exists() else 0
+    sizes["versions"] = cached_dir_size(data_dir / "versions")
+    return sizes
+
+
+def cache_hit_rates() -> Dict[str, Dict]:
+    """Hits, misses and hit rate of the resource registry and memoised functions"""
+    caches = {}
+    registry_stats = get_registry().get_stats()
+    caches["resources"] = {"hits": registry_stats["hits"], "misses": registry_stats["misses"]}
+    for module_name, func_name in CACHED_FUNCTIONS:
+        module = sys.modules.get(module_name)  # Never import a module just to report on it
+        func = getattr(module, func_name, None) if module else None
+        if func is None or not hasattr(func, "cache_info"):
+            continue
+        info = func.cache_info()
+        caches[func_name] = {"hits": info.hits, "misses": info.misses}
+    for stats in caches.values():
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return caches
+
+
+def _span_counts() -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for row in get_metrics().span_summary():
+        counts[row["span"]] = counts.get(row["span"], 0) + row["count"]
+    return counts
+
+
+def _alert_stats() -> Dict:
+    """Socket.IO client count and alert dispatch queue depth (if alerts are running)"""
+    try:
+        from modules.alert_manager import get_alert_manager
+    except ImportError:
+        return {"available": False, "connected_clients": 0, "queue_depth": 0}
+    info = get_alert_manager().get_connection_info()
+    return {
+        "available": info.get("available", False),
+        "connected_clients": info.get("connected_clients", 0),
+        "queue_depth": info.get("dispatch", {}).get("queue_depth", 0),
+    }
+
+
+class SystemMetricsPublisher:
+    """Samples system metrics on a timer and pushes them to admin clients"""
+
+    def __init__(self, interval: float = SYSTEM_METRICS_INTERVAL, target_roles: Optional[List[str]] = None):
+        """
+        Args:
+            interval: Seconds between snapshots
+            target_roles: Roles receiving the 'system_metrics' alert (default: ADMIN_ROLES)
+        """
+        self.interval = interval
+        self.target_roles = list(target_roles or ADMIN_ROLES)
+        self.latest: Optional[Dict] = None
+        self._previous = None  # (monotonic time, cpu seconds, span counts) of the last sample
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if PSUTIL_AVAILABLE:
+            self._process = psutil.Process()
+            self._process.cpu_percent(None)  # First call only sets the baseline
+
+    def _cpu_percent(self, now: float, cpu_seconds: float) -> float:
+        if PSUTIL_AVAILABLE:
+            return self._process.cpu_percent(None)
+        if self._previous is None or now <= self._previous[0]:
+            return 0.0
+        return (cpu_seconds - self._previous[1]) / (now - self._previous[0]) * 100
+
+    def collect(self) -> Dict:
+        """
+        Take one snapshot
+
+        Returns:
+            Dict with 'process', 'ocr', 'summarizer', 'caches', 'database',
+            'realtime' and 'queues' sections
+        """
+        registry = get_metrics()
+        now = time.monotonic()
+        times = os.times()
+        cpu_seconds = times.user + times.system
+        counts = _span_counts()
+
+        with self._lock:
+            cpu_percent = self._cpu_percent(now, cpu_seconds)
+            previous = self._previous
+            self._previous = (now, cpu_seconds, counts)
+
+        def per_minute(span_name: str) -> float:
+            if previous is None or now <= previous[0]:
+                return 0.0
+            delta = counts.get(span_name, 0) - previous[2].get(span_name, 0)
+            return max(delta, 0) / (now - previous[0]) * 60
+
+        summarize = registry.histogram_percentiles(SPAN_METRIC, span="summarize")
+        ocr_pool = get_registry().peek("ocr_pool")
+        pool_stats = ocr_pool.get_stats() if ocr_pool is not None else {}
+        alerts = _alert_stats()
+
+        snapshot = {
+            "timestamp": datetime.now().isoformat(),
+            "interval_seconds": self.interval,
+            "process": {
+                "rss_mb": _rss_bytes() / (1024 * 1024),
+                "cpu_percent": cpu_percent,
+                "threads": threading.active_count(),
+                "psutil": PSUTIL_AVAILABLE,
+            },
+            "ocr": {
+                "documents_total": counts.get("ocr.process_document", 0),
+                "documents_per_minute": per_minute("ocr.process_document"),
+                "images_per_minute": per_minute("ocr.tesseract"),
+                "engine": pool_stats.get("engine"),
+                "avg_call_ms": pool_stats.get("avg_ms", 0.0),
+            },
+            "summarizer": {
+                "count": summarize["count"],
+                "p50_ms": summarize["p50"] * 1000,
+                "p95_ms": summarize["p95"] * 1000,
+                "p99_ms": summarize["p99"] * 1000,
+            },
+            "caches": cache_hit_rates(),
+            "database": database_file_sizes(),
+            "realtime": {"available": alerts["available"], "connected_clients": alerts["connected_clients"]},
+            "queues": {
+                "alert_dispatch": alerts["queue_depth"],
+                "ocr_waiting": pool_stats.get("waiting", 0),
+                "ocr_in_flight": pool_stats.get("in_flight", 0),
+            },
+        }
+        snapshot["message"] = (f"RSS {snapshot['process']['rss_mb']:.0f} MB, CPU {cpu_percent:.0f}%, "
+                               f"OCR queue {snapshot['queues']['ocr_waiting']}")
+        self.latest = snapshot
+        return snapshot
+
+    def publish(self) -> Dict:
+        """Collect a snapshot and push it as a 'system_metrics' alert"""
+        snapshot = self.collect()
+        try:
+            from modules.alert_manager import get_alert_manager
+            get_alert_manager().send_system_metrics_update(snapshot, target_roles=self.target_roles)
+        except ImportError:
+            pass  # Real-time alerts not installed; the page still shows the latest snapshot
+        except Exception as e:
+            print(f"Error publishing system metrics: {e}")
+        return snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.publish()
+
+    def start(self):
+        """Start publishing in a daemon thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.collect()  # Baseline for rates and the page's first render
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="system-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+
+# Global instance
+_publisher = None
+_publisher_lock = threading.Lock()
+
+def get_system_metrics_publisher() -> SystemMetricsPublisher:
+    """Get or create the global publisher"""
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            _publisher = SystemMetricsPublisher()
+        return _publisher
+
+def start_system_metrics_publisher() -> SystemMetricsPublisher:
+    """Start the global publisher once per process"""
+    publisher = get_system_metrics_publisher()
+    publisher.start()
+    return publisher
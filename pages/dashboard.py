@@ -4,8 +4,12 @@ Enhanced role-based dashboard page with improved UI
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from modules.database import DocumentDatabase
-from config import USER_ROLES
+from modules.resources import get_database, get_ocr_processor, get_summarizer
+from modules.exporter import DocumentExporter, build_document_filter, MIME_TYPES
+from modules.bulk_download import DocumentZipBuilder, resolve_document_path
+from modules.analytics import get_analytics_snapshot
+from modules.ocr_layout import load_layouts, layouts_text, highlight_matches
+from config import ALERT_HISTORY_UPLOAD_EVENT, USER_ROLES, EXPORT_FORMATS, EXPORT_DIR, UI_DOWNLOAD_MAX_SIZE
 from datetime import datetime, timedelta
 
 # Optional real-time alerts
@@ -45,38 +49,40 @@ def show_dashboard_page(user_info):
     </div>
     """, unsafe_allow_html=True)
     try:
-        db = DocumentDatabase()
+        db = get_database()
         # Get ALL documents first, then apply filters - not just role-based
-        all_documents = db.load_data()  # Load all documents from database
+        all_documents = db.load_records()  # Load all documents (compact read-only records)
         user_documents = all_documents  # Show all documents by default
         
         # Notification Section
         st.markdown("""
-        <div class="feature-section" style="margin-bottom:2rem;">
-            <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+        <div class="feature-section">
+            <h3 class="metro-section-title">
                 <span style="margin-right:0.5rem;">🔔</span>System Notifications
             </h3>
         </div>
         """, unsafe_allow_html=True)
         
         # Apply role-based access control for actions, but show all documents
-        accessible_documents = db.get_documents_by_role(user_info['role'])  # For action permissions
+        accessible_documents = db.get_documents_by_role(user_info['role'], all_documents)  # For action permissions
         
         # --- In-app Notifications ---
-        if 'last_seen_upload' not in st.session_state:
-            st.session_state['last_seen_upload'] = ''
+        if 'last_seen_alert_id' not in st.session_state:
+            st.session_state['last_seen_alert_id'] = 0
         
-        # Check for new uploads across the system
-        new_uploads_all = [doc for doc in all_documents if doc['upload_date'] > st.session_state['last_seen_upload']]
+        # Count new uploads from the alert history instead of rescanning every document;
+        # the database records every upload there, whether or not real-time alerts are running
+        alert_history = db.get_alert_history()
+        new_upload_count = alert_history.count_since(st.session_state['last_seen_alert_id'], ALERT_HISTORY_UPLOAD_EVENT)
         # Check for high priority documents user can access
         high_priority_accessible = [doc for doc in accessible_documents if doc.get('priority') == 'High']
         
-        if new_uploads_all:
-            st.markdown(f"<div class='stCard' style='background:var(--material-surface-variant);color:var(--material-primary);margin-bottom:1em;padding:1rem;border-radius:var(--material-radius);border:1px solid var(--material-outline);'>🔔 <b>{len(new_uploads_all)} new document(s)</b> uploaded to the system since your last visit.</div>", unsafe_allow_html=True)
-            st.session_state['last_seen_upload'] = max(doc['upload_date'] for doc in new_uploads_all)
+        if new_upload_count:
+            st.markdown(f"<div class='stCard metro-notice metro-notice-info'>🔔 <b>{new_upload_count} new document(s)</b> uploaded to the system since your last visit.</div>", unsafe_allow_html=True)
+        st.session_state['last_seen_alert_id'] = alert_history.latest_id
         
         if high_priority_accessible:
-            st.markdown(f"<div class='stCard' style='background:var(--material-surface-variant);color:#CF6679;margin-bottom:1em;padding:1rem;border-radius:var(--material-radius);border:1px solid var(--material-outline);'>⚠️ <b>{len(high_priority_accessible)} high-priority document(s)</b> require your attention (accessible to your role).</div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='stCard metro-notice metro-notice-danger'>⚠️ <b>{len(high_priority_accessible)} high-priority document(s)</b> require your attention (accessible to your role).</div>", unsafe_allow_html=True)
 
         # --- Expiry and Review Reminders ---
         today = datetime.now().date()
@@ -84,14 +90,14 @@ def show_dashboard_page(user_info):
         upcoming_expiry = [doc for doc in accessible_documents if doc.get('expiry_date') and doc['expiry_date'] != 'None' and datetime.strptime(doc['expiry_date'], '%Y-%m-%d').date() <= today + timedelta(days=7)]
         upcoming_review = [doc for doc in accessible_documents if doc.get('review_date') and doc['review_date'] != 'None' and datetime.strptime(doc['review_date'], '%Y-%m-%d').date() <= today + timedelta(days=7)]
         if upcoming_expiry:
-            st.markdown(f"<div class='stCard' style='background:var(--material-surface-variant);color:#FF9800;margin-bottom:1em;padding:1rem;border-radius:var(--material-radius);border:1px solid var(--material-outline);'>⏰ <b>{len(upcoming_expiry)} document(s)</b> expiring within 7 days (that you can access).</div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='stCard metro-notice metro-notice-warning'>⏰ <b>{len(upcoming_expiry)} document(s)</b> expiring within 7 days (that you can access).</div>", unsafe_allow_html=True)
         if upcoming_review:
-            st.markdown(f"<div class='stCard' style='background:var(--material-surface-variant);color:#4CAF50;margin-bottom:1em;padding:1rem;border-radius:var(--material-radius);border:1px solid var(--material-outline);'>🔄 <b>{len(upcoming_review)} document(s)</b> due for review within 7 days (that you can access).</div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='stCard metro-notice metro-notice-success'>🔄 <b>{len(upcoming_review)} document(s)</b> due for review within 7 days (that you can access).</div>", unsafe_allow_html=True)
 
         # Document Overview Section
         st.markdown("""
-        <div class="feature-section" style="margin-bottom:2rem;">
-            <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+        <div class="feature-section">
+            <h3 class="metro-section-title">
                 <span style="margin-right:0.5rem;">📈</span>Document Overview
             </h3>
         </div>
@@ -115,20 +121,20 @@ def show_dashboard_page(user_info):
         # Material UI inspired metrics - show system-wide stats
         col1, col2 = st.columns(2)
         with col1:
-            st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:24px 16px 16px 16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+            st.markdown(f"<div class='stCard metro-card metro-card-roomy'>"
                         f"<div style='font-size:2.2rem;font-weight:600;color:var(--material-primary);'>📄 {len(all_documents)}</div>"
                         f"<div style='color:#FFFFFF;font-size:1.1rem;'>Total System Documents</div></div>", unsafe_allow_html=True)
         with col2:
             high_priority_all = len([doc for doc in all_documents if doc.get('priority') == 'High'])
-            st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:24px 16px 16px 16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+            st.markdown(f"<div class='stCard metro-card metro-card-roomy'>"
                         f"<div style='font-size:2.2rem;font-weight:600;color:#CF6679;'>⚠️ {high_priority_all}</div>"
                         f"<div style='color:#FFFFFF;font-size:1.1rem;'>High Priority Documents</div></div>", unsafe_allow_html=True)
 
         # Document Preview Section
         if all_documents:
             st.markdown("""
-            <div class="feature-section" style="margin-bottom:2rem;">
-                <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+            <div class="feature-section">
+                <h3 class="metro-section-title">
                     <span style="margin-right:0.5rem;">📖</span>Recent Documents
                 </h3>
             </div>
@@ -187,8 +193,8 @@ def show_dashboard_page(user_info):
         
         if user_role in management_roles:
             st.markdown("""
-            <div class="feature-section" style="margin-bottom:2rem;">
-                <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:0.5rem;display:flex;align-items:center;">
+            <div class="feature-section">
+                <h3 class="metro-section-title metro-compact">
                     <span style="margin-right:0.5rem;">📊</span>Feedback Analytics
                 </h3>
                 <p style="color:#888;font-size:0.9rem;margin-bottom:1.5rem;">🔒 Management view - Detailed feedback analytics and insights</p>
@@ -196,24 +202,25 @@ def show_dashboard_page(user_info):
             """, unsafe_allow_html=True)
             
             try:
-                feedback_analytics = db.get_feedback_analytics()
+                analytics = get_analytics_snapshot(db)  # Columnar feedback stats shared by all sessions (None without pandas)
+                feedback_analytics = analytics.feedback_summary() if analytics is not None else db.get_feedback_analytics()
                 if feedback_analytics['total_feedback'] > 0:
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
-                        st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+                        st.markdown(f"<div class='stCard metro-card'>"
                                     f"<div style='font-size:1.8rem;font-weight:600;color:var(--material-primary);'>💬 {feedback_analytics['total_feedback']}</div>"
                                     f"<div style='color:#FFFFFF;font-size:0.9rem;'>Total Feedback</div></div>", unsafe_allow_html=True)
                     with col2:
-                        st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+                        st.markdown(f"<div class='stCard metro-card'>"
                                     f"<div style='font-size:1.8rem;font-weight:600;color:#4CAF50;'>👍 {feedback_analytics['likes']}</div>"
                                     f"<div style='color:#FFFFFF;font-size:0.9rem;'>Likes</div></div>", unsafe_allow_html=True)
                     with col3:
-                        st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+                        st.markdown(f"<div class='stCard metro-card'>"
                                     f"<div style='font-size:1.8rem;font-weight:600;color:#FF5722;'>👎 {feedback_analytics['dislikes']}</div>"
                                     f"<div style='color:#FFFFFF;font-size:0.9rem;'>Dislikes</div></div>", unsafe_allow_html=True)
                     with col4:
                         satisfaction_rate = round((feedback_analytics['likes'] / (feedback_analytics['likes'] + feedback_analytics['dislikes']) * 100), 1) if (feedback_analytics['likes'] + feedback_analytics['dislikes']) > 0 else 0
-                        st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+                        st.markdown(f"<div class='stCard metro-card'>"
                                     f"<div style='font-size:1.8rem;font-weight:600;color:#FF9800;'>📈 {satisfaction_rate}%</div>"
                                     f"<div style='color:#FFFFFF;font-size:0.9rem;'>Satisfaction Rate</div></div>", unsafe_allow_html=True)
                     
@@ -226,7 +233,8 @@ def show_dashboard_page(user_info):
                             </h4>
                         </div>
                         """, unsafe_allow_html=True)
-                        recent_feedback = db.get_recent_feedback_with_text(limit=5)
+                        recent_feedback = (analytics.recent_text_feedback(limit=5) if analytics is not None
+                                           else db.get_recent_feedback_with_text(limit=5))
                         for feedback in recent_feedback:
                             doc = next((d for d in all_documents if d['id'] == feedback['document_id']), None)
                             doc_name = doc['filename'] if doc else f"Document ID: {feedback['document_id']}"
@@ -240,8 +248,8 @@ def show_dashboard_page(user_info):
                                     <strong style='color:var(--material-primary);'>{doc_name}</strong>
                                     <span style='margin-left:auto;color:#666;font-size:0.8rem;'>{feedback['timestamp'][:19]}</span>
                                 </div>
-                                <div style='color:#FFFFFF;font-style:italic;margin-left:28px;'>"{feedback['text_feedback']}"</div>
-                                <div style='color:#888;font-size:0.8rem;margin-left:28px;margin-top:4px;'>by {feedback['user_name']}</div>
+                                <div style='color:#FFFFFF;font-style:italic;margin-left:28px;'>"{feedback['text']}"</div>
+                                <div style='color:#888;font-size:0.8rem;margin-left:28px;margin-top:4px;'>by {feedback['user']}</div>
                             </div>
                             """, unsafe_allow_html=True)
                 else:
@@ -251,8 +259,8 @@ def show_dashboard_page(user_info):
         else:
             # Limited view for non-management roles
             st.markdown("""
-            <div class="feature-section" style="margin-bottom:2rem;">
-                <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:0.5rem;display:flex;align-items:center;">
+            <div class="feature-section">
+                <h3 class="metro-section-title metro-compact">
                     <span style="margin-right:0.5rem;">📊</span>Feedback Status
                 </h3>
                 <p style="color:#888;font-size:0.9rem;margin-bottom:1.5rem;">👥 User view - Basic feedback information</p>
@@ -260,18 +268,19 @@ def show_dashboard_page(user_info):
             """, unsafe_allow_html=True)
             
             try:
-                feedback_analytics = db.get_feedback_analytics()
+                analytics = get_analytics_snapshot(db)
+                feedback_analytics = analytics.feedback_summary() if analytics is not None else db.get_feedback_analytics()
                 if feedback_analytics['total_feedback'] > 0:
                     # Show only basic satisfaction rate for non-management users
                     satisfaction_rate = round((feedback_analytics['likes'] / (feedback_analytics['likes'] + feedback_analytics['dislikes']) * 100), 1) if (feedback_analytics['likes'] + feedback_analytics['dislikes']) > 0 else 0
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+                        st.markdown(f"<div class='stCard metro-card'>"
                                     f"<div style='font-size:1.8rem;font-weight:600;color:var(--material-primary);'>💬 {feedback_analytics['total_feedback']}</div>"
                                     f"<div style='color:#FFFFFF;font-size:0.9rem;'>Total Feedback</div></div>", unsafe_allow_html=True)
                     with col2:
-                        st.markdown(f"<div class='stCard' style='background:var(--material-surface);border-radius:20px;padding:16px;box-shadow:var(--material-elevation);margin-bottom:16px;border:1px solid var(--material-outline);'>"
+                        st.markdown(f"<div class='stCard metro-card'>"
                                     f"<div style='font-size:1.8rem;font-weight:600;color:#FF9800;'>📈 {satisfaction_rate}%</div>"
                                     f"<div style='color:#FFFFFF;font-size:0.9rem;'>Satisfaction Rate</div></div>", unsafe_allow_html=True)
                     
@@ -299,22 +308,9 @@ def show_dashboard_page(user_info):
         # Tag filter (optional)
         tag = st.text_input("Tag", "", key="filter_tag")
 
-        # Filter logic
-        filtered_docs = user_documents
-        if search_query:
-            filtered_docs = [doc for doc in filtered_docs if search_query.lower() in (doc.get('summary','') + doc.get('filename','') + doc.get('document_type','')).lower()]
-        if uploader:
-            filtered_docs = [doc for doc in filtered_docs if uploader.lower() in doc.get('uploaded_by','').lower()]
-        if doc_type:
-            filtered_docs = [doc for doc in filtered_docs if doc_type.lower() in doc.get('document_type','').lower()]
-        if priority:
-            filtered_docs = [doc for doc in filtered_docs if doc.get('priority','') == priority]
-        if tag:
-            filtered_docs = [doc for doc in filtered_docs if tag.lower() in ' '.join(doc.get('tags',[])).lower()]
-        if date_from:
-            filtered_docs = [doc for doc in filtered_docs if doc.get('upload_date','')[:10] >= str(date_from)]
-        if date_to:
-            filtered_docs = [doc for doc in filtered_docs if doc.get('upload_date','')[:10] <= str(date_to)]
+        # Filter logic (single pass, shared with the streaming exporter)
+        document_filter = build_document_filter(search_query, uploader, doc_type, priority, tag, date_from, date_to)
+        filtered_docs = [doc for doc in user_documents if document_filter(doc)] if document_filter else user_documents
 
         if filtered_docs:
             table_data = []
@@ -334,8 +330,8 @@ def show_dashboard_page(user_info):
             st.dataframe(table_data, use_container_width=True, hide_index=True)
             # --- Download and Export Options ---
             st.markdown("""
-            <div class="feature-section" style="margin-top:2rem;">
-                <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+            <div class="feature-section metro-spaced-top">
+                <h3 class="metro-section-title">
                     <span style="margin-right:0.5rem;">📥</span>Download & Export
                 </h3>
             </div>
@@ -345,6 +341,33 @@ def show_dashboard_page(user_info):
             downloadable_docs = filtered_docs
             
             if downloadable_docs:
+                # One archive for everything matching the current filters
+                if st.button(f"🗜️ Prepare ZIP of all {len(downloadable_docs)} matching documents", key="bulk_zip_btn"):
+                    zip_cli = "python -m modules.bulk_download --output audit.zip (with --type/--priority/--from/--to filters)"
+                    try:
+                        # Most uploads are stored uncompressed, so the source size is a close lower bound
+                        source_bytes = sum(path.stat().st_size for path in map(resolve_document_path, downloadable_docs) if path)
+                        if source_bytes > UI_DOWNLOAD_MAX_SIZE:
+                            st.warning(f"The matching files total {source_bytes / (1024 * 1024):.0f} MB, above the "
+                                       f"{UI_DOWNLOAD_MAX_SIZE // (1024 * 1024)} MB browser download limit. "
+                                       f"Narrow the filters or run `{zip_cli}` on the server.")
+                            zip_stats = None
+                        else:
+                            with st.spinner("Building archive from disk..."):
+                                zip_path, zip_stats = DocumentZipBuilder().build(downloadable_docs)
+                            offer_file_download(
+                                zip_path,
+                                label=f"📦 Download ZIP ({zip_stats['files']} files, {zip_stats['archive_bytes'] / (1024 * 1024):.1f} MB)",
+                                file_name=f"documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                                mime="application/zip",
+                                key="bulk_zip_download",
+                                cli_command=zip_cli
+                            )
+                        if zip_stats and zip_stats['missing_files']:
+                            st.warning(f"{zip_stats['missing_files']} file(s) were missing on disk; their metadata is still included.")
+                    except Exception as e:
+                        st.error(f"Could not build ZIP archive: {str(e)}")
+
                 st.markdown("**Available Downloads** (universal access):")
                 for doc in downloadable_docs:
                     file_path = doc.get('file_path')
@@ -360,21 +383,28 @@ def show_dashboard_page(user_info):
             else:
                 st.info("No documents available for download.")
                 
-            # Export analytics/statistics as CSV
-            if st.button("Export Document Table as CSV", key="export_csv"):
-                import io
-                import csv
-                output = io.StringIO()
-                writer = csv.DictWriter(output, fieldnames=list(table_data[0].keys()) if table_data else [])
-                writer.writeheader()
-                writer.writerows(table_data)
-                st.download_button(
-                    label="Download CSV",
-                    data=output.getvalue(),
-                    file_name="documents_export.csv",
-                    mime="text/csv",
-                    key="download_csv_btn"
-                )
+            # Export the matching catalogue rows, streamed from storage in chunks
+            export_col1, export_col2 = st.columns([1, 2])
+            with export_col1:
+                export_format = st.selectbox("Export format", EXPORT_FORMATS, key="export_format")
+            with export_col2:
+                export_all = st.checkbox("Export the whole archive (ignore filters)", value=False, key="export_all")
+            if st.button("Export Document Table", key="export_csv"):
+                # Written to disk chunk by chunk, then handed to Streamlit as a file
+                export_path = EXPORT_DIR / f"documents_export_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.{export_format}"
+                try:
+                    result = DocumentExporter(db).export(export_format, export_path, None if export_all else document_filter)
+                    offer_file_download(
+                        export_path,
+                        label=f"Download {export_format.upper()} ({result['rows']} documents)",
+                        file_name=f"documents_export.{export_format}",
+                        mime=MIME_TYPES[export_format],
+                        key="download_csv_btn",
+                        cli_command=f"python -m modules.exporter --format {export_format}"
+                    )
+                except Exception as e:
+                    export_path.unlink(missing_ok=True)
+                    st.error(f"Export failed: {str(e)}")
         else:
             st.info("No documents found for the selected filters.")
 
@@ -388,9 +418,8 @@ def show_dashboard_page(user_info):
             if selected_label:
                 selected_doc = doc_options[selected_label]
                 if st.button("Summarize Selected Document", key="dashboard_summarize_btn"):
-                    from modules.summarizer import DocumentSummarizer
                     import os
-                    summarizer = DocumentSummarizer()
+                    summarizer = get_summarizer()
                     with st.spinner("Summarizing selected document (this may take a while)..."):
                         file_path = selected_doc.get("file_path")
                         extracted_text = ""
@@ -399,13 +428,17 @@ def show_dashboard_page(user_info):
                                 with open(file_path, "rb") as f:
                                     ext = os.path.splitext(file_path)[1].lower()
                                     fake_file = f
-                                    from modules.ocr_processor import OCRProcessor
+                                    ocr_processor = get_ocr_processor()
+                                    stored_layouts = load_layouts(selected_doc['id'])
                                     if ext == ".pdf":
-                                        extracted_text = OCRProcessor().extract_text_from_pdf(fake_file)
+                                        extracted_text = ocr_processor.extract_text_from_pdf(fake_file).get('text', '')
+                                    elif ext in [".jpg", ".jpeg", ".png", ".tiff"] and stored_layouts:
+                                        # Reuse the text recognised at upload instead of running OCR again
+                                        extracted_text = layouts_text(stored_layouts)
                                     elif ext in [".jpg", ".jpeg", ".png", ".tiff"]:
-                                        extracted_text = OCRProcessor().extract_text_from_image(fake_file)
+                                        extracted_text = ocr_processor.extract_text_from_image(fake_file).get('text', '')
                                     elif ext == ".docx":
-                                        extracted_text = OCRProcessor().extract_text_from_docx(fake_file)
+                                        extracted_text = ocr_processor.extract_text_from_docx(fake_file).get('text', '')
                                     elif ext == ".txt":
                                         extracted_text = f.read().decode("utf-8")
                             except Exception as e:
@@ -641,7 +674,7 @@ def show_dashboard_page(user_info):
                                                 </div>
                                             </div>
                                             <div style='display:flex;justify-content:space-between;align-items:center;color:rgba(255,255,255,0.8);font-size:0.8rem;'>
-                                                <span style='font-weight:500;'>👤 {feedback['user_name']}</span>
+                                                <span style='font-weight:500;'>👤 {feedback['user']}</span>
                                                 <span>🕒 {feedback['timestamp'][:19]}</span>
                                             </div>
                                         </div>
@@ -678,6 +711,32 @@ def show_dashboard_page(user_info):
     except Exception as e:
         st.error(f"Error loading dashboard: {str(e)}")
 
+def offer_file_download(path, label, file_name, mime, key, cli_command):
+    """
+    Download button for an export file written under EXPORT_DIR
+
+    Streamlit reads the file into memory once when the button is created, so
+    files above UI_DOWNLOAD_MAX_SIZE are refused with a pointer to the CLI,
+    which writes straight to disk. The file is removed either way.
+
+    Returns:
+        True if the download button was shown
+    """
+    from pathlib import Path
+    path = Path(path)
+    try:
+        size = path.stat().st_size
+        if size > UI_DOWNLOAD_MAX_SIZE:
+            st.warning(f"This export is {size / (1024 * 1024):.0f} MB, above the "
+                       f"{UI_DOWNLOAD_MAX_SIZE // (1024 * 1024)} MB browser download limit. "
+                       f"Narrow the filters or run `{cli_command}` on the server.")
+            return False
+        with open(path, "rb") as f:
+            st.download_button(label=label, data=f, file_name=file_name, mime=mime, key=key)
+        return True
+    finally:
+        path.unlink(missing_ok=True)
+
 def show_document_preview(doc):
     """Display document content preview in a modal-like expander"""
     from pathlib import Path
@@ -717,11 +776,35 @@ def show_document_preview(doc):
                     if doc.get('content'):
                         content_preview = doc['content'][:2000] + "..." if len(doc['content']) > 2000 else doc['content']
                         st.text_area("🔍 Stored Content:", content_preview, height=300, disabled=True)
+                
+                # Scanned pages: search the stored OCR layout line by line
+                layouts = load_layouts(doc['id'])
+                if layouts:
+                    query = st.text_input("🔎 Find text in scanned pages", key=f"highlight_{doc['id']}")
+                    if query.strip():
+                        matches = [line for layout in layouts for line in layout.find_lines(query)]
+                        for line in matches[:20]:
+                            st.markdown(f"- Page {line['page_num'] + 1}: {line['text']} "
+                                        f"<span style='opacity:0.6'>({line['confidence']:.0%})</span>", unsafe_allow_html=True)
+                        if not matches:
+                            st.info("No matches in the OCRed pages.")
             
             elif file_ext in ['.jpg', '.jpeg', '.png', '.tiff', '.bmp']:
-                # Display image
-                st.image(str(file_path), caption=doc['filename'], use_column_width=True)
-                if doc.get('content'):
+                # Display image, highlighting matches from the stored OCR layout
+                layouts = load_layouts(doc['id'])
+                query = st.text_input("🔎 Highlight text in image", key=f"highlight_{doc['id']}") if layouts else ""
+                if query.strip():
+                    from PIL import Image
+                    highlighted, matches = highlight_matches(Image.open(file_path), layouts[0], query)
+                    st.image(highlighted, caption=f"{doc['filename']} - {matches} match(es) for '{query}'", use_column_width=True)
+                else:
+                    st.image(str(file_path), caption=doc['filename'], use_column_width=True)
+                if layouts:
+                    st.caption(f"OCR word confidence: {layouts[0].mean_confidence:.1%} over {len(layouts[0])} words")
+                    content_preview = layouts_text(layouts)
+                    content_preview = content_preview[:1000] + "..." if len(content_preview) > 1000 else content_preview
+                    st.text_area("🔍 OCR Text:", content_preview, height=200, disabled=True)
+                elif doc.get('content'):
                     content_preview = doc['content'][:1000] + "..." if len(doc['content']) > 1000 else doc['content']
                     st.text_area("🔍 OCR Text:", content_preview, height=200, disabled=True)
             
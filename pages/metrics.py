@@ -0,0 +1,89 @@
+"""
+Pipeline metrics page (admin roles only)
+Per-stage timings, counters and recent spans from the in-process metrics
+registry, plus the address of the Prometheus endpoint.
+"""
+import time
+
+import streamlit as st
+from modules.metrics import get_metrics, metrics_server_address
+from config import ADMIN_ROLES
+
+
+def show_metrics_page(user_info):
+    st.markdown("""
+    <div class="main-header" style="background: var(--material-surface); padding: 1.5rem; border-radius: var(--material-radius); margin-bottom: 1rem; border: 1px solid var(--material-outline);">
+        <h2 style="color: var(--material-primary); margin-bottom: 0.5rem;">📈 Pipeline Metrics</h2>
+        <p style="color: #FFFFFF; margin: 0;">Per-stage timings for OCR, classification, summarisation and database writes</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if user_info.get('role') not in ADMIN_ROLES:
+        st.error("You don't have permission to view pipeline metrics.")
+        return
+
+    registry = get_metrics()
+    if not registry.enabled:
+        st.info("Metrics are disabled (METRO_METRICS_ENABLED=0).")
+        return
+
+    endpoint = metrics_server_address()
+    if endpoint:
+        st.caption(f"Prometheus endpoint: `{endpoint}`")
+    else:
+        st.caption("Prometheus endpoint is not running in this process.")
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("🔄 Refresh", use_container_width=True):
+            st.rerun()
+    with col2:
+        st.download_button("⬇️ Download snapshot", registry.render_prometheus(),
+                           file_name="metrovivaram_metrics.prom", mime="text/plain",
+                           use_container_width=True)
+
+    st.subheader("⏱️ Stage timings")
+    summary = registry.span_summary()
+    if summary:
+        table = []
+        for row in summary:
+            labels = ", ".join(f"{key}={value}" for key, value in row['labels'].items())
+            table.append({
+                'Stage': row['span'],
+                'Labels': labels,
+                'Calls': row['count'],
+                'Errors': int(row['errors']),
+                'Total (ms)': round(row['total_ms'], 1),
+                'Mean (ms)': round(row['mean_ms'], 1),
+                'p50 (ms)': round(row['p50_ms'], 1),
+                'p95 (ms)': round(row['p95_ms'], 1),
+                'p99 (ms)': round(row['p99_ms'], 1),
+            })
+        st.dataframe(table, use_container_width=True, hide_index=True)
+    else:
+        st.info("No stages have been timed yet. Upload or summarise a document to collect timings.")
+
+    st.subheader("🔢 Counters")
+    counters = registry.counters()
+    if counters:
+        st.dataframe([{
+            'Metric': counter['name'],
+            'Labels': ", ".join(f"{key}={value}" for key, value in counter['labels'].items()),
+            'Value': counter['value'],
+        } for counter in counters], use_container_width=True, hide_index=True)
+    else:
+        st.info("No counters recorded yet.")
+
+    st.subheader("🧾 Recent spans")
+    recent = registry.recent_spans(limit=50)
+    if recent:
+        st.dataframe([{
+            'Time': time.strftime('%H:%M:%S', time.localtime(entry['started_at'])),
+            'Stage': entry['span'],
+            'Parent': entry['parent'] or '',
+            'Labels': ", ".join(f"{key}={value}" for key, value in entry['labels'].items()),
+            'Duration (ms)': round(entry['ms'], 1),
+            'Status': entry['status'],
+        } for entry in recent], use_container_width=True, hide_index=True)
+    else:
+        st.info("No spans recorded yet.")
@@ -0,0 +1,109 @@
+"""
+System performance page (admin roles only)
+Shows the latest snapshot from the system metrics publisher; the panel then
+updates itself from the 'system_metrics' alerts pushed over Socket.IO, so the
+page never polls the server.
+"""
+import json
+
+import streamlit as st
+import streamlit.components.v1 as components
+from modules.system_metrics import get_system_metrics_publisher, PSUTIL_AVAILABLE
+from modules.static_assets import SOCKETIO_CDN_URL
+from config import ADMIN_ROLES, SOCKETIO_CLIENT_URL
+
+PANEL_HEIGHT = 620
+
+PANEL_TEMPLATE = """
+<style>
+    body { font-family: 'Google Sans', 'Roboto', 'Arial', sans-serif; color: #FFFFFF; background: transparent; margin: 0; }
+    .grid { display: grid; grid-template-columns: repeat(4, 1fr); gap: 12px; margin-bottom: 16px; }
+    .card { background: #23242B; border: 1px solid #79747E; border-radius: 12px; padding: 12px; }
+    .label { font-size: 12px; color: #BB86FC; text-transform: uppercase; letter-spacing: 0.5px; }
+    .value { font-size: 22px; font-weight: 600; margin-top: 4px; }
+    .sub { font-size: 12px; opacity: 0.7; margin-top: 2px; }
+    table { width: 100%; border-collapse: collapse; font-size: 13px; }
+    th, td { text-align: left; padding: 6px 8px; border-bottom: 1px solid #3a3a44; }
+    th { color: #BB86FC; font-weight: 500; }
+    .status { font-size: 12px; opacity: 0.7; margin-bottom: 8px; }
+</style>
+<div class="status" id="status">Snapshot from the server</div>
+<div class="grid" id="cards"></div>
+<div class="grid" style="grid-template-columns: 1fr 1fr;">
+    <div class="card"><div class="label">Cache hit rates</div><table id="caches"></table></div>
+    <div class="card"><div class="label">Database files</div><table id="database"></table></div>
+</div>
+<script src="__SOCKETIO_CDN__"></script>
+<script>
+    const fmt = (value, digits) => Number(value || 0).toFixed(digits);
+    const bytes = (value) => {
+        const units = ['B', 'KB', 'MB', 'GB'];
+        let i = 0;
+        while (value >= 1024 && i < units.length - 1) { value /= 1024; i++; }
+        return `${fmt(value, i ? 1 : 0)} ${units[i]}`;
+    };
+    const card = (label, value, sub) =>
+        `<div class="card"><div class="label">${label}</div><div class="value">${value}</div><div class="sub">${sub || ''}</div></div>`;
+
+    function render(m, live) {
+        document.getElementById('cards').innerHTML = [
+            card('Memory (RSS)', `${fmt(m.process.rss_mb, 0)} MB`, `${m.process.threads} threads`),
+            card('CPU', `${fmt(m.process.cpu_percent, 0)}%`, m.process.psutil ? 'psutil' : 'os.times'),
+            card('OCR throughput', `${fmt(m.ocr.documents_per_minute, 1)}/min`,
+                 `${fmt(m.ocr.images_per_minute, 1)} images/min, ${m.ocr.documents_total} total`),
+            card('OCR engine', m.ocr.engine || 'not loaded', `${fmt(m.ocr.avg_call_ms, 0)} ms per call`),
+            card('Summariser p50', `${fmt(m.summarizer.p50_ms, 0)} ms`, `${m.summarizer.count} summaries`),
+            card('Summariser p95 / p99', `${fmt(m.summarizer.p95_ms, 0)} / ${fmt(m.summarizer.p99_ms, 0)} ms`, ''),
+            card('Socket.IO clients', m.realtime.connected_clients, m.realtime.available ? 'alerts running' : 'alerts unavailable'),
+            card('Queue depth', m.queues.ocr_waiting + m.queues.alert_dispatch,
+                 `OCR ${m.queues.ocr_waiting} waiting, ${m.queues.ocr_in_flight} running; alerts ${m.queues.alert_dispatch}`),
+        ].join('');
+        document.getElementById('caches').innerHTML = '<tr><th>Cache</th><th>Hits</th><th>Misses</th><th>Hit rate</th></tr>' +
+            Object.entries(m.caches).map(([name, c]) =>
+                `<tr><td>${name}</td><td>${c.hits}</td><td>${c.misses}</td><td>${fmt(c.hit_rate * 100, 1)}%</td></tr>`).join('');
+        document.getElementById('database').innerHTML = '<tr><th>File</th><th>Size</th></tr>' +
+            Object.entries(m.database).map(([name, size]) => `<tr><td>${name}</td><td>${bytes(size)}</td></tr>`).join('');
+        document.getElementById('status').textContent =
+            `${live ? 'Live' : 'Snapshot'} · ${new Date(m.timestamp).toLocaleTimeString()} · every ${m.interval_seconds}s`;
+    }
+
+    render(__SNAPSHOT__, false);
+
+    try {
+        const socket = io('__SOCKETIO_URL__', { transports: ['polling', 'websocket'], reconnection: true });
+        socket.on('connect', () => socket.emit('subscribe_to_alerts', { alert_types: ['system_metrics'], user_role: '__ROLE__' }));
+        socket.on('real_time_alert', (alert) => { if (alert.type === 'system_metrics') render(alert.data, true); });
+    } catch (error) {
+        document.getElementById('status').textContent += ' · live updates unavailable';
+    }
+</script>
+"""
+
+
+def _json_for_script(data) -> str:
+    return json.dumps(data).replace("</", "<\\/")
+
+
+def show_performance_page(user_info):
+    st.markdown("""
+    <div class="main-header" style="background: var(--material-surface); padding: 1.5rem; border-radius: var(--material-radius); margin-bottom: 1rem; border: 1px solid var(--material-outline);">
+        <h2 style="color: var(--material-primary); margin-bottom: 0.5rem;">🖥️ System Performance</h2>
+        <p style="color: #FFFFFF; margin: 0;">Process, OCR, summariser, cache and queue metrics, pushed live over Socket.IO</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if user_info.get('role') not in ADMIN_ROLES:
+        st.error("You don't have permission to view system performance.")
+        return
+
+    publisher = get_system_metrics_publisher()
+    snapshot = publisher.latest or publisher.collect()
+    if not PSUTIL_AVAILABLE:
+        st.caption("psutil is not installed: CPU is estimated from process times and memory read from /proc.")
+
+    panel = (PANEL_TEMPLATE
+             .replace("__SOCKETIO_CDN__", SOCKETIO_CDN_URL)
+             .replace("__SOCKETIO_URL__", SOCKETIO_CLIENT_URL)
+             .replace("__ROLE__", user_info['role'].replace("'", "\\'"))
+             .replace("__SNAPSHOT__", _json_for_script(snapshot)))
+    components.html(panel, height=PANEL_HEIGHT, scrolling=True)
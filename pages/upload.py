@@ -4,10 +4,9 @@ Document upload page with enhanced OCR and multi-language support
 import streamlit as st
 import os
 from pathlib import Path
-from modules.ocr_processor import AdvancedOCRProcessor
-from modules.document_classifier import DocumentClassifier
-from modules.summarizer import DocumentSummarizer
-from modules.database import DocumentDatabase
+from modules.resources import get_database, get_ocr_processor, get_classifier, get_summarizer
+from modules.ocr_layout import save_layouts
+from modules.redaction import redact_sensitive
 from config import UPLOAD_DIR, MAX_FILE_SIZE
 
 # Optional real-time alerts
@@ -32,16 +31,16 @@ def show_upload_page(user_info):
     </div>
     """, unsafe_allow_html=True)
     
-    # Initialize processors
-    ocr_processor = AdvancedOCRProcessor()
-    classifier = DocumentClassifier()
-    db = DocumentDatabase()
+    # Shared processors, built once per process
+    ocr_processor = get_ocr_processor()
+    classifier = get_classifier()
+    db = get_database()
     summarizer = None  # Initialize only if needed
 
     # OCR Status Information
     st.markdown("""
-    <div class="feature-section" style="margin-bottom:2rem;">
-        <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+    <div class="feature-section">
+        <h3 class="metro-section-title">
             <span style="margin-right:0.5rem;">🔧</span>System Status
         </h3>
     """, unsafe_allow_html=True)
@@ -65,8 +64,8 @@ def show_upload_page(user_info):
 
     # Document Processing Configuration
     st.markdown("""
-    <div class="feature-section" style="margin-bottom:2rem;">
-        <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+    <div class="feature-section">
+        <h3 class="metro-section-title">
             <span style="margin-right:0.5rem;">🔍</span>Processing Options
         </h3>
     </div>
@@ -90,8 +89,8 @@ def show_upload_page(user_info):
 
     # File Upload Section
     st.markdown("""
-    <div class="feature-section" style="margin-bottom:2rem;">
-        <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+    <div class="feature-section">
+        <h3 class="metro-section-title">
             <span style="margin-right:0.5rem;">📁</span>Select Files
         </h3>
     </div>
@@ -106,8 +105,8 @@ def show_upload_page(user_info):
 
     # Batch Processing Configuration
     st.markdown("""
-    <div class="feature-section" style="margin-bottom:2rem;">
-        <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+    <div class="feature-section">
+        <h3 class="metro-section-title">
             <span style="margin-right:0.5rem;">⚙️</span>Batch Processing Options
         </h3>
         <p style="color:#625B71;margin-bottom:1.5rem;font-style:italic;">Settings applied to all selected files</p>
@@ -227,13 +226,6 @@ def show_upload_page(user_info):
                     classification = classifier.get_classification_details(extracted_text, uploaded_file.name)
                 
                 # Smart redaction for sensitive information
-                import re
-                def redact_sensitive(text):
-                    text = re.sub(r'[\w\.-]+@[\w\.-]+', '[REDACTED EMAIL]', text)
-                    text = re.sub(r'\b\d{10,13}\b', '[REDACTED PHONE]', text)
-                    text = re.sub(r'₹?\s?\d{1,3}(,\d{3})*(\.\d+)?', '[REDACTED AMOUNT]', text)
-                    return text
-                
                 redacted_text = redact_sensitive(extracted_text)
                 if redacted_text != extracted_text:
                     st.warning("🔒 Sensitive information detected and automatically redacted")
@@ -258,7 +250,7 @@ def show_upload_page(user_info):
                 
                 if should_summarize and extracted_text.strip():
                     if summarizer is None:
-                        summarizer = DocumentSummarizer()
+                        summarizer = get_summarizer()
                     
                     with st.spinner("📝 Generating intelligent summary..."):
                         insights = summarizer.get_document_insights(
@@ -351,11 +343,15 @@ def show_upload_page(user_info):
                 # Save to database
                 saved_document = db.add_document(document_data, user_info)
                 
+                # Keep the OCR word layout for preview highlighting and re-use without re-OCR
+                if saved_document and ocr_result.get('layouts'):
+                    save_layouts(saved_document['id'], ocr_result['layouts'])
+                
                 # Send real-time alert for document upload (optional, non-blocking)
                 if saved_document and ALERTS_AVAILABLE:
                     try:
                         send_document_upload_alert(saved_document, user_info)
-                        print(f"📢 Real-time alert sent for document upload: {saved_document.get('filename')}")
+                        print(f"📢 Real-time alert queued for document upload: {saved_document.get('filename')}")
                     except Exception as e:
                         print(f"⚠️ Failed to send upload alert (continuing): {e}")
                         # Continue without alerts - don't fail the upload
@@ -392,7 +388,7 @@ def show_upload_page(user_info):
                                         },
                                         saved_document.get('filename', 'Unknown Document')
                                     )
-                                    print(f"📢 Real-time feedback alert sent for document: {saved_document.get('filename')}")
+                                    print(f"📢 Real-time feedback alert queued for document: {saved_document.get('filename')}")
                                 except Exception as e:
                                     print(f"⚠️ Failed to send feedback alert (continuing): {e}")
                                     # Continue without alerts - don't fail the feedback submission
@@ -414,8 +410,8 @@ def show_upload_page(user_info):
 
     # Recent Uploads Section with Preview
     st.markdown("""
-    <div class="feature-section" style="margin-top:2rem;">
-        <h3 style="color:var(--material-primary);font-weight:600;margin-bottom:1rem;display:flex;align-items:center;">
+    <div class="feature-section metro-spaced-top">
+        <h3 class="metro-section-title">
             <span style="margin-right:0.5rem;">📚</span>Recent Uploads
         </h3>
     </div>
@@ -0,0 +1,46 @@
+"""
+Alert history shared by several processes
+Streamlit workers, the alert service and the ASGI server append to one
+alert_history.jsonl; ids must stay unique and increasing across all of them,
+including while the file is being compacted.
+"""
+import multiprocessing
+
+from modules.alert_history import AlertHistory
+
+PROCESSES = 4
+APPENDS = 200
+MAX_ENTRIES = 50  # Small buffer, so the writers also compact the file while others append
+
+
+def _append_alerts(args):
+    path, worker = args
+    history = AlertHistory(path, max_entries=MAX_ENTRIES)
+    return [history.append("document_added", {"worker": worker, "n": n})["id"] for n in range(APPENDS)]
+
+
+def test_ids_unique_and_increasing_across_processes(tmp_path):
+    path = tmp_path / "alert_history.jsonl"
+    with multiprocessing.get_context("spawn").Pool(PROCESSES) as pool:
+        per_worker = pool.map(_append_alerts, [(path, worker) for worker in range(PROCESSES)])
+
+    ids = [alert_id for worker_ids in per_worker for alert_id in worker_ids]
+    assert sorted(ids) == list(range(1, PROCESSES * APPENDS + 1))
+    for worker_ids in per_worker:
+        assert worker_ids == sorted(worker_ids)
+
+    history = AlertHistory(path, max_entries=MAX_ENTRIES)
+    on_disk = [entry["id"] for entry in history.since(0)]
+    assert on_disk == sorted(set(on_disk))
+    assert on_disk[-1] == history.latest_id == PROCESSES * APPENDS
+    assert len(on_disk) == MAX_ENTRIES
+
+
+def test_replay_sees_alerts_from_other_instances(tmp_path):
+    path = tmp_path / "alert_history.jsonl"
+    reader, writer = AlertHistory(path), AlertHistory(path)
+    first = writer.append("document_upload", {"filename": "a.pdf"})
+    assert [entry["id"] for entry in reader.since(0)] == [first["id"]]
+    second = reader.append("document_upload", {"filename": "b.pdf"})
+    assert second["id"] == first["id"] + 1
+    assert writer.count_since(first["id"], "document_upload") == 1
@@ -0,0 +1,21 @@
+"""
+Concurrent writers against the JSON document store
+Runs benchmarks.db_stress with parallel uploaders (processes, then threads
+alongside a writer that is SIGKILLed mid-run) and requires every consistency
+check to pass: no lost documents, feedback or audit entries.
+"""
+import pytest
+
+pytest.importorskip("streamlit", reason="the app's requirements are not installed")
+
+from benchmarks.db_stress import run
+
+
+def test_parallel_process_uploaders():
+    result = run(workers=4, docs=10, mode="process", kill=0)
+    assert all(result["checks"].values()), result["checks"]
+
+
+def test_thread_uploaders_with_killed_writer():
+    result = run(workers=4, docs=10, mode="thread", kill=1)
+    assert all(result["checks"].values()), result["checks"]
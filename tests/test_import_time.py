@@ -0,0 +1,34 @@
+"""
+Cold-start import checks
+Every target of benchmarks.import_time must import cleanly in a fresh
+interpreter, stay within its budget and leave the heavy OCR/ML libraries
+deferred until first use.
+
+    python -m pytest tests/test_import_time.py
+"""
+import pytest
+
+from benchmarks.import_time import IMPORT_TIME_BUDGETS_MS, run
+
+pytest.importorskip("streamlit", reason="the app's requirements are not installed")
+
+
+@pytest.fixture(scope="module")
+def results():
+    return {r["target"]: r for r in run(list(IMPORT_TIME_BUDGETS_MS), repeat=3, budgets=IMPORT_TIME_BUDGETS_MS)}
+
+
+@pytest.mark.parametrize("target", list(IMPORT_TIME_BUDGETS_MS))
+def test_imports_cleanly(results, target):
+    assert results[target]["ok"], results[target]["error"]
+
+
+@pytest.mark.parametrize("target", list(IMPORT_TIME_BUDGETS_MS))
+def test_within_budget(results, target):
+    result = results[target]
+    assert not result["over_budget"], f"{target} took {result['best_ms']:.0f} ms (budget {result['budget_ms']} ms)"
+
+
+@pytest.mark.parametrize("target", list(IMPORT_TIME_BUDGETS_MS))
+def test_heavy_libraries_deferred(results, target):
+    assert not results[target]["heavy_imports"], f"{target} eagerly imports {results[target]['heavy_imports']}"